@@ -1,4 +1,7 @@
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import html
+import tempfile
+from datetime import datetime
+from telegram import Update, InlineKeyboardButton, InputFile, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, MessageHandler, CommandHandler, CallbackQueryHandler, filters
 from app.config import Config
 from app.services.user_service import (
@@ -6,6 +9,9 @@ from app.services.user_service import (
     add_pending_teacher_group,
     get_all_pending_users, 
     get_all_active_users, 
+    get_active_users_page,
+    bulk_create_pending_users,
+    iter_users_for_export,
     delete_user,
     get_user,
     delete_user_by_chat_id,
@@ -16,6 +22,34 @@ from app.services.user_service import (
 )
 from app.database.db import get_connection
 from app.utils.localization import get_user_language, get_text
+from app.utils.messages import fit_lines, CAPTION_LIMIT, MESSAGE_LIMIT
+from app.bot.error_handler import get_recent_errors, get_error_by_fingerprint
+from app.services.quiz_service import get_quiz_stats
+from app.payments.billing import generate_monthly_bills
+from app.payments.reports import (
+    get_group_totals,
+    get_monthly_totals,
+    get_debtors,
+    write_payments_export
+)
+from app.payments.periods import current_period, parse_period, shift_period
+from app.services.recurrence import parse_rule
+from app.services.meeting_index import get_meeting
+from app.services.lesson_service import (
+    parse_lesson_date,
+    set_lesson_override,
+    delete_lesson_override,
+    CANCELLED,
+    POSTPONED,
+    DATE_FORMAT
+)
+from app.services.user_transfer import (
+    parse_users_file,
+    build_keys_file,
+    write_users_export,
+    ImportFileError,
+    MAX_IMPORT_ROWS
+)
 
 # ═══════════════════════════════════════════════════════════
 # UNIQUE STATES (Fixed to prevent shadowing)
@@ -26,6 +60,9 @@ ENTERING_NAME_STUDENT = 20
 ENTERING_GROUP_STUDENT = 21
 ENTERING_NAME_TEACHER = 22
 
+# Bulk import
+WAITING_IMPORT_FILE = 23
+
 # Edit/Delete States
 (
     EDIT_USER_CHAT,
@@ -134,29 +171,546 @@ async def group_entered_admin(update: Update, context: ContextTypes.DEFAULT_TYPE
 # list_users_command, cancel_admin, delete_user_command, etc.
 # ═══════════════════════════════════════════════════════════
 
+USERS_PAGE_SIZE = 20
+
+USER_ROLE_ARGS = {
+    'student': 'student', 'students': 'student',
+    'teacher': 'teacher', 'teachers': 'teacher',
+}
+
+
+def _users_page_keyboard(state: dict):
+    buttons = []
+    if state['page'] > 1:
+        buttons.append(InlineKeyboardButton("⬅️ Prev", callback_data="users_prev"))
+    if state['has_next']:
+        buttons.append(InlineKeyboardButton("Next ➡️", callback_data="users_next"))
+    return InlineKeyboardMarkup([buttons]) if buttons else None
+
+
+def _format_users_page(users: list, state: dict) -> str:
+    title = "👥 <b>Registered Users</b>"
+    filters_text = " · ".join(f for f in (state['role'], state['group']) if f)
+    if filters_text:
+        title += f" ({html.escape(filters_text)})"
+
+    text = f"{title}\n<i>Page {state['page']}</i>\n\n"
+    for u in users:
+        icon = "👨‍🏫" if u['role'] == 'teacher' else "👨‍🎓"
+        group = f" ({html.escape(u['group_name'])})" if u['group_name'] else ""
+        text += f"{icon} <b>{html.escape(u['name'])}</b>{group}\n"
+        text += f"🆔 <code>{u['chat_id']}</code>\n\n"
+    return text
+
+
 async def list_users_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """List all registered users."""
+    """List registered users page by page: /users [student|teacher] [group]."""
     if not is_admin(update.effective_user.id):
         return
-    
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name, role, chat_id, group_name FROM users WHERE is_active = 1 ORDER BY role, name")
-    users = cursor.fetchall()
-    conn.close()
-    
+
+    args = list(context.args or [])
+    role = USER_ROLE_ARGS.get(args[0].lower()) if args else None
+    if role:
+        args = args[1:]
+    group = " ".join(args).strip() or None
+
+    users, has_next = get_active_users_page(role=role, group_name=group, limit=USERS_PAGE_SIZE)
+
     if not users:
         await update.message.reply_text("No users found.")
         return
-    
-    text = "👥 <b>Registered Users</b>\n\n"
-    
-    for u in users:
-        icon = "👨‍🏫" if u['role'] == 'teacher' else "👨‍🎓"
-        group = f" ({u['group_name']})" if u['group_name'] else ""
-        text += f"{icon} <b>{u['name']}</b>{group}\n"
-        text += f"🆔 <code>{u['chat_id']}</code>\n\n"
-    
+
+    # Keyset cursor of the page on screen (kept per admin, not in callback data)
+    state = {
+        'role': role,
+        'group': group,
+        'page': 1,
+        'first': (users[0]['name'], users[0]['id']),
+        'last': (users[-1]['name'], users[-1]['id']),
+        'has_next': has_next,
+    }
+    context.user_data['users_page'] = state
+
+    await update.message.reply_text(
+        _format_users_page(users, state),
+        parse_mode='HTML',
+        reply_markup=_users_page_keyboard(state)
+    )
+
+
+async def users_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Next / previous page of the /users listing."""
+    query = update.callback_query
+    await query.answer()
+
+    if not is_admin(update.effective_user.id):
+        return
+
+    state = context.user_data.get('users_page')
+    if not state:
+        await query.edit_message_reply_markup(reply_markup=None)
+        return
+
+    if query.data == 'users_next':
+        users, has_next = get_active_users_page(
+            role=state['role'], group_name=state['group'],
+            after=state['last'], limit=USERS_PAGE_SIZE
+        )
+        page = state['page'] + 1
+    else:
+        users, has_prev = get_active_users_page(
+            role=state['role'], group_name=state['group'],
+            before=state['first'], limit=USERS_PAGE_SIZE
+        )
+        page = max(state['page'] - 1, 1) if has_prev else 1
+        has_next = True
+
+    if not users:
+        return
+
+    state.update({
+        'page': page,
+        'first': (users[0]['name'], users[0]['id']),
+        'last': (users[-1]['name'], users[-1]['id']),
+        'has_next': has_next,
+    })
+
+    await query.edit_message_text(
+        _format_users_page(users, state),
+        parse_mode='HTML',
+        reply_markup=_users_page_keyboard(state)
+    )
+
+
+# ═══════════════════════════════════════════════════════════
+# BULK IMPORT / EXPORT
+# ═══════════════════════════════════════════════════════════
+
+async def import_users_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Start bulk import: /import_users, then send a CSV/XLSX file."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ Admin only command.")
+        return ConversationHandler.END
+
+    await update.message.reply_text(
+        "📥 <b>Bulk Import</b>\n\n"
+        "Send a <b>CSV</b> or <b>XLSX</b> file with a header row:\n"
+        "<code>name, role, group, subject</code>\n\n"
+        "• role: <i>student</i> or <i>teacher</i>\n"
+        "• students need a group\n"
+        "• a teacher may appear on several rows (one per group)\n\n"
+        f"Up to {MAX_IMPORT_ROWS} rows. /cancel to stop.",
+        parse_mode='HTML'
+    )
+    return WAITING_IMPORT_FILE
+
+
+async def import_file_received(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Parse the uploaded file, create all users at once and reply with their keys."""
+    document = update.message.document
+    filename = document.file_name or 'users.csv'
+
+    if not filename.lower().endswith(('.csv', '.xlsx')):
+        await update.message.reply_text("❌ Please send a .csv or .xlsx file (or /cancel).")
+        return WAITING_IMPORT_FILE
+
+    tg_file = await document.get_file()
+    data = bytes(await tg_file.download_as_bytearray())
+
+    try:
+        entries, errors = parse_users_file(filename, data)
+    except ImportFileError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return WAITING_IMPORT_FILE
+
+    error_lines = [html.escape(e) for e in errors]
+
+    if not entries:
+        await update.message.reply_text(
+            fit_lines("❌ No valid rows found.\n\n⚠️ <b>Skipped rows:</b>", error_lines),
+            parse_mode='HTML'
+        )
+        return ConversationHandler.END
+
+    created = bulk_create_pending_users(entries)
+    if not created:
+        await update.message.reply_text("❌ Import failed, nothing was created. Check the logs.")
+        return ConversationHandler.END
+
+    students = sum(1 for e in created if e['role'] == 'student')
+    teachers = len(created) - students
+
+    caption = (
+        f"✅ <b>Imported {len(created)} user(s)</b>\n"
+        f"👨‍🎓 Students: {students} · 👨‍🏫 Teachers: {teachers}"
+    )
+    if error_lines:
+        # Whole lines only: a cut tag/entity would make Telegram reject the file
+        caption = fit_lines(caption + "\n\n⚠️ <b>Skipped rows:</b>", error_lines, CAPTION_LIMIT)
+
+    await update.message.reply_document(
+        document=InputFile(build_keys_file(created), filename=f"registration_keys_{datetime.now():%Y%m%d_%H%M}.csv"),
+        caption=caption,
+        parse_mode='HTML'
+    )
+    return ConversationHandler.END
+
+
+async def export_users_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Send all users (with keys and status) as a CSV file."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    # Rows are streamed from the DB into a temp file, never held in memory at once
+    with tempfile.TemporaryFile() as f:
+        count = write_users_export(iter_users_for_export(), f)
+        f.seek(0)
+        await update.message.reply_document(
+            document=InputFile(f, filename=f"users_{datetime.now():%Y%m%d_%H%M}.csv"),
+            caption=f"📤 {count} user(s) exported."
+        )
+
+
+async def load_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show update-processing load: queue depth and wait times."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    processor = context.application.update_processor
+    if not hasattr(processor, 'get_metrics'):
+        await update.message.reply_text("ℹ️ Updates are processed sequentially (no metrics).")
+        return
+
+    m = processor.get_metrics()
+    text = (
+        f"⚙️ <b>Update Processing</b>\n\n"
+        f"▶️ Running: <b>{m['running']}</b> / {m['max_concurrent']}\n"
+        f"⏳ Waiting: <b>{m['waiting']}</b> (peak {m['max_waiting']})\n"
+        f"💬 Active chats: {m['active_chats']}\n"
+        f"✅ Processed: {m['processed']} · ❌ Failed: {m['failed']}\n\n"
+        f"<b>Wait time</b> avg {m['wait_avg'] * 1000:.0f} ms · p95 {m['wait_p95'] * 1000:.0f} ms · "
+        f"max {m['wait_max'] * 1000:.0f} ms\n"
+        f"<b>Handler time</b> avg {m['run_avg'] * 1000:.0f} ms · p95 {m['run_p95'] * 1000:.0f} ms"
+    )
+    await update.message.reply_text(text, parse_mode='HTML')
+
+
+def _parse_period_arg(args: list):
+    """Split ['2025-03', 'Group', 'A'] into ('2025-03', 'Group A'); period defaults to the current one."""
+    if args:
+        try:
+            return parse_period(args[0]), ' '.join(args[1:]) or None
+        except ValueError:
+            pass
+    return current_period(), ' '.join(args) or None
+
+
+async def payments_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Payment dashboard: /payments [YYYY-MM] [group] (group -> debtor list)."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    month_year, group_name = _parse_period_arg(context.args or [])
+
+    if group_name:
+        debtors = get_debtors(month_year, group_name)
+        if not debtors:
+            await update.message.reply_text(f"✅ No unpaid bills in {html.escape(group_name)} for {month_year}.")
+            return
+        lines = []
+        for d in debtors:
+            icon = "⏳" if d['state'] == 'pending' else "❌"
+            name = html.escape(d['name'] or str(d['student_chat_id']))
+            lines.append(f"{icon} {name} — {d['amount_due']:,} UZS")
+        text = fit_lines(f"💸 <b>Unpaid — {html.escape(debtors[0]['group_name'])}</b> ({month_year})\n", lines)
+        await update.message.reply_text(text, parse_mode='HTML')
+        return
+
+    groups = get_group_totals(month_year)
+    if not groups:
+        await update.message.reply_text(f"📭 No bills for {month_year}.")
+        return
+
+    group_lines = [
+        f"👥 <b>{html.escape(g['group_name'])}</b>: "
+        f"✅ {g['paid']} · ⏳ {g['pending']} · ❌ {g['unpaid']} "
+        f"({g['amount_paid']:,}/{g['amount_due']:,})"
+        for g in groups
+    ]
+
+    tail = "\n\n📅 <b>By month</b>"
+    for m in get_monthly_totals(shift_period(month_year, -5), month_year):
+        tail += (
+            f"\n{m['month_year']}: ✅ {m['paid']}/{m['bills']} · ⏳ {m['pending']} · ❌ {m['unpaid']} "
+            f"({m['amount_paid']:,} UZS)"
+        )
+    tail += (
+        "\n\n/payments [YYYY-MM] &lt;group&gt; — debtors of a group\n"
+        "/export_payments [YYYY-MM] — CSV"
+    )
+
+    # The monthly totals always fit; groups beyond the limit are only counted
+    text = fit_lines(
+        f"💰 <b>Payments — {month_year}</b>\n", group_lines, MESSAGE_LIMIT - len(tail),
+        more="…and {count} more group(s)"
+    ) + tail
+    await update.message.reply_text(text, parse_mode='HTML')
+
+
+async def export_payments_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Send all bills of a month as a CSV file: /export_payments [YYYY-MM]."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    month_year, _ = _parse_period_arg(context.args or [])
+
+    with tempfile.TemporaryFile() as f:
+        count = write_payments_export(month_year, f)
+        if not count:
+            await update.message.reply_text(f"📭 No bills for {month_year}.")
+            return
+        f.seek(0)
+        await update.message.reply_document(
+            document=InputFile(f, filename=f"payments_{month_year}.csv"),
+            caption=f"📤 {count} bill(s) for {month_year}."
+        )
+
+
+async def billing_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Monthly bills: /billing [YYYY-MM] shows a dry run, /billing [YYYY-MM] run creates them."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    args = [a.lower() for a in context.args or []]
+    run = 'run' in args
+    months = [a for a in args if a != 'run']
+    month_year = months[0] if months else None
+
+    if month_year:
+        try:
+            month_year = parse_period(month_year)
+        except ValueError:
+            await update.message.reply_text("❌ Usage: /billing [YYYY-MM] [run]")
+            return
+
+    try:
+        result = generate_monthly_bills(month_year, dry_run=not run)
+    except Exception as e:
+        await update.message.reply_text(f"❌ Billing failed: {html.escape(str(e))}")
+        return
+
+    if not result['groups']:
+        await update.message.reply_text(
+            f"📭 Nothing to bill for {result['month']}.\n"
+            f"Check the \"billing\" section of meetings.json and the active students."
+        )
+        return
+
+    title = "🧾 <b>Billing</b>" if run else "🧪 <b>Billing (dry run)</b>"
+    lines = [
+        f"👥 {html.escape(group)}: {counts['students']} student(s), {counts['students'] - counts['existing']} new"
+        for group, counts in result['groups'].items()
+    ]
+
+    verb = "Created" if run else "Would create"
+    tail = f"\n\n✅ {verb}: <b>{result['created']}</b> · Already billed: {result['skipped']}"
+    if not run:
+        tail += f"\n\nSend /billing {result['month']} run to create them."
+
+    text = fit_lines(
+        f"{title} — {result['month']}\n", lines, MESSAGE_LIMIT - len(tail),
+        more="…and {count} more group(s)"
+    ) + tail
+    await update.message.reply_text(text, parse_mode='HTML')
+
+
+def _find_lesson(args: list):
+    """(meeting, lesson_date) from ['<meeting_id>', '<date>', ...]; raises ValueError with a message."""
+    if len(args) < 2:
+        raise ValueError("Missing meeting id or date.")
+
+    meeting = get_meeting(args[0])
+    if not meeting:
+        raise ValueError(f"Unknown meeting id: {args[0]}")
+
+    lesson_date = parse_lesson_date(args[1])
+    if lesson_date.weekday() not in parse_rule(meeting)['weekdays']:
+        raise ValueError(f"{meeting.get('title')} has no lesson on {lesson_date:%A %d-%m-%Y}.")
+    return meeting, lesson_date
+
+
+async def cancel_lesson_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Cancel one lesson: /cancel_lesson <meeting_id> <YYYY-MM-DD>."""
+    if not is_admin(update.effective_user.id):
+        return
+    try:
+        meeting, lesson_date = _find_lesson(context.args or [])
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {html.escape(str(e))}\nUsage: /cancel_lesson &lt;meeting_id&gt; &lt;YYYY-MM-DD&gt;", parse_mode='HTML')
+        return
+
+    from app.scheduler import unschedule_moved_lesson
+    unschedule_moved_lesson(meeting['id'], lesson_date.strftime(DATE_FORMAT))
+    set_lesson_override(meeting['id'], lesson_date, CANCELLED)
+
+    await update.message.reply_text(
+        f"❌ <b>{html.escape(meeting.get('title', ''))}</b> ({html.escape(meeting.get('group_name', ''))}) "
+        f"cancelled on {lesson_date:%d-%m-%Y}.\nUndo: /restore_lesson {meeting['id']} {lesson_date:%Y-%m-%d}",
+        parse_mode='HTML'
+    )
+
+
+async def move_lesson_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Move one lesson: /move_lesson <meeting_id> <YYYY-MM-DD> <new YYYY-MM-DD> <HH:MM>."""
+    if not is_admin(update.effective_user.id):
+        return
+    args = context.args or []
+    try:
+        meeting, lesson_date = _find_lesson(args)
+        if len(args) < 4:
+            raise ValueError("Missing new date or time.")
+        new_date = parse_lesson_date(args[2])
+        new_time = datetime.strptime(args[3], "%H:%M")
+    except ValueError as e:
+        await update.message.reply_text(
+            f"❌ {html.escape(str(e))}\nUsage: /move_lesson &lt;meeting_id&gt; &lt;YYYY-MM-DD&gt; &lt;new YYYY-MM-DD&gt; &lt;HH:MM&gt;",
+            parse_mode='HTML'
+        )
+        return
+
+    set_lesson_override(meeting['id'], lesson_date, POSTPONED, new_date, new_time.hour, new_time.minute)
+
+    from app.scheduler import schedule_moved_lesson, unschedule_moved_lesson
+    # Drop the jobs of an earlier move first: schedule_moved_lesson doesn't
+    # replace them when the new time is already past
+    unschedule_moved_lesson(meeting['id'], lesson_date.strftime(DATE_FORMAT))
+    scheduled = schedule_moved_lesson(context.application, meeting, {
+        'lesson_date': lesson_date.strftime(DATE_FORMAT),
+        'new_date': new_date.strftime(DATE_FORMAT),
+        'new_hour': new_time.hour,
+        'new_minute': new_time.minute,
+    })
+
+    text = (
+        f"📅 <b>{html.escape(meeting.get('title', ''))}</b> ({html.escape(meeting.get('group_name', ''))}) "
+        f"moved from {lesson_date:%d-%m-%Y} to {new_date:%d-%m-%Y} {new_time:%H:%M}."
+    )
+    if not scheduled:
+        text += "\n⚠️ The new time is in the past, no link will be sent."
+    text += f"\nUndo: /restore_lesson {meeting['id']} {lesson_date:%Y-%m-%d}"
+    await update.message.reply_text(text, parse_mode='HTML')
+
+
+async def restore_lesson_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Undo a cancel/move: /restore_lesson <meeting_id> <YYYY-MM-DD>."""
+    if not is_admin(update.effective_user.id):
+        return
+    try:
+        meeting, lesson_date = _find_lesson(context.args or [])
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {html.escape(str(e))}\nUsage: /restore_lesson &lt;meeting_id&gt; &lt;YYYY-MM-DD&gt;", parse_mode='HTML')
+        return
+
+    removed = delete_lesson_override(meeting['id'], lesson_date)
+    if not removed:
+        await update.message.reply_text("ℹ️ This lesson was not cancelled or moved.")
+        return
+
+    from app.scheduler import unschedule_moved_lesson
+    unschedule_moved_lesson(meeting['id'], lesson_date.strftime(DATE_FORMAT))
+
+    await update.message.reply_text(
+        f"✅ <b>{html.escape(meeting.get('title', ''))}</b> on {lesson_date:%d-%m-%Y} is back on schedule.",
+        parse_mode='HTML'
+    )
+
+
+async def quiz_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Quiz analytics: /quiz_stats [days] (default 30)."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    from app.bot.quiz import QUIZ_QUESTIONS
+
+    days = int(context.args[0]) if context.args and context.args[0].isdigit() else 30
+    stats = get_quiz_stats(days)
+    summary = stats['summary']
+
+    if not summary['attempts']:
+        await update.message.reply_text(f"📭 No quiz attempts in the last {days} day(s).")
+        return
+
+    attempts = summary['attempts']
+    text = (
+        f"🧠 <b>Quiz Stats</b> (last {days} days)\n\n"
+        f"📝 Attempts: <b>{attempts}</b>\n"
+        f"🎯 Avg score: <b>{float(summary['avg_ratio']) * 100:.0f}%</b>\n"
+        f"💼 Leads: <b>{summary['leads']}</b> ({summary['leads'] * 100 // attempts}%) · "
+        f"📞 with phone: {summary['phones']}"
+    )
+
+    lines = []
+    if stats['plans']:
+        lines.append("\n<b>Plans</b>")
+        for row in stats['plans']:
+            lines.append(f"  {html.escape(row['selected_plan'])}: {row['cnt']}")
+
+    lines.append("\n<b>Error rate per question</b>")
+    for row in stats['questions']:
+        index = row['question_index']
+        label = QUIZ_QUESTIONS[index]['q'] if index < len(QUIZ_QUESTIONS) else f"#{index + 1}"
+        rate = (row['wrong'] or 0) * 100 // row['answered']
+        lines.append(f"  {rate:>3}% — {html.escape(label)}")
+
+    if stats['topics']:
+        lines.append("\n<b>Weak topics</b>")
+        for row in stats['topics']:
+            lines.append(f"  {html.escape(row['topic'] or 'General')}: {row['wrong']} miss(es)")
+
+    await update.message.reply_text(fit_lines(text, lines, more="…and {count} more line(s)"), parse_mode='HTML')
+
+
+async def errors_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show recent errors: /errors [count] or /errors <fingerprint>."""
+    if not is_admin(update.effective_user.id):
+        return
+
+    arg = context.args[0] if context.args else None
+
+    # Full traceback of one fingerprint
+    if arg and not arg.isdigit():
+        entry = get_error_by_fingerprint(arg)
+        if not entry:
+            await update.message.reply_text("❌ No recent error with this fingerprint.")
+            return
+        text = (
+            f"🔑 <code>{entry['fingerprint']}</code> — {entry['time'].strftime('%d-%m-%Y %H:%M:%S')}\n"
+            f"👤 {html.escape(entry.get('user', 'Unknown'))}\n"
+            f"📝 {html.escape(entry.get('update', ''))}\n\n"
+            f"<pre>{html.escape(entry['traceback'][-3500:])}</pre>"
+        )
+        await update.message.reply_text(text, parse_mode='HTML')
+        return
+
+    limit = min(int(arg), 50) if arg else 10
+    errors = get_recent_errors(limit)
+    if not errors:
+        await update.message.reply_text("✅ No errors recorded since the last restart.")
+        return
+
+    entries = [
+        f"🕐 {e['time'].strftime('%d-%m %H:%M:%S')} <b>{html.escape(e['type'])}</b> ×{e['count']}\n"
+        f"<i>{html.escape(e['message'][:150])}</i>\n"
+        f"🔑 <code>{e['fingerprint']}</code>"
+        for e in errors
+    ]
+    footer = "\n\nSend /errors &lt;fingerprint&gt; for the traceback."
+    # Newest first; older entries that don't fit are only counted
+    text = fit_lines(
+        "🚨 <b>Recent Errors</b>", entries, MESSAGE_LIMIT - len(footer),
+        sep="\n\n", more="…and {count} older error(s)"
+    ) + footer
+
     await update.message.reply_text(text, parse_mode='HTML')
 
 
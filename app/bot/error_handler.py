@@ -1,8 +1,10 @@
 import logging
 import traceback
+import hashlib
 import html
 import json
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
@@ -10,10 +12,161 @@ from telegram.ext import ContextTypes
 from telegram.error import Conflict, NetworkError, BadRequest, TimedOut
 
 from app.config import Config
+from app.services.admin_outbox import notify_admin, HIGH
+from app.utils.messages import fit_lines, MESSAGE_LIMIT
 
 # Setup professional logging
 logger = logging.getLogger(__name__)
 
+
+# ═══════════════════════════════════════════════════════════
+# ERROR AGGREGATION
+# ═══════════════════════════════════════════════════════════
+# One bug in a busy handler used to send one full report per update.
+# Errors are now grouped by fingerprint: the first occurrence is reported
+# immediately, repeats within the window are only counted and go out in a
+# periodic digest (see send_error_digest, run by the scheduler).
+
+# How many innermost frames identify an error
+FINGERPRINT_FRAMES = 3
+
+# fingerprint -> {'type', 'message', 'location', 'count', 'pending', 'first_seen', 'last_seen', 'last_report'}
+_error_stats = {}
+
+# Most recent errors, newest last (for /errors)
+_recent_errors = deque(maxlen=Config.ERROR_BUFFER_SIZE)
+
+
+def _error_fingerprint(error: BaseException) -> str:
+    """Exception type + innermost frames (file, function), hashed."""
+    frames = traceback.extract_tb(error.__traceback__)[-FINGERPRINT_FRAMES:]
+    parts = [type(error).__qualname__]
+    parts += [f"{frame.filename.rsplit('/', 1)[-1]}:{frame.name}" for frame in frames]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:10]
+
+
+def _error_location(error: BaseException) -> str:
+    frames = traceback.extract_tb(error.__traceback__)
+    if not frames:
+        return "unknown"
+    frame = frames[-1]
+    return f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno} in {frame.name}"
+
+
+def record_error(error: BaseException, now: datetime = None, **details) -> bool:
+    """
+    Count an error and keep it in the recent-errors buffer.
+
+    Returns True when it should be reported right away (first occurrence,
+    or the fingerprint was quiet for a whole window).
+    """
+    now = now or datetime.now()
+    window = timedelta(minutes=Config.ERROR_REPORT_WINDOW_MINUTES)
+    fingerprint = _error_fingerprint(error)
+
+    stats = _error_stats.get(fingerprint)
+    report_now = stats is None or now - stats['last_seen'] >= window
+
+    if stats is None:
+        stats = _error_stats[fingerprint] = {
+            'type': type(error).__name__,
+            'message': str(error),
+            'location': _error_location(error),
+            'count': 0,
+            'pending': 0,
+            'first_seen': now,
+            'last_seen': now,
+            'last_report': None,
+        }
+
+    stats['count'] += 1
+    stats['last_seen'] = now
+    stats['message'] = str(error)
+    if report_now:
+        stats['last_report'] = now
+    else:
+        stats['pending'] += 1
+
+    _recent_errors.append({
+        'time': now,
+        'fingerprint': fingerprint,
+        'type': type(error).__name__,
+        'message': str(error),
+        'traceback': ''.join(traceback.format_exception(None, error, error.__traceback__)),
+        **details
+    })
+
+    return report_now
+
+
+def build_error_digest(now: datetime = None) -> str:
+    """Digest of suppressed repeats since the last report (and reset them)."""
+    now = now or datetime.now()
+    pending = [(fp, s) for fp, s in _error_stats.items() if s['pending']]
+    if not pending:
+        return None
+
+    pending.sort(key=lambda item: item[1]['pending'], reverse=True)
+
+    entries = []
+    for fingerprint, stats in pending:
+        entries.append(
+            f"❌ <b>{html.escape(stats['type'])}</b> ×{stats['pending']} "
+            f"(total {stats['count']}) <code>{fingerprint}</code>\n"
+            f"   📍 {html.escape(stats['location'])}\n"
+            f"   <i>{html.escape(stats['message'][:200])}</i>"
+        )
+        stats['pending'] = 0
+        stats['last_report'] = now
+
+    # Most frequent first; whole entries that don't fit are only counted
+    footer = "\n\nUse /errors to see recent errors."
+    text = fit_lines(
+        "🧾 <b>Error Digest</b>\n━━━━━━━━━━━━━━━━━━━━━━\n",
+        entries,
+        MESSAGE_LIMIT - len(footer),
+        more="…and {count} more error type(s)"
+    ) + footer
+
+    # Forget fingerprints that have been quiet for a day
+    for fingerprint in [fp for fp, s in _error_stats.items() if now - s['last_seen'] > timedelta(days=1)]:
+        del _error_stats[fingerprint]
+
+    return text
+
+
+async def send_error_digest(bot) -> None:
+    """Queue the pending digest for the admin (if anything was suppressed)."""
+    if not Config.ADMIN_CHAT_ID:
+        return
+
+    text = build_error_digest()
+    if not text:
+        return
+
+    try:
+        notify_admin(text, kind='error', priority=HIGH)
+    except Exception as e:
+        logger.error(f"Failed to send error digest to Admin: {e}")
+
+
+def get_recent_errors(limit: int = 10) -> list:
+    """Newest errors first, each with the running count of its fingerprint."""
+    result = []
+    for entry in list(_recent_errors)[::-1][:limit]:
+        stats = _error_stats.get(entry['fingerprint'], {})
+        result.append({**entry, 'count': stats.get('count', 1)})
+    return result
+
+
+def get_error_by_fingerprint(fingerprint: str):
+    """Latest occurrence of a fingerprint still in the buffer, or None."""
+    for entry in reversed(_recent_errors):
+        if entry['fingerprint'] == fingerprint:
+            return entry
+    return None
+
+
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle all errors, filter noise, and report critical bugs to admin."""
     
@@ -64,9 +217,12 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
         elif update.inline_query:
             update_info = f"Inline: {update.inline_query.query}"
 
-    # 4. SEND REPORT TO ADMIN
+    # 4. SEND REPORT TO ADMIN (first occurrence only, repeats go to the digest)
     # ------------------------------------------------
-    timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+    now = datetime.now()
+    timestamp = now.strftime("%d-%m-%Y %H:%M:%S")
+    report_now = record_error(error, now, user=user_info, chat=chat_info, update=update_info)
+    fingerprint = _error_fingerprint(error)
     
     report = (
         f"🚨 <b>Error Report</b>\n"
@@ -75,21 +231,26 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
         f"👤 <b>User:</b> {html.escape(user_info)}\n"
         f"💬 <b>Chat:</b> {chat_info}\n"
         f"📝 <b>Update:</b> {html.escape(update_info)}\n\n"
+        f"🔑 <b>Fingerprint:</b> <code>{fingerprint}</code>\n\n"
         f"❌ <b>Error:</b>\n"
         f"<code>{html.escape(error_message)}</code>\n\n"
         f"📋 <b>Traceback:</b>\n"
         f"<pre>{html.escape(tb_string)}</pre>"
     )
     
-    if Config.ADMIN_CHAT_ID:
+    if Config.ADMIN_CHAT_ID and report_now:
         try:
-            await context.bot.send_message(
-                chat_id=Config.ADMIN_CHAT_ID,
-                text=report,
-                parse_mode=ParseMode.HTML
-            )
-        except Exception as e:
-            logger.error(f"Failed to send error report to Admin: {e}")
+            notify_admin(report, kind='error', priority=HIGH)
+        except Exception:
+            # The outbox lives in the DB; if the DB is what broke, send directly
+            try:
+                await context.bot.send_message(
+                    chat_id=Config.ADMIN_CHAT_ID,
+                    text=report,
+                    parse_mode=ParseMode.HTML
+                )
+            except Exception as e:
+                logger.error(f"Failed to send error report to Admin: {e}")
 
     # 5. NOTIFY USER (Politely)
     # ------------------------------------------------
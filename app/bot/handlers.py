@@ -8,11 +8,14 @@ from app.bot.registration import (
     ENTERING_KEY
 )
 from app.bot.schedule import (
-    schedule_command, schedule_navigation, today_command
+    schedule_command, schedule_navigation, today_command, calendar_command
 )
 from app.bot.admin import (
     new_student_command, new_teacher_command, name_entered_admin,
-    group_entered_admin, list_users_command, cancel_admin,
+    group_entered_admin, list_users_command, users_page_callback, errors_command, load_command,
+    quiz_stats_command, billing_command, payments_command, export_payments_command,
+    cancel_lesson_command, move_lesson_command, restore_lesson_command,
+    import_users_command, import_file_received, export_users_command, WAITING_IMPORT_FILE, cancel_admin,
     delete_user_command, delete_user_chat_entered, delete_user_confirm,
     edit_student_command, edit_user_chat_entered, edit_student_name, edit_student_group,
     edit_teacher_command, edit_teacher_chat_entered, edit_teacher_name_step,
@@ -24,8 +27,9 @@ from app.bot.admin import (
     ENTERING_NAME_TEACHER
 )
 
-from app.bot.menu_handler import handle_menu_buttons, cancel_on_menu_button, is_button
-from app.bot.keyboards import MENU_BUTTONS
+from app.bot.menu_handler import (
+    handle_menu_buttons, cancel_on_menu_button, ButtonFilter, REPLY_BUTTON_KEYS
+)
 from app.services.user_service import get_user, get_teacher_groups
 from app.config import Config
 from app.bot.language import register_language_handlers
@@ -39,26 +43,14 @@ from app.bot.quiz import start_quiz, handle_unregistered_text, handle_contact, c
 # MULTILINGUAL BUTTON FILTERS
 # ═══════════════════════════════════════════════════════════
 
-class PayButtonFilter(filters.MessageFilter):
-    """Matches Pay button in any language."""
-    def filter(self, message):
-        if message.text:
-            return is_button(message.text, 'btn_pay')
-        return False
-
-class StatusButtonFilter(filters.MessageFilter):
-    """Matches Status button in any language."""
-    def filter(self, message):
-        if message.text:
-            return is_button(message.text, 'btn_status')
-        return False
-
-# Create filter instances
-pay_button = PayButtonFilter()
-status_button = StatusButtonFilter()
+# Single dict lookup per message (see menu_handler.BUTTON_ACTIONS)
+pay_button = ButtonFilter('btn_pay')
+status_button = ButtonFilter('btn_status')
+new_student_button = ButtonFilter('btn_new_student')
+new_teacher_button = ButtonFilter('btn_new_teacher')
 
 # Filter for menu buttons
-menu_button_filter = filters.TEXT & filters.Regex(f'^({"|".join(MENU_BUTTONS)})$')
+menu_button_filter = filters.TEXT & ButtonFilter(*REPLY_BUTTON_KEYS)
 
 admin_text_filter = (
     filters.TEXT
@@ -137,6 +129,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "",
         get_text('help_schedule', lang),
         get_text('help_today', lang),
+        get_text('help_calendar', lang),
         get_text('help_pay', lang),
         get_text('help_status', lang),
         get_text('help_language', lang),
@@ -185,7 +178,7 @@ def register_handlers(app: Application):
     new_student_handler = ConversationHandler(
         entry_points=[
             CommandHandler('new_student', new_student_command),
-            MessageHandler(filters.Regex('^👤 New Student$'), new_student_command)
+            MessageHandler(new_student_button, new_student_command)
         ],
         states={
             ENTERING_NAME_STUDENT: [MessageHandler(filters.TEXT & ~filters.COMMAND & ~menu_button_filter, name_entered_admin)],
@@ -199,7 +192,7 @@ def register_handlers(app: Application):
     new_teacher_handler = ConversationHandler(
         entry_points=[
             CommandHandler('new_teacher', new_teacher_command),
-            MessageHandler(filters.Regex('^👤 New Teacher$'), new_teacher_command)
+            MessageHandler(new_teacher_button, new_teacher_command)
         ],
         states={
             ENTERING_NAME_TEACHER: [MessageHandler(filters.TEXT & ~filters.COMMAND, name_entered_admin)],
@@ -258,6 +251,16 @@ def register_handlers(app: Application):
             per_message=False
         )
     
+    # Admin: bulk import from CSV/XLSX
+    import_users_handler = ConversationHandler(
+        entry_points=[CommandHandler('import_users', import_users_command)],
+        states={
+            WAITING_IMPORT_FILE: [MessageHandler(filters.Document.ALL, import_file_received)]
+        },
+        fallbacks=common_fallbacks + [CommandHandler('cancel', cancel_admin)],
+        per_message=False
+    )
+    
     # ═══════════════════════════════════════════════════════════
     # REGISTER HANDLERS (order matters!)
     # ═══════════════════════════════════════════════════════════
@@ -286,14 +289,27 @@ def register_handlers(app: Application):
     app.add_handler(edit_student_handler)
     app.add_handler(edit_teacher_handler)
     app.add_handler(delete_user_handler)
+    app.add_handler(import_users_handler)
     app.add_handler(MessageHandler(filters.PHOTO | filters.Document.ALL, handle_receipt_upload))
     
     # Simple command handlers
     app.add_handler(CommandHandler('schedule', schedule_command))
     app.add_handler(CommandHandler('today', today_command))
+    app.add_handler(CommandHandler('calendar', calendar_command))
     app.add_handler(CommandHandler('status', status_command))
     app.add_handler(CommandHandler('help', help_command))
     app.add_handler(CommandHandler('users', list_users_command))
+    app.add_handler(CommandHandler('errors', errors_command))
+    app.add_handler(CommandHandler('load', load_command))
+    app.add_handler(CommandHandler('quiz_stats', quiz_stats_command))
+    app.add_handler(CommandHandler('billing', billing_command))
+    app.add_handler(CommandHandler('payments', payments_command))
+    app.add_handler(CommandHandler('export_payments', export_payments_command))
+    app.add_handler(CommandHandler('cancel_lesson', cancel_lesson_command))
+    app.add_handler(CommandHandler('move_lesson', move_lesson_command))
+    app.add_handler(CommandHandler('restore_lesson', restore_lesson_command))
+    app.add_handler(CommandHandler('export_users', export_users_command))
+    app.add_handler(CallbackQueryHandler(users_page_callback, pattern=r'^users_(next|prev)$'))
     app.add_handler(CallbackQueryHandler(handle_payment_callback, pattern='^pay_'))
     # Language handlers
     register_language_handlers(app)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     ContextTypes,
@@ -13,7 +14,7 @@ from app.services.user_service import (
     get_teacher_groups_effective,
     get_students_in_group
 )
-from app.utils.localization import get_text, get_user_language
+from app.utils.localization import get_text, get_user_language, render, normalize_lang
 
 # Conversation states
 WAITING_FOR_FILES = 1
@@ -30,6 +31,11 @@ homework_sessions = {}
 
 def done_uploading_keyboard(lang: str = 'en'):
     """Done uploading files button."""
+    return _done_uploading_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _done_uploading_markup(lang: str):
     return InlineKeyboardMarkup([
         [InlineKeyboardButton(get_text('done_uploading', lang), callback_data="hw_done_upload")]
     ])
@@ -37,9 +43,14 @@ def done_uploading_keyboard(lang: str = 'en'):
 
 def groups_for_homework_keyboard(groups: list, lang: str = 'en'):
     """Select group to send homework to."""
+    group_names = tuple(group['group_name'] for group in groups)
+    return _groups_for_homework_markup(group_names, normalize_lang(lang))
+
+
+@lru_cache(maxsize=256)
+def _groups_for_homework_markup(group_names: tuple, lang: str):
     buttons = []
-    for group in groups:
-        group_name = group['group_name']
+    for group_name in group_names:
         buttons.append([
             InlineKeyboardButton(
                 f"👥 {group_name}",
@@ -53,6 +64,11 @@ def groups_for_homework_keyboard(groups: list, lang: str = 'en'):
 
 def confirm_send_keyboard(lang: str = 'en'):
     """Confirm sending homework."""
+    return _confirm_send_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _confirm_send_markup(lang: str):
     return InlineKeyboardMarkup([
         [InlineKeyboardButton(get_text('btn_send_now', lang), callback_data="hw_confirm_send")],
         [InlineKeyboardButton(get_text('btn_cancel', lang), callback_data="hw_cancel")]
@@ -151,7 +167,7 @@ async def receive_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
         file_count = len(homework_sessions[chat_id]['files'])
         
         await message.reply_text(
-            get_text('file_received', lang).format(count=file_count),
+            render('file_received', lang, count=file_count),
             reply_markup=done_uploading_keyboard(lang)
         )
     
@@ -190,7 +206,7 @@ async def done_uploading(update: Update, context: ContextTypes.DEFAULT_TYPE):
     file_count = len(session['files'])
     
     await query.edit_message_text(
-        get_text('select_group_for_homework', lang).format(count=file_count),
+        render('select_group_for_homework', lang, count=file_count),
         reply_markup=groups_for_homework_keyboard(groups, lang),
         parse_mode="HTML"
     )
@@ -226,14 +242,15 @@ async def select_group(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if student_count == 0:
         await query.edit_message_text(
-            get_text('no_students_in_group', lang).format(group=group_name)
+            render('no_students_in_group', lang, group=group_name)
         )
         del homework_sessions[chat_id]
         return ConversationHandler.END
     
     # Show confirmation
     await query.edit_message_text(
-        get_text('confirm_homework_send', lang).format(
+        render(
+            'confirm_homework_send', lang,
             file_count=file_count,
             student_count=student_count,
             group=group_name
@@ -296,21 +313,22 @@ async def confirm_send(update: Update, context: ContextTypes.DEFAULT_TYPE):
             failed_count += 1
     
     # Inside confirm_send, after you have group_name
-    from app.config import Config
-    meetings = Config.load_meetings()
-    meeting = next((m for m in meetings if m.get('group_name') == group_name), None)
+    from app.services.meeting_index import get_group_meetings
+    group_meetings = get_group_meetings(group_name)
+    meeting = group_meetings[0] if group_meetings else None
     subject = meeting.get('subject', 'Unknown Subject') if meeting else 'Unknown'
         
     # --- PHASE 2: CLEANUP ---
     del homework_sessions[chat_id]
     
     if failed_count > 0:
-        result_text = get_text('homework_sent_partial', lang).format(
+        result_text = render(
+            'homework_sent_partial', lang,
             sent=sent_count,
             failed=failed_count
         )
     else:
-        result_text = get_text('homework_sent_success', lang).format(sent=sent_count)
+        result_text = render('homework_sent_success', lang, sent=sent_count)
     
     await query.edit_message_text(result_text, parse_mode="HTML")
     
@@ -364,16 +382,9 @@ async def cancel_homework_command(update: Update, context: ContextTypes.DEFAULT_
 
 def get_homework_conversation_handler():
     """Create and return the homework conversation handler."""
-    from app.bot.menu_handler import is_button
-    
-    class HomeworkButtonFilter(filters.MessageFilter):
-        """Matches Homework button in any language."""
-        def filter(self, message):
-            if message.text:
-                return is_button(message.text, 'btn_homework')
-            return False
+    from app.bot.menu_handler import ButtonFilter
     
-    homework_button = HomeworkButtonFilter()
+    homework_button = ButtonFilter('btn_homework')
     
     return ConversationHandler(
         entry_points=[
@@ -4,7 +4,17 @@ from telegram import (
     ReplyKeyboardMarkup,
     KeyboardButton
 )
-from app.utils.localization import get_text, get_user_language
+from functools import lru_cache
+from app.utils.localization import get_text, normalize_lang, LANGUAGES
+
+
+# ═══════════════════════════════════════════════════════════
+# KEYBOARD CACHE
+# ═══════════════════════════════════════════════════════════
+# Telegram markups are immutable, so one instance per (role, language) or
+# per group list can be built once and sent with every reply. Texts are
+# loaded once per process (there is no runtime reload), so the caches never
+# go stale; a restart picks up edited locale files.
 
 
 # ═══════════════════════════════════════════════════════════
@@ -13,15 +23,20 @@ from app.utils.localization import get_text, get_user_language
 
 def main_menu_keyboard(is_admin: bool = False, is_teacher: bool = False, lang: str = 'en'):
     """Persistent main menu keyboard - localized."""
-    
-    if is_admin:
+    role = 'admin' if is_admin else 'teacher' if is_teacher else 'student'
+    return _main_menu_markup(role, normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _main_menu_markup(role: str, lang: str):
+    if role == 'admin':
         keyboard = [
             [KeyboardButton(get_text('btn_schedule', lang)), KeyboardButton(get_text('btn_today', lang))],
             [KeyboardButton(get_text('btn_new_student', lang)), KeyboardButton(get_text('btn_new_teacher', lang))],
             [KeyboardButton(get_text('btn_users', lang))],
             [KeyboardButton(get_text('btn_language', lang)), KeyboardButton(get_text('btn_help', lang))]
         ]
-    elif is_teacher:
+    elif role == 'teacher':
         keyboard = [
             [KeyboardButton(get_text('btn_schedule', lang)), KeyboardButton(get_text('btn_today', lang))],
             [KeyboardButton(get_text('btn_homework', lang))],
@@ -91,6 +106,11 @@ MENU_BUTTONS = [
 
 def role_keyboard(lang: str = 'en'):
     """Choose teacher or student."""
+    return _role_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _role_markup(lang: str):
     keyboard = [
         [InlineKeyboardButton(f"👨‍🏫 {get_text('role_teacher', lang)}", callback_data="role_teacher")],
         [InlineKeyboardButton(f"👨‍🎓 {get_text('role_student', lang)}", callback_data="role_student")]
@@ -100,6 +120,11 @@ def role_keyboard(lang: str = 'en'):
 
 def groups_keyboard(groups: list, lang: str = 'en'):
     """Select a group."""
+    return _groups_markup(tuple(groups), normalize_lang(lang))
+
+
+@lru_cache(maxsize=256)
+def _groups_markup(groups: tuple, lang: str):
     keyboard = []
     for group in groups:
         keyboard.append([InlineKeyboardButton(
@@ -126,6 +151,11 @@ def approval_keyboard(request_id: str, lang: str = 'en'):
 
 def confirm_keyboard(lang: str = 'en'):
     """Confirm action."""
+    return _confirm_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _confirm_markup(lang: str):
     keyboard = [
         [
             InlineKeyboardButton(get_text('btn_confirm', lang), callback_data="confirm_yes"),
@@ -141,6 +171,11 @@ def confirm_keyboard(lang: str = 'en'):
 
 def schedule_keyboard(lang: str = 'en'):
     """Navigation for schedule weeks - localized."""
+    return _schedule_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _schedule_markup(lang: str):
     keyboard = [
         [
             InlineKeyboardButton(get_text('prev_week', lang), callback_data="schedule_prev"),
@@ -156,9 +191,8 @@ def schedule_keyboard(lang: str = 'en'):
     return InlineKeyboardMarkup(keyboard)
 
 
-def schedule_keyboard_localized(chat_id: str):
-    """Navigation for schedule weeks - gets lang from chat_id."""
-    lang = get_user_language(chat_id)
+def schedule_keyboard_localized(lang: str = 'en'):
+    """Navigation for schedule weeks (alias of schedule_keyboard)."""
     return schedule_keyboard(lang)
 
 
@@ -168,15 +202,24 @@ def schedule_keyboard_localized(chat_id: str):
 
 def language_keyboard():
     """Language selection keyboard."""
-    from app.utils.localization import LANGUAGES
-    
+    return _language_markup()
+
+
+@lru_cache(maxsize=None)
+def _language_markup():
     buttons = []
     for code, name in LANGUAGES.items():
         buttons.append([InlineKeyboardButton(name, callback_data=f"setlang_{code}")])
     return InlineKeyboardMarkup(buttons)
 
+
 def unregistered_menu_keyboard(lang: str = 'en'):
     """Menu for users who are not registered yet."""
+    return _unregistered_menu_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _unregistered_menu_markup(lang: str):
     keyboard = [
         [KeyboardButton(get_text('btn_start_register', lang))],
         [KeyboardButton(get_text('btn_quiz', lang))],
@@ -190,6 +233,11 @@ def unregistered_menu_keyboard(lang: str = 'en'):
     
 def confirm_keyboard_localized(lang: str = 'en'):
     """Keyboard for confirming an action (Yes/No)."""
+    return _confirm_localized_markup(normalize_lang(lang))
+
+
+@lru_cache(maxsize=None)
+def _confirm_localized_markup(lang: str):
     return InlineKeyboardMarkup([
         [
             InlineKeyboardButton(get_text('btn_yes', lang), callback_data="confirm_yes"),
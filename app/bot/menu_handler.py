@@ -1,33 +1,74 @@
 from telegram import Update
-from telegram.ext import ContextTypes, ConversationHandler
+from telegram.ext import ContextTypes, ConversationHandler, filters
 from app.config import Config
-from app.utils.localization import get_text
+from app.utils.localization import get_text, get_translations
 
 
 def is_admin(chat_id: str) -> bool:
     return str(chat_id) == str(Config.ADMIN_CHAT_ID)
 
 
+# ═══════════════════════════════════════════════════════════
+# BUTTON ROUTING TABLE
+# ═══════════════════════════════════════════════════════════
+
+# Main menu buttons (routed by handle_menu_buttons)
+MENU_BUTTON_KEYS = [
+    'btn_schedule', 'btn_today', 'btn_pay',
+    'btn_status', 'btn_help', 'btn_new_student', 'btn_new_teacher',
+    'btn_users', 'btn_language', 'btn_homework'
+]
+
+# Every reply-keyboard button (menu + unregistered menu). Pressing any of
+# these interrupts a running conversation.
+REPLY_BUTTON_KEYS = MENU_BUTTON_KEYS + ['btn_start_register', 'btn_quiz']
+
+
+def _build_button_index(keys: list) -> dict:
+    """Map every localized label of the given buttons to its button key."""
+    index = {}
+    for key in keys:
+        for label in get_translations(key).values():
+            if index.get(label, key) != key:
+                raise ValueError(f"Button label {label!r} is shared by {index[label]} and {key}")
+            index[label] = key
+    return index
+
+
+# Built once at import: label (any language) -> button key
+BUTTON_ACTIONS = _build_button_index(REPLY_BUTTON_KEYS)
+
+_MENU_BUTTON_SET = frozenset(MENU_BUTTON_KEYS)
+
+
+def get_button_action(text: str):
+    """Return the button key for a label in any language, or None."""
+    return BUTTON_ACTIONS.get(text)
+
+
 def is_button(text: str, button_key: str) -> bool:
     """Check if text matches a button in ANY language."""
-    for lang in ['en', 'ru', 'uz']:
-        if text == get_text(button_key, lang):
-            return True
-    return False
+    if button_key in BUTTON_ACTIONS.values():
+        return BUTTON_ACTIONS.get(text) == button_key
+    # Not a reply-keyboard button: compare against its translations directly
+    return text in get_translations(button_key).values()
 
 
 def is_menu_button(text: str) -> bool:
     """Check if text is any menu button in any language."""
-    button_keys = [
-        'btn_schedule', 'btn_today', 'btn_pay',
-        'btn_status', 'btn_help', 'btn_new_student', 'btn_new_teacher',
-        'btn_users', 'btn_language', 'btn_homework'  # ← Added
-    ]
-    
-    for key in button_keys:
-        if is_button(text, key):
-            return True
-    return False
+    return BUTTON_ACTIONS.get(text) in _MENU_BUTTON_SET
+
+
+class ButtonFilter(filters.MessageFilter):
+    """Matches one or more reply-keyboard buttons in any language."""
+    def __init__(self, *button_keys: str):
+        self.button_keys = frozenset(button_keys)
+        super().__init__(name=f"ButtonFilter({', '.join(button_keys)})")
+
+    def filter(self, message):
+        if message.text:
+            return BUTTON_ACTIONS.get(message.text) in self.button_keys
+        return False
 
 
 async def handle_menu_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -35,8 +76,10 @@ async def handle_menu_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE
     text = update.message.text
     chat_id = str(update.effective_chat.id)
     
+    action = BUTTON_ACTIONS.get(text)
+    
     # Not a menu button - ignore
-    if not is_menu_button(text):
+    if action not in _MENU_BUTTON_SET:
         return None
     
     # Import handlers here to avoid circular imports
@@ -45,40 +88,28 @@ async def handle_menu_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE
     from app.bot.admin import list_users_command, new_student_command, new_teacher_command
     from app.bot.language import language_command
     
-    # Route to correct handler based on button key
-    if is_button(text, 'btn_schedule'):
-        return await schedule_command(update, context)
-    
-    elif is_button(text, 'btn_today'):
-        return await today_command(update, context)
-    
-    elif is_button(text, 'btn_status'):
-        return await status_command(update, context)
-    
-    elif is_button(text, 'btn_help'):
-        return await help_command(update, context)
-    
-    elif is_button(text, 'btn_users') and is_admin(chat_id):
-        return await list_users_command(update, context)
-    
-    elif is_button(text, 'btn_pay'):
-        # Let ConversationHandler handle this
-        return None
-
-    elif is_button(text, 'btn_homework'):
-    # Let ConversationHandler handle this
+    # button key -> (handler, admin only)
+    # btn_pay / btn_homework are left to their ConversationHandlers
+    routes = {
+        'btn_schedule': (schedule_command, False),
+        'btn_today': (today_command, False),
+        'btn_status': (status_command, False),
+        'btn_help': (help_command, False),
+        'btn_users': (list_users_command, True),
+        'btn_new_student': (new_student_command, True),
+        'btn_new_teacher': (new_teacher_command, True),
+        'btn_language': (language_command, False),
+    }
+    
+    route = routes.get(action)
+    if not route:
         return None
     
-    elif is_button(text, 'btn_new_student') and is_admin(chat_id):
-        return await new_student_command(update, context)
-    
-    elif is_button(text, 'btn_new_teacher') and is_admin(chat_id):
-        return await new_teacher_command(update, context)
-    
-    elif is_button(text, 'btn_language'):
-        return await language_command(update, context)
+    handler, admin_only = route
+    if admin_only and not is_admin(chat_id):
+        return None
     
-    return None
+    return await handler(update, context)
 
 
 async def cancel_on_menu_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -86,13 +117,13 @@ async def cancel_on_menu_button(update: Update, context: ContextTypes.DEFAULT_TY
     from app.utils.localization import get_user_language
     
     text = update.message.text
-    chat_id = str(update.effective_chat.id)
-    lang = get_user_language(chat_id)
     
     if is_menu_button(text):
+        chat_id = str(update.effective_chat.id)
+        lang = get_user_language(chat_id)
         await update.message.reply_text(get_text('cancelled', lang))
         # Handle the new menu button
         await handle_menu_buttons(update, context)
         return ConversationHandler.END
     
-    return None
\ No newline at end of file
+    return None
@@ -1,15 +1,27 @@
+import html
+import logging
+import sqlite3
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from datetime import datetime
-from app.database.db import get_connection
+from app.database.db import get_connection, get_p
 from app.config import Config
+from app.services.admin_outbox import forward_to_admin, on_dropped
+from app.payments.open_bills import has_open_bill, set_bill_unpaid, set_bill_paid, refresh_student
+from app.payments.periods import current_period
 from app.utils.localization import get_text, get_user_language
 
+logger = logging.getLogger(__name__)
+
+
 async def handle_receipt_upload(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Intercepts photos/documents from students with unpaid bills."""
     user = update.effective_user
     chat_id = update.effective_chat.id
-    current_month = datetime.now().strftime("%m-%Y")
+    period = current_period()
+
+    # Most photos/documents (homework, chat) come from users without a bill
+    if not has_open_bill(chat_id, period):
+        return
 
     conn = get_connection()
     cur = conn.cursor()
@@ -19,12 +31,13 @@ async def handle_receipt_upload(update: Update, context: ContextTypes.DEFAULT_TY
         SELECT id, amount_due, group_name FROM student_payments 
         WHERE student_chat_id = ? AND month_year = ? AND is_paid = 0 
         AND (receipt_status IS NULL OR receipt_status = 'rejected')
-    """, (str(chat_id), current_month))
+    """, (chat_id, period))
     
     bill = cur.fetchone()
     
     if not bill:
-        # Not a student with an unpaid bill, let other handlers process this message
+        # Cache was stale, let other handlers process this message
+        refresh_student(chat_id)
         cur.close()
         conn.close()
         return
@@ -33,52 +46,37 @@ async def handle_receipt_upload(update: Update, context: ContextTypes.DEFAULT_TY
     amount = bill['amount_due']
     group = bill['group_name']
     lang = get_user_language(str(chat_id))
-    user_name = user.full_name
+    # Names/groups are user text, the caption is HTML
+    user_name = html.escape(user.full_name or '')
 
     # Forward the photo/document to Admin
-    admin_chat_id = Config.ADMIN_CHAT_ID
     caption = (
         f"🧾 <b>Payment Receipt</b>\n\n"
         f"Student: {user_name} (<code>{chat_id}</code>)\n"
-        f"Group: {group}\n"
+        f"Group: {html.escape(group or '')}\n"
         f"Amount: {amount} UZS\n"
-        f"Month: {current_month}"
+        f"Month: {period}"
     )
 
-    if update.message.photo:
-        msg = await context.bot.copy_message(
-            chat_id=admin_chat_id,
-            from_chat_id=chat_id,
-            message_id=update.message.message_id,
-            caption=caption,
-            parse_mode='HTML'
-        )
-    elif update.message.document:
-        msg = await context.bot.copy_message(
-            chat_id=admin_chat_id,
-            from_chat_id=chat_id,
-            message_id=update.message.message_id,
-            caption=caption,
-            parse_mode='HTML'
-        )
-    else:
+    if not (update.message.photo or update.message.document):
         await update.message.reply_text("Please send the receipt as a photo or file.")
         cur.close()
         conn.close()
         return
 
-    # Add Approve/Reject buttons to the admin's message
+    # Approve/Reject buttons go out with the copy (sent immediately by the admin outbox)
     keyboard = InlineKeyboardMarkup([
         [
             InlineKeyboardButton("✅ Approve", callback_data=f"pay_approve_{bill_id}"),
             InlineKeyboardButton("❌ Reject", callback_data=f"pay_reject_{bill_id}")
         ]
     ])
-    await context.bot.edit_message_reply_markup(chat_id=admin_chat_id, message_id=msg.message_id, reply_markup=keyboard)
+    forward_to_admin(chat_id, update.message.message_id, caption, reply_markup=keyboard, meta={'bill_id': bill_id})
 
     # Mark as pending so they don't spam receipts
     cur.execute("UPDATE student_payments SET receipt_status = 'pending' WHERE id = ?", (bill_id,))
     conn.commit()
+    set_bill_unpaid(bill_id, chat_id, group, amount, 'pending')
 
     # Reply to student
     await update.message.reply_text(get_text('receipt_received', lang), parse_mode='HTML')
@@ -86,10 +84,62 @@ async def handle_receipt_upload(update: Update, context: ContextTypes.DEFAULT_TY
     cur.close()
     conn.close()
 
+# RETURNING needs SQLite 3.35+; older versions re-read the row after the update
+HAS_RETURNING = bool(Config.DATABASE_URL) or sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _resolve_receipt(bill_id: int, approved: bool):
+    """
+    Approve/reject a pending receipt as one compare-and-set.
+
+    Only the first click on a pending bill changes it and gets the bill back
+    (student_chat_id, group_name, amount_due); every later or concurrent
+    click gets None.
+    """
+    if approved:
+        changes = "is_paid = 1, receipt_status = 'approved', paid_at = CURRENT_TIMESTAMP"
+    else:
+        changes = "receipt_status = 'rejected'"
+
+    conn = get_connection()
+    cur = conn.cursor()
+    p = get_p()
+    update_sql = (
+        f"UPDATE student_payments SET {changes} "
+        f"WHERE id = {p} AND is_paid = 0 AND receipt_status = 'pending'"
+    )
+    try:
+        if HAS_RETURNING:
+            cur.execute(update_sql + " RETURNING student_chat_id, group_name, amount_due", (bill_id,))
+            bill = cur.fetchone()
+        else:
+            cur.execute(update_sql, (bill_id,))
+            bill = None
+            if cur.rowcount == 1:
+                cur.execute(
+                    f"SELECT student_chat_id, group_name, amount_due FROM student_payments WHERE id = {p}",
+                    (bill_id,)
+                )
+                bill = cur.fetchone()
+        conn.commit()
+    finally:
+        conn.close()
+
+    return dict(bill) if bill else None
+
+
+def _get_receipt_status(bill_id: int):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"SELECT receipt_status FROM student_payments WHERE id = {get_p()}", (bill_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row['receipt_status'] if row else None
+
+
 async def handle_payment_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handles admin clicking Approve/Reject on the receipt."""
     query = update.callback_query
-    await query.answer()
     
     data = query.data.split('_')
     action = data[1]
@@ -97,35 +147,76 @@ async def handle_payment_callback(update: Update, context: ContextTypes.DEFAULT_
     
     admin_id = str(update.effective_chat.id)
     if admin_id != Config.ADMIN_CHAT_ID:
+        await query.answer()
         return
-        
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT student_chat_id FROM student_payments WHERE id = ?", (bill_id,))
-    bill = cur.fetchone()
-    
+
+    approved = action == 'approve'
+    bill = _resolve_receipt(bill_id, approved)
+
     if not bill:
-        await query.edit_message_caption(caption="Error: Bill not found.", parse_mode='HTML')
-        cur.close()
-        conn.close()
+        # Lost the race (double click / another admin) or the bill is gone
+        status = _get_receipt_status(bill_id)
+        if status is None:
+            await query.answer("Bill not found.", show_alert=True)
+        else:
+            await query.answer(f"Already processed ({status}).", show_alert=True)
         return
-        
+
+    await query.answer()
+
     student_chat_id = str(bill['student_chat_id'])
     lang = get_user_language(student_chat_id)
-    original_caption = query.message.caption if query.message.caption else "Receipt"
+    # .caption is plain text (formatting dropped), escape it for the HTML edit
+    original_caption = html.escape(query.message.caption) if query.message.caption else "Receipt"
     
-    if action == 'approve':
-        cur.execute("UPDATE student_payments SET is_paid = 1, receipt_status = 'approved', paid_at = CURRENT_TIMESTAMP WHERE id = ?", (bill_id,))
-        conn.commit()
-        
-        await query.edit_message_caption(caption=original_caption + "\n\n✅ APPROVED", parse_mode='HTML')
-        await context.bot.send_message(chat_id=student_chat_id, text=get_text('payment_approved', lang), parse_mode='HTML')
+    if approved:
+        set_bill_paid(bill_id)
+        student_text, mark = get_text('payment_approved', lang), "✅ APPROVED"
     else:
-        cur.execute("UPDATE student_payments SET receipt_status = 'rejected' WHERE id = ?", (bill_id,))
-        conn.commit()
-        
-        await query.edit_message_caption(caption=original_caption + "\n\n❌ REJECTED", parse_mode='HTML')
-        await context.bot.send_message(chat_id=student_chat_id, text=get_text('payment_rejected', lang), parse_mode='HTML')
-        
-    cur.close()
-    conn.close()
\ No newline at end of file
+        set_bill_unpaid(bill_id, student_chat_id, bill['group_name'], bill['amount_due'], 'rejected')
+        student_text, mark = get_text('payment_rejected', lang), "❌ REJECTED"
+
+    # The student first: only this click can notify them (later clicks see "Already processed")
+    try:
+        await context.bot.send_message(chat_id=student_chat_id, text=student_text, parse_mode='HTML')
+    except Exception as e:
+        logger.error(f"❌ Could not notify student {student_chat_id} about bill {bill_id}: {e}")
+        mark += " (student not notified)"
+
+    try:
+        await query.edit_message_caption(caption=original_caption + f"\n\n{mark}", parse_mode='HTML')
+    except Exception as e:
+        # Cosmetic (caption too long, message not modified, network); the decision is stored
+        logger.warning(f"⚠️ Could not mark receipt {bill_id} as {mark}: {e}")
+
+
+async def _receipt_not_delivered(bot, payload: dict):
+    """The receipt copy never reached the admin: reopen the bill and ask the student to resend."""
+    bill_id = (payload.get('meta') or {}).get('bill_id')
+    student_chat_id = payload['from_chat_id']
+    if bill_id is None:
+        return
+
+    conn = get_connection()
+    cur = conn.cursor()
+    p = get_p()
+    cur.execute(
+        f"UPDATE student_payments SET receipt_status = NULL "
+        f"WHERE id = {p} AND is_paid = 0 AND receipt_status = 'pending'",
+        (bill_id,)
+    )
+    reopened = cur.rowcount
+    conn.commit()
+    conn.close()
+
+    if not reopened:
+        # Already approved/rejected some other way
+        return
+
+    refresh_student(student_chat_id)
+    lang = get_user_language(str(student_chat_id))
+    await bot.send_message(chat_id=student_chat_id, text=get_text('receipt_not_delivered', lang), parse_mode='HTML')
+    logger.warning(f"⚠️ Receipt for bill {bill_id} not delivered to admin, bill reopened")
+
+
+on_dropped('receipt', _receipt_not_delivered)
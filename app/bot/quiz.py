@@ -1,93 +1,15 @@
+import html
 from telegram import Update, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import ContextTypes, CommandHandler, MessageHandler, filters, ApplicationHandlerStop
 from app.config import Config
-from app.utils.localization import get_user_language
-import asyncio
+from app.utils.localization import get_user_language, render
+from app.services.admin_outbox import notify_admin
+from app.services.quiz_service import save_quiz_attempt, save_quiz_lead
 
 QUIZ_ACTIVE_KEY = 1
 
-QUIZ_UI_TEXTS = {
-    'intro_video': {
-        'en': "🎥 <b>Video Quiz Time!</b>\n\nWatch the video, then answer the question. If you get it wrong, we'll show you a video with the correct answer. Let's go!",
-        'ru': "🎥 <b>Время видео-теста!</b>\n\nПосмотрите видео и ответьте на вопрос. Если ошибетесь, мы покажем видео с правильным ответом. Поехали!",
-        'uz': "🎥 <b>Video test vaqti!</b>\n\nVideoni tomosha qiling va savolga javob bering. Xato qilsangiz, to'g'ri javobli videoni ko'rsatamiz. Boshladik!"
-    },
-    'correct': {
-        'en': "✅ Correct! Get ready for the next one...",
-        'ru': "✅ Правильно! Готовьтесь к следующему...",
-        'uz': "✅ To'g'ri! Keyingisiga tayyorgarlik ko'ring..."
-    },
-    'wrong': {
-        'en': "❌ Wrong. The correct answer was: <b>{ans}</b>",
-        'ru': "❌ Неверно. Правильный ответ: <b>{ans}</b>",
-        'uz': "❌ Noto'g'ri. To'g'ri javob: <b>{ans}</b>"
-    },
-    'result': {
-        'en': "🎉 <b>Quiz Complete!</b>\n\nYour score: <b>{score}/{total}</b>\nYour estimated level: <b>{level}</b>\n\n<b>Areas to improve:</b>\n{weak_topics}\n\nOur manager will contact you shortly to discuss the best group for you!",
-        'ru': "🎉 <b>Тест завершен!</b>\n\nВаш результат: <b>{score}/{total}</b>\nВаш примерный уровень: <b>{level}</b>\n\n<b>Зоны для улучшения:</b>\n{weak_topics}\n\nНаш менеджер скоро свяжется с вами, чтобы обсудить подходящую группу!",
-        'uz': "🎉 <b>Test yakunlandi!</b>\n\nSizning balingiz: <b>{score}/{total}</b>\nTaxminiy darajangiz: <b>{level}</b>\n\n<b>Yaxshilash kerak bo'lgan yo'nalishlar:</b>\n{weak_topics}\n\nMenejerimiz sizga mos guruhni muhokama qilish uchun tez orada bog'lanadi!"
-    },
-    'cancelled': {
-        'en': "Quiz cancelled. You can start it again anytime with /quiz",
-        'ru': "Тест отменен. Вы можете начать его снова в любое время с помощью /quiz",
-        'uz': "Test bekor qilindi. Uni istalgan vaqtda /quiz bilan qayta boshlashingiz mumkin."
-    },
-    'admin_cant': {
-        'en': "Admins can't take the quiz 😊",
-        'ru': "Админы не могут проходить тест 😊",
-        'uz': "Adminlar testni topshira olmaydi 😊"
-    },
-    'no_weak_topics': {
-        'en': "None - Perfect score! 🎯",
-        'ru': "Нет - Идеальный результат! 🎯",
-        'uz': "Yo'q - Mukammal natija! 🎯"
-    },
-    'phone_request': {
-        'en': "📱 We noticed you don't have a Telegram @username. To help our manager contact you quickly, please share your phone number.",
-        'ru': "📱 Мы заметили, что у вас нет @username в Telegram. Чтобы наш менеджер мог быстро с вами связаться, пожалуйста, поделитесь своим номером телефона.",
-        'uz': "📱 Sizda Telegram @username yo'qligini payqadik. Menejerimiz siz bilan tez bog'lanishi uchun iltimos, telefon raqamingizni ulashing."
-    },
-    'share_phone_btn': {
-        'en': "📱 Share Phone Number",
-        'ru': "📱 Отправить номер телефона",
-        'uz': "📱 Telefon raqamni ulashish"
-    },
-    'phone_received': {
-        'en': "✅ Thank you! Our manager will contact you soon.",
-        'ru': "✅ Спасибо! Наш менеджер скоро свяжется с вами.",
-        'uz': "✅ Rahmat! Menejerimiz tez orada siz bilan bog'lanadi."
-    },
-    'price_list': {
-        'en': "📋 <b>Price List & Plans</b>\n\nChoose the best option for you:\n\n📚 <b>Standard</b> (groups of 8-10 students)\n💵 750,000 UZS / month\n\n⭐️ <b>Comfort</b> (mini-groups up to 4 students)\n💵 1,200,000 UZS / month\n\n💎 <b>Ultima</b> (1-on-1)\n💵 2,500,000 UZS / month\n\n👇 Please select a plan below:",
-        'ru': "📋 <b>Прайс-лист и тарифы</b>\n\nВыберите лучший вариант для себя:\n\n📚 <b>Стандарт</b> (группы 8-10 человек)\n💵 750 000 сум / мес\n\n⭐️ <b>Комфорт</b> (мини-группы до 4 человек)\n💵 1 200 000 сум / мес\n\n💎 <b>Ultima</b> (индивидуально)\n💵 2 500 000 сум / мес\n\n👇 Пожалуйста, выберите тариф ниже:",
-        'uz': "📋 <b>Narxlar va tariflar</b>\n\nO'zingizga mos eng yaxshi variantni tanlang:\n\n📚 <b>Standard</b> (8-10 kishilik guruhlar)\n💵 750,000 UZS / oy\n\n⭐️ <b>Comfort</b> (4 kishigacha mini-guruhlar)\n💵 1,200,000 UZS / oy\n\n💎 <b>Ultima</b> (1-dan 1-ga)\n💵 2,500,000 UZS / oy\n\n👇 Iltimos, quyidan tarifni tanlang:"
-    },
-    'plan_group': {
-        'en': '📚 Standard',
-        'ru': '📚 Стандарт',
-        'uz': '📚 Standard'
-    },
-    'plan_mini_group': {
-        'en': '⭐️ Comfort',
-        'ru': '⭐️ Комфорт',
-        'uz': '⭐️ Comfort'
-    },
-    'plan_individual': {
-        'en': '💎 Ultima',
-        'ru': '💎 Ultima',
-        'uz': '💎 Ultima'
-    },
-        'already_taking': {
-        'en': "You are already taking the quiz! Please answer the current question.",
-        'ru': "Вы уже проходите тест! Пожалуйста, ответьте на текущий вопрос.",
-        'uz': "Siz allaqachon testni topshiryapsiz! Iltimos, joriy savolga javob bering."
-    },
-    'use_buttons': {
-        'en': "Please select an answer using the buttons below 👇",
-        'ru': "Пожалуйста, выберите ответ, используя кнопки ниже 👇",
-        'uz': "Iltimos, quyidagi tugmalardan foydalanib javobni tanlang 👇"
-    }
-}
+# Pause between the answer feedback and the next question (seconds)
+QUIZ_NEXT_DELAY = 1.5
 
 # ┌───────────────────────────────────────────────────────────┐
 # │  PASTE YOUR VIDEO FILE IDs AND QUESTIONS HERE             │
@@ -246,10 +168,6 @@ QUIZ_TOPICS = {
     }
 }
 
-def get_ui_text(key, lang, **kwargs):
-    text = QUIZ_UI_TEXTS.get(key, {}).get(lang, QUIZ_UI_TEXTS.get(key, {}).get('en', ''))
-    return text.format(**kwargs)
-
 def get_level(score: int, total: int) -> str:
     percentage = (score / total) * 100 if total > 0 else 0
     if percentage <= 33:
@@ -265,25 +183,29 @@ async def start_quiz(update: Update, context: ContextTypes.DEFAULT_TYPE):
     lang = get_user_language(str(chat_id))
     
     if str(chat_id) == str(Config.ADMIN_CHAT_ID):
-        await update.message.reply_text(get_ui_text('admin_cant', lang))
+        await update.message.reply_text(render('quiz_admin_cant', lang))
         return
 
     if context.user_data.get(QUIZ_ACTIVE_KEY, False):
-        await update.message.reply_text(get_ui_text('already_taking', lang))
+        await update.message.reply_text(render('quiz_already_taking', lang))
         return
 
     context.user_data['quiz_score'] = 0
     context.user_data['quiz_index'] = 0
     context.user_data['weak_topics'] = []
+    # (question_index, answer, is_correct, topic), written to the DB at finish
+    context.user_data['quiz_answers'] = []
+    context.user_data['quiz_user'] = (user.full_name, user.username)
+    context.user_data['quiz_attempt_id'] = None
+    context.user_data['quiz_next_pending'] = False
     context.user_data[QUIZ_ACTIVE_KEY] = True
     
-    await update.message.reply_text(get_ui_text('intro_video', lang), parse_mode='HTML')
-    await send_question(update, context)
+    await update.message.reply_text(render('quiz_intro_video', lang), parse_mode='HTML')
+    await send_question(context, chat_id)
 
-async def send_question(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def send_question(context: ContextTypes.DEFAULT_TYPE, chat_id: int):
     index = context.user_data['quiz_index']
     q_data = QUIZ_QUESTIONS[index]
-    chat_id = update.effective_chat.id
     
     keyboard = []
     for opt in q_data['o']:
@@ -299,12 +221,10 @@ async def send_question(update: Update, context: ContextTypes.DEFAULT_TYPE):
         reply_markup=reply_markup
     )
 
-async def finish_quiz(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def finish_quiz(context: ContextTypes.DEFAULT_TYPE, chat_id: int):
     score = context.user_data['quiz_score']
     total = len(QUIZ_QUESTIONS)
     level = get_level(score, total)
-    user = update.effective_user
-    chat_id = update.effective_chat.id
     lang = get_user_language(str(chat_id))
     
     weak_topics = context.user_data.get('weak_topics', [])
@@ -316,9 +236,9 @@ async def finish_quiz(update: Update, context: ContextTypes.DEFAULT_TYPE):
             translated_topics.append(f"  - {topic_str}")
         weak_str = "\n".join(translated_topics)
     else:
-        weak_str = get_ui_text('no_weak_topics', lang)
+        weak_str = render('quiz_no_weak_topics', lang)
     
-    result_text = get_ui_text('result', lang, score=score, total=total, level=level, weak_topics=weak_str)
+    result_text = render('quiz_result', lang, score=score, total=total, level=level, weak_topics=weak_str)
     
     from telegram import ReplyKeyboardRemove
     await context.bot.send_message(
@@ -334,24 +254,76 @@ async def finish_quiz(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data['quiz_level'] = level
     context.user_data['quiz_weak_str'] = weak_str
     context.user_data[QUIZ_ACTIVE_KEY] = False
+
+    # One batch for the attempt and all of its answers
+    full_name, username = context.user_data.get('quiz_user', (None, None))
+    context.user_data['quiz_attempt_id'] = save_quiz_attempt(
+        chat_id, full_name, username, lang,
+        score, total, level, weak_topics,
+        context.user_data.get('quiz_answers', [])
+    )
+    context.user_data['quiz_answers'] = []
     context.user_data['awaiting_plan'] = True
     
     # SHOW PRICE LIST & PLAN BUTTONS
     from telegram import ReplyKeyboardMarkup, KeyboardButton
     keyboard = [
-        [KeyboardButton(get_ui_text('plan_group', lang))],
-        [KeyboardButton(get_ui_text('plan_mini_group', lang))],
-        [KeyboardButton(get_ui_text('plan_individual', lang))]
+        [KeyboardButton(render('quiz_plan_group', lang))],
+        [KeyboardButton(render('quiz_plan_mini_group', lang))],
+        [KeyboardButton(render('quiz_plan_individual', lang))]
     ]
     reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=True)
     
     await context.bot.send_message(
         chat_id=chat_id,
-        text=get_ui_text('price_list', lang),
+        text=render('quiz_price_list', lang),
         parse_mode='HTML',
         reply_markup=reply_markup
     )
 
+# ═══════════════════════════════════════════════════════════
+# DEFERRED NEXT QUESTION
+# ═══════════════════════════════════════════════════════════
+# The answer handler used to sleep before sending the next question, holding
+# the update (and, without concurrent processing, everyone else's) meanwhile.
+# The next question is now a one-off job; the handler returns at once.
+
+def _next_question_job_name(chat_id) -> str:
+    return f"quiz_next_{chat_id}"
+
+
+async def _deliver_next_question(context: ContextTypes.DEFAULT_TYPE):
+    """JobQueue callback: send the next question (or the result) after the pause."""
+    chat_id = context.job.chat_id
+    context.user_data['quiz_next_pending'] = False
+
+    # Cancelled while the job was waiting
+    if not context.user_data.get(QUIZ_ACTIVE_KEY, False):
+        return
+
+    if context.user_data['quiz_index'] < len(QUIZ_QUESTIONS):
+        await send_question(context, chat_id)
+    else:
+        await finish_quiz(context, chat_id)
+
+
+def schedule_next_question(context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_id: int):
+    context.user_data['quiz_next_pending'] = True
+    context.job_queue.run_once(
+        _deliver_next_question,
+        QUIZ_NEXT_DELAY,
+        chat_id=chat_id,
+        user_id=user_id,
+        name=_next_question_job_name(chat_id)
+    )
+
+
+def cancel_next_question(context: ContextTypes.DEFAULT_TYPE, chat_id: int):
+    context.user_data['quiz_next_pending'] = False
+    for job in context.job_queue.get_jobs_by_name(_next_question_job_name(chat_id)):
+        job.schedule_removal()
+
+
 async def send_final_report_and_finish(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     chat_id = update.effective_chat.id
@@ -364,26 +336,30 @@ async def send_final_report_and_finish(update: Update, context: ContextTypes.DEF
     selected_plan = context.user_data.get('selected_plan', 'N/A')
     phone = context.user_data.get('phone_number', None)
     
-    # Build Admin Report
+    # Build Admin Report (HTML: user-typed values are escaped)
     admin_text = (
         f"🧠 <b>New Lead Took The Video Quiz!</b>\n\n"
-        f"Name: {user.full_name}\n"
-        f"Username: @{user.username if user.username else 'N/A'}\n"
+        f"Name: {html.escape(user.full_name or '')}\n"
+        f"Username: @{html.escape(user.username) if user.username else 'N/A'}\n"
         f"Telegram ID: <code>{chat_id}</code>\n"
     )
     if phone:
-        admin_text += f"Phone: <code>{phone}</code>\n"
+        admin_text += f"Phone: <code>{html.escape(phone)}</code>\n"
         
     admin_text += (
         f"\nScore: {score}/{total}\n"
-        f"Level: <b>{level}</b>\n"
-        f"Selected Plan: <b>{selected_plan}</b>\n"
-        f"Weak Topics:\n{weak_str}"
+        f"Level: <b>{html.escape(str(level))}</b>\n"
+        f"Selected Plan: <b>{html.escape(str(selected_plan))}</b>\n"
+        f"Weak Topics:\n{html.escape(str(weak_str))}"
     )
     
-    # Send to single admin
+    attempt_id = context.user_data.get('quiz_attempt_id')
+    if attempt_id:
+        save_quiz_lead(attempt_id, selected_plan, phone)
+
+    # Queue for the admin digest
     try:
-        await context.bot.send_message(chat_id=Config.ADMIN_CHAT_ID, text=admin_text, parse_mode='HTML')
+        notify_admin(admin_text, kind='lead')
     except Exception as e:
         print(f"Failed to send quiz result to admin: {e}")
             
@@ -391,7 +367,7 @@ async def send_final_report_and_finish(update: Update, context: ContextTypes.DEF
     from app.bot.keyboards import unregistered_menu_keyboard
     await context.bot.send_message(
         chat_id=chat_id, 
-        text=get_ui_text('phone_received', lang), 
+        text=render('quiz_phone_received', lang), 
         parse_mode='HTML', 
         reply_markup=unregistered_menu_keyboard(lang)
     )
@@ -407,19 +383,26 @@ async def handle_unregistered_text(update: Update, context: ContextTypes.DEFAULT
     
     # 1. Check if taking the quiz
     if context.user_data.get(QUIZ_ACTIVE_KEY, False):
+        # Answer already taken, next question is on its way
+        if context.user_data.get('quiz_next_pending', False):
+            raise ApplicationHandlerStop()
+
         index = context.user_data['quiz_index']
         q_data = QUIZ_QUESTIONS[index]
         
         if text not in q_data['o']:
-            await update.message.reply_text(get_ui_text('use_buttons', lang))
+            await update.message.reply_text(render('quiz_use_buttons', lang))
             raise ApplicationHandlerStop()
             
         is_correct = text == q_data['c']
+        context.user_data.setdefault('quiz_answers', []).append(
+            (index, text, is_correct, q_data.get('topic', 'General'))
+        )
         if is_correct:
             context.user_data['quiz_score'] += 1
-            feedback = get_ui_text('correct', lang)
+            feedback = render('quiz_correct', lang)
         else:
-            feedback = get_ui_text('wrong', lang, ans=q_data['c'])
+            feedback = render('quiz_wrong', lang, ans=q_data['c'])
             topic = q_data.get('topic', 'General')
             if topic not in context.user_data['weak_topics']:
                 context.user_data['weak_topics'].append(topic)
@@ -427,12 +410,7 @@ async def handle_unregistered_text(update: Update, context: ContextTypes.DEFAULT
         await update.message.reply_text(feedback, parse_mode='HTML')
         context.user_data['quiz_index'] += 1
         
-        await asyncio.sleep(1.5)
-        
-        if context.user_data['quiz_index'] < len(QUIZ_QUESTIONS):
-            await send_question(update, context)
-        else:
-            await finish_quiz(update, context)
+        schedule_next_question(context, chat_id, user.id)
         raise ApplicationHandlerStop()
         
     # 2. Check if awaiting plan selection
@@ -455,11 +433,11 @@ async def handle_unregistered_text(update: Update, context: ContextTypes.DEFAULT
         
         if not user.username:
             context.user_data['awaiting_phone'] = True
-            keyboard = [[KeyboardButton(get_ui_text('share_phone_btn', lang), request_contact=True)]]
+            keyboard = [[KeyboardButton(render('quiz_share_phone_btn', lang), request_contact=True)]]
             reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=True)
             
             await update.message.reply_text(
-                get_ui_text('phone_request', lang),
+                render('quiz_phone_request', lang),
                 parse_mode='HTML',
                 reply_markup=reply_markup
             )
@@ -493,5 +471,6 @@ async def cancel_quiz(update: Update, context: ContextTypes.DEFAULT_TYPE):
         context.user_data[QUIZ_ACTIVE_KEY] = False
         context.user_data['awaiting_phone'] = False
         context.user_data['awaiting_plan'] = False
-        await update.message.reply_text(get_ui_text('cancelled', lang), reply_markup=unregistered_menu_keyboard(lang))
+        cancel_next_question(context, update.effective_chat.id)
+        await update.message.reply_text(render('quiz_cancelled', lang), reply_markup=unregistered_menu_keyboard(lang))
         raise ApplicationHandlerStop()
\ No newline at end of file
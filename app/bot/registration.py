@@ -1,52 +1,36 @@
 from telegram import Update, ReplyKeyboardRemove
 from telegram.ext import ContextTypes, ConversationHandler
-from app.services.user_service import activate_user, is_registered, get_user
+import html
+from app.services.user_service import activate_user, is_registered, get_user, record_bot_start
 from app.config import Config
+from app.services.admin_outbox import notify_admin
 from app.bot.keyboards import main_menu_keyboard, unregistered_menu_keyboard
-from app.utils.localization import get_user_language, get_text, set_user_language
-from app.database.db import get_connection
+from app.utils.localization import get_user_language, get_text, set_user_language, render
 
 # States
 ENTERING_KEY = 0
 
+
+def notify_admin_new_start(user, chat_id: str):
+    """Tell the admin (in the next digest) that someone started the bot for the first time."""
+    try:
+        admin_notify_text = (
+            f"Name: {html.escape(user.full_name)}\n"
+            f"Username: @{user.username if user.username else 'N/A'}\n"
+            f"Telegram ID: <code>{chat_id}</code>"
+        )
+        notify_admin(admin_notify_text, kind='start')
+    except Exception as e:
+        print(f"Failed to notify admin about new start: {e}")
+
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command."""
     chat_id = str(update.effective_chat.id)
     lang = get_user_language(chat_id)
 
-    # --- NEW: Notify Admin ONLY on first /start ---
-    if chat_id != str(Config.ADMIN_CHAT_ID):
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        # Check if this user has started the bot before
-        cur.execute("SELECT chat_id FROM bot_starts WHERE chat_id = ?", (chat_id,))
-        has_started = cur.fetchone()
-        
-        if not has_started:
-            try:
-                user = update.effective_user
-                admin_notify_text = (
-                    f"🚀 <b>New User Started the Bot</b>\n\n"
-                    f"Name: {user.full_name}\n"
-                    f"Username: @{user.username if user.username else 'N/A'}\n"
-                    f"Telegram ID: <code>{chat_id}</code>"
-                )
-                await context.bot.send_message(
-                    chat_id=Config.ADMIN_CHAT_ID, 
-                    text=admin_notify_text, 
-                    parse_mode='HTML'
-                )
-            except Exception as e:
-                print(f"Failed to notify admin about new start: {e}")
-            
-            # Mark them as started so we don't spam next time
-            cur.execute("INSERT INTO bot_starts (chat_id) VALUES (?)", (chat_id,))
-            conn.commit()
-            
-        cur.close()
-        conn.close()
-    # -------------------------------------------
+    # Notify admin ONLY on first /start (queued, sent with the next admin digest)
+    if chat_id != str(Config.ADMIN_CHAT_ID) and record_bot_start(chat_id):
+        notify_admin_new_start(update.effective_user, chat_id)
 
     # Check if admin
     if str(chat_id) == str(Config.ADMIN_CHAT_ID):
@@ -158,7 +142,8 @@ async def key_entered(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     group_text = f"\n{get_text('status_group', lang)}: {group}" if group else ""
 
-    msg = get_text('registration_success', lang).format(
+    msg = render(
+        'registration_success', lang,
         icon=role_icon,
         name=name,
         role=role_text,
@@ -4,7 +4,7 @@ from app.services.user_service import get_user
 from app.bot.keyboards import schedule_keyboard
 from telegram.constants import ChatAction
 from app.config import Config
-from app.utils.localization import get_text, get_user_language  # ← Add this import at top
+from app.utils.localization import get_text, get_user_language, render  # ← Add this import at top
 
 
 def is_admin(chat_id: str) -> bool:
@@ -13,46 +13,45 @@ def is_admin(chat_id: str) -> bool:
 
 
 def get_user_meetings(chat_id: str) -> list:
-    from app.config import Config
     from app.services.user_service import get_teacher_groups_effective, get_user
+    from app.services.meeting_index import get_all_meetings, get_group_meetings, get_teacher_meetings
     
     if is_admin(chat_id):
-        return Config.load_meetings()
+        return get_all_meetings()
     
     user = get_user(chat_id)
     if not user:
         return []
     
-    all_meetings = Config.load_meetings()
-    
     if user['role'] == 'student':
-        # Split "Group A, Group B" -> ["group a", "group b"]
+        # "Group A, Group B" -> meetings of each group (duplicates in the list ignored)
         raw_groups = user.get('group_name') or ""
-        user_groups = [g.strip().lower() for g in raw_groups.split(',')]
-        
-        return [
-            m for m in all_meetings 
-            if (m.get('group_name') or "").strip().lower() in user_groups
-        ]
+        meetings = []
+        seen = set()
+        for group in raw_groups.split(','):
+            for m in get_group_meetings(group):
+                if id(m) not in seen:
+                    seen.add(id(m))
+                    meetings.append(m)
+        return meetings
     else:
         # Teacher Logic (Already supports multiple rows in DB)
         teacher_groups = get_teacher_groups_effective(chat_id)
         if not teacher_groups:
             return []
             
-        group_names = [(g['group_name'] or "").strip().lower() for g in teacher_groups]
-        teacher_name_lower = (user.get('name') or "").strip().lower()
+        group_names = {(g['group_name'] or "").strip().lower() for g in teacher_groups}
         
         return [
-            m for m in all_meetings 
+            m for m in get_teacher_meetings(user.get('name'))
             if (m.get('group_name') or "").strip().lower() in group_names
-            and (m.get('teacher_name') or "").strip().lower() == teacher_name_lower
         ]
 
 def get_weekly_schedule(chat_id: str, weeks_ahead: int = 0) -> dict:
     from datetime import datetime, timedelta
     import pytz
     from app.utils.localization import get_user_language, format_date_localized, get_day_name
+    from app.services.lesson_service import get_lessons_between, POSTPONED
     
     tz = pytz.timezone(Config.TIMEZONE)
     now = datetime.now(tz)
@@ -63,58 +62,46 @@ def get_weekly_schedule(chat_id: str, weeks_ahead: int = 0) -> dict:
     week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
     week_end = week_start + timedelta(days=6)
     
-    # Formats for query
-    start_str = week_start.strftime("%d-%m-%Y")
-    end_str = week_end.strftime("%d-%m-%Y")
-    
     meetings = get_user_meetings(chat_id)
     
-    day_map = {
-        'monday': 0, 'tuesday': 1, 'wednesday': 2,
-        'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6
-    }
+    # Weekly rules expanded + cancelled / moved occurrences applied
+    lessons_by_date = {}
+    for lesson in get_lessons_between(meetings, week_start.date(), week_end.date()):
+        meeting = lesson['meeting']
+        start = lesson['start']
+        lesson_info = {
+            'time': start.strftime("%H:%M"),
+            'hour': start.hour,
+            'minute': start.minute,
+            'title': meeting.get('title', 'Lesson'),
+            'group': meeting.get('group_name', ''),
+            'teacher': meeting.get('teacher_name', ''),
+            'meeting_id': meeting['id'],
+            'status': lesson['status']
+        }
+        if lesson['status'] == POSTPONED and lesson.get('new_start'):
+            lesson_info['new_date'] = lesson['new_start'].strftime("%d-%m-%Y")
+            lesson_info['new_time'] = lesson['new_start'].strftime("%H:%M")
+        elif lesson['status'] == 'rescheduled':
+            lesson_info['original_date'] = lesson['original_date'].strftime("%d-%m-%Y")
+        lessons_by_date.setdefault(lesson['lesson_date'], []).append(lesson_info)
     
     days = []
     for i in range(7):
         current_date = week_start + timedelta(days=i)
         date_str = current_date.strftime("%d-%m-%Y")
         day_name_en = current_date.strftime("%A")
-        day_num = current_date.weekday()
         
         day_name = get_day_name(day_name_en, lang)
         day_short = format_date_localized(current_date, lang, 'short')
         
-        lessons = []
-        
-        for meeting in meetings:
-            schedule = meeting.get('schedule', {})
-            meeting_days = [day_map.get(d.lower(), -1) for d in schedule.get('days', [])]
-            
-            hour = schedule.get('hour', 0)
-            minute = schedule.get('minute', 0)
-            
-            if day_num in meeting_days:
-                lesson_info = {
-                    'time': f"{hour:02d}:{minute:02d}",
-                    'hour': hour,
-                    'minute': minute,
-                    'title': meeting.get('title', 'Lesson'),
-                    'group': meeting.get('group_name', ''),
-                    'teacher': meeting.get('teacher_name', ''),
-                    'meeting_id': meeting['id'],
-                    'status': 'normal'
-                }
-                
-                lessons.append(lesson_info)
-        
-        lessons.sort(key=lambda x: (x['hour'], x['minute']))
-        
         days.append({
             'date': date_str,
             'day_name': day_name,
             'day_short': day_short,
             'is_today': current_date.date() == now.date(),
-            'lessons': lessons
+            # Already in start-time order
+            'lessons': lessons_by_date.get(current_date.date(), [])
         })
     
     week_start_str = format_date_localized(week_start, lang, 'month_day')
@@ -335,4 +322,30 @@ async def today_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message,
         parse_mode='HTML',
         reply_markup=schedule_keyboard(lang)  # ← Pass lang
-    )
\ No newline at end of file
+    )
+
+async def calendar_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Send the user's lessons as an .ics file (+ subscription link if the feed URL is public)."""
+    from telegram import InputFile
+    from app.services.calendar_feed import get_user_calendar, feed_url
+
+    chat_id = str(update.effective_chat.id)
+    lang = get_user_language(chat_id)
+
+    if not is_admin(chat_id):
+        user = get_user(chat_id)
+        if not user:
+            await update.message.reply_text(get_text('not_registered', lang))
+            return
+
+    feed = get_user_calendar(chat_id)
+
+    caption = render('calendar_caption', lang, weeks=Config.CALENDAR_WEEKS)
+    url = feed_url(chat_id)
+    if url:
+        caption += "\n\n" + render('calendar_subscribe', lang, url=url)
+
+    await update.message.reply_document(
+        document=InputFile(feed['body'], filename="schedule.ics"),
+        caption=caption
+    )
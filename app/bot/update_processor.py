@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from collections import deque
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# PER-CHAT ORDERED UPDATE PROCESSING
+# ═══════════════════════════════════════════════════════════
+# Updates from different chats run concurrently; updates from the same chat
+# run one at a time, in arrival order, so ConversationHandler states and
+# user_data are never touched by two handlers of one chat at once.
+#
+# Two limits:
+#   max_concurrent_updates - handlers running at the same time
+#   max_pending_updates    - updates accepted (running + waiting); beyond
+#                            that PTB stops pulling from its update queue
+# An update waiting for its chat does not hold a running slot, so one chat
+# sending a burst can't starve the others.
+
+# Wait / run times kept for the metrics (most recent N updates)
+TIMING_SAMPLES = 500
+
+# Log a warning when an update waited longer than this (seconds)
+SLOW_WAIT_WARNING = 5.0
+
+
+def _chat_key(update: object):
+    if isinstance(update, Update):
+        if update.effective_chat:
+            return update.effective_chat.id
+        if update.effective_user:
+            return update.effective_user.id
+    return None
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Concurrent across chats (bounded), strictly sequential within a chat."""
+
+    __slots__ = (
+        '_chat_locks', '_workers', '_worker_limit',
+        '_waiting', '_running', '_max_waiting', '_processed', '_failed',
+        '_wait_times', '_run_times'
+    )
+
+    def __init__(self, max_concurrent_updates: int, max_pending_updates: int = 1024):
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        # The base class bounds the updates accepted at once (its semaphore
+        # wraps do_process_update); handlers running at once are bounded by
+        # our own semaphore, taken only after the chat lock
+        super().__init__(max(max_pending_updates, max_concurrent_updates))
+        self._worker_limit = max_concurrent_updates
+        self._workers = asyncio.Semaphore(max_concurrent_updates)
+        # chat_id -> [asyncio.Lock, number of updates holding or waiting for it]
+        self._chat_locks = {}
+
+        # Metrics
+        self._waiting = 0
+        self._running = 0
+        self._max_waiting = 0
+        self._processed = 0
+        self._failed = 0
+        self._wait_times = deque(maxlen=TIMING_SAMPLES)
+        self._run_times = deque(maxlen=TIMING_SAMPLES)
+
+    async def do_process_update(self, update: object, coroutine) -> None:
+        loop = asyncio.get_running_loop()
+        arrived = loop.time()
+        key = _chat_key(update)
+
+        entry = None
+        if key is not None:
+            entry = self._chat_locks.get(key)
+            if entry is None:
+                entry = self._chat_locks[key] = [asyncio.Lock(), 0]
+            entry[1] += 1
+
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        started = None
+
+        try:
+            # Chat lock first (FIFO -> arrival order per chat), then a running slot
+            if entry is not None:
+                await entry[0].acquire()
+            try:
+                async with self._workers:
+                    started = loop.time()
+                    self._waiting -= 1
+                    self._running += 1
+                    try:
+                        await coroutine
+                    except Exception:
+                        self._failed += 1
+                        raise
+                    finally:
+                        self._running -= 1
+            finally:
+                if entry is not None:
+                    entry[0].release()
+        finally:
+            if started is None:
+                # Cancelled while waiting
+                self._waiting -= 1
+                if asyncio.iscoroutine(coroutine):
+                    coroutine.close()
+            else:
+                waited = started - arrived
+                self._wait_times.append(waited)
+                self._run_times.append(loop.time() - started)
+                self._processed += 1
+                if waited > SLOW_WAIT_WARNING:
+                    logger.warning(f"⚠️ Update for chat {key} waited {waited:.1f}s before processing")
+
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._chat_locks[key]
+
+    def get_metrics(self) -> dict:
+        """Snapshot of queue depth and timing (seconds) for monitoring."""
+        waits = list(self._wait_times)
+        runs = list(self._run_times)
+        return {
+            'running': self._running,
+            'waiting': self._waiting,
+            'max_waiting': self._max_waiting,
+            'active_chats': len(self._chat_locks),
+            'processed': self._processed,
+            'failed': self._failed,
+            'max_concurrent': self._worker_limit,
+            'wait_avg': sum(waits) / len(waits) if waits else 0.0,
+            'wait_p95': _percentile(waits, 0.95),
+            'wait_max': max(waits) if waits else 0.0,
+            'run_avg': sum(runs) / len(runs) if runs else 0.0,
+            'run_p95': _percentile(runs, 0.95),
+        }
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
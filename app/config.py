@@ -17,8 +17,34 @@ class Config:
     # Meetings config
     MEETINGS_FILE = "meetings.json"
     
+    # Optional directory with <lang>.json text overrides
+    LOCALES_DIR = os.getenv("LOCALES_DIR")
+    
     DATABASE_URL = os.getenv("DATABASE_URL")
     
+    # Random part of registration keys (STU-XXXXXX); 36^6 ≈ 2.2 billion keys
+    REGISTRATION_KEY_LENGTH = int(os.getenv("REGISTRATION_KEY_LENGTH", "6"))
+    
+    # Error reports: repeats of the same error within the window are
+    # batched into a digest; the last ERROR_BUFFER_SIZE errors are kept for /errors
+    ERROR_REPORT_WINDOW_MINUTES = int(os.getenv("ERROR_REPORT_WINDOW_MINUTES", "10"))
+    ERROR_BUFFER_SIZE = int(os.getenv("ERROR_BUFFER_SIZE", "50"))
+    
+    # How many updates (from different chats) are handled at the same time
+    MAX_CONCURRENT_UPDATES = int(os.getenv("MAX_CONCURRENT_UPDATES", "32"))
+    # Updates accepted at once (running + waiting for their chat / a free slot)
+    MAX_PENDING_UPDATES = int(os.getenv("MAX_PENDING_UPDATES", "1024"))
+    
+    # Low-priority admin notifications (new starts, quiz leads) are sent as a digest
+    ADMIN_DIGEST_MINUTES = int(os.getenv("ADMIN_DIGEST_MINUTES", "15"))
+    
+    # Calendar feed (.ics): weeks of lessons exported, public base URL of the
+    # keep-alive server for subscription links, and the secret that signs the
+    # feed URLs (defaults to the bot token)
+    CALENDAR_WEEKS = int(os.getenv("CALENDAR_WEEKS", "8"))
+    PUBLIC_URL = os.getenv("PUBLIC_URL") or os.getenv("RENDER_EXTERNAL_URL")
+    CALENDAR_SECRET = os.getenv("CALENDAR_SECRET")
+    
     @staticmethod
     def load_meetings() -> list:
         full_path = Config.MEETINGS_FILE
@@ -31,4 +57,13 @@ class Config:
             return []
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON in {full_path}: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def load_billing() -> dict:
+        """Optional "billing" section of meetings.json (monthly amounts per group/plan)."""
+        try:
+            with open(Config.MEETINGS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get('billing', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
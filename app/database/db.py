@@ -1,7 +1,9 @@
 import os
+import re
 import sqlite3
 import logging
 from contextlib import contextmanager
+from app.utils.names import normalize_name
 
 # Check if we are on Render (Postgres) or Local (SQLite)
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -39,9 +41,20 @@ class SQLiteToPostgresCursor:
             logger.error(f"SQL Error: {e} | Query: {clean_sql}")
             raise e
 
+    def executemany(self, sql, seq_of_params):
+        clean_sql = sql.replace('?', '%s')
+        try:
+            return self.cursor.executemany(clean_sql, seq_of_params)
+        except Exception as e:
+            logger.error(f"SQL Error: {e} | Query: {clean_sql}")
+            raise e
+
     def fetchone(self):
         return self.cursor.fetchone()
 
+    def fetchmany(self, size):
+        return self.cursor.fetchmany(size)
+
     def fetchall(self):
         return self.cursor.fetchall()
     
@@ -57,13 +70,17 @@ class ConnectionWrapper:
     def __init__(self, conn):
         self.conn = conn
     
-    def cursor(self):
-        real_cursor = self.conn.cursor()
+    def cursor(self, name=None):
+        # A named cursor is a server-side cursor: rows arrive in batches
+        real_cursor = self.conn.cursor(name=name) if name else self.conn.cursor()
         return SQLiteToPostgresCursor(real_cursor)
     
     def commit(self):
         self.conn.commit()
     
+    def rollback(self):
+        self.conn.rollback()
+    
     def close(self):
         self.conn.close()
 
@@ -106,19 +123,24 @@ def init_database():
     if DATABASE_URL and HAS_POSTGRES:
         # Unwrap for init to avoid '?' issues in CREATE statements
         cursor = conn.conn.cursor() 
+        is_pg = True
         pk_type = "SERIAL PRIMARY KEY"
+        id_type = "BIGINT"
         print("🚀 Initializing Database: POSTGRES Mode")
     else:
         cursor = conn.cursor()
+        is_pg = False
         pk_type = "INTEGER PRIMARY KEY AUTOINCREMENT"
+        id_type = "INTEGER"
         print("💻 Initializing Database: SQLITE Mode (Local)")
 
     # 1. Users
     cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS users (
             id {pk_type},
-            chat_id TEXT UNIQUE,
+            chat_id {id_type} UNIQUE,
             name TEXT NOT NULL,
+            name_key TEXT,
             role TEXT NOT NULL,
             group_name TEXT,
             registration_key TEXT UNIQUE NOT NULL,
@@ -133,8 +155,9 @@ def init_database():
     cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS teacher_groups (
             id {pk_type},
-            teacher_chat_id TEXT NOT NULL,
+            teacher_chat_id {id_type} NOT NULL,
             group_name TEXT NOT NULL,
+            group_key TEXT,
             subject TEXT,
             UNIQUE(teacher_chat_id, group_name)
         )
@@ -156,7 +179,7 @@ def init_database():
         CREATE TABLE IF NOT EXISTS approvals (
             id {pk_type},
             request_id TEXT NOT NULL,
-            approver_chat_id TEXT NOT NULL,
+            approver_chat_id {id_type} NOT NULL,
             approved INTEGER NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             UNIQUE(request_id, approver_chat_id)
@@ -167,7 +190,7 @@ def init_database():
     cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS student_payments (
             id {pk_type},
-            student_chat_id TEXT NOT NULL,
+            student_chat_id {id_type} NOT NULL,
             group_name TEXT NOT NULL,
             month_year TEXT NOT NULL,
             amount_due INTEGER NOT NULL,
@@ -181,15 +204,247 @@ def init_database():
     
     cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS bot_starts (
-                chat_id TEXT PRIMARY KEY,
+                chat_id {id_type} PRIMARY KEY,
                 started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
     
+    # 6. Admin notification outbox (see app/services/admin_outbox.py)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS admin_outbox (
+            id {pk_type},
+            priority TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            attempts INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_admin_outbox_pending "
+        "ON admin_outbox (priority, id) WHERE sent_at IS NULL"
+    )
+    
+    # 7. Quiz attempts (one row per finished quiz) and their answers
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS quiz_attempts (
+            id {pk_type},
+            chat_id {id_type} NOT NULL,
+            full_name TEXT,
+            username TEXT,
+            language TEXT,
+            score INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            level TEXT,
+            weak_topics TEXT,
+            selected_plan TEXT,
+            phone TEXT,
+            finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            lead_at TIMESTAMP
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS quiz_answers (
+            id {pk_type},
+            attempt_id INTEGER NOT NULL,
+            question_index INTEGER NOT NULL,
+            answer TEXT,
+            is_correct INTEGER NOT NULL,
+            topic TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_quiz_attempts_finished ON quiz_attempts (finished_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_quiz_answers_attempt ON quiz_answers (attempt_id)")
+
+    # 8. One-off changes to a single lesson (dates are YYYY-MM-DD)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS lesson_overrides (
+            id {pk_type},
+            meeting_id TEXT NOT NULL,
+            lesson_date TEXT NOT NULL,
+            status TEXT NOT NULL,
+            new_date TEXT,
+            new_hour INTEGER,
+            new_minute INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(meeting_id, lesson_date)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_lesson_overrides_date ON lesson_overrides (lesson_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_lesson_overrides_new_date ON lesson_overrides (new_date)")
+    
+    run_migrations(cursor, is_pg)
+
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully.")
     
+# ═══════════════════════════════════════════════════════════
+# MIGRATIONS (existing databases)
+# ═══════════════════════════════════════════════════════════
+
+# Columns that hold Telegram chat ids. Older databases stored them as TEXT,
+# which forced CAST() in JOINs and defeated the indexes on both sides.
+CHAT_ID_COLUMNS = [
+    ('users', 'chat_id'),
+    ('teacher_groups', 'teacher_chat_id'),
+    ('approvals', 'approver_chat_id'),
+    ('student_payments', 'student_chat_id'),
+    ('bot_starts', 'chat_id'),
+]
+
+
+def _column_types(cursor, table: str, is_pg: bool) -> dict:
+    """Returns {column_name: declared_type} for a table."""
+    if is_pg:
+        cursor.execute("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = %s
+        """, (table,))
+        return {row['column_name']: row['data_type'].upper() for row in cursor.fetchall()}
+
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row['name']: (row['type'] or '').upper() for row in cursor.fetchall()}
+
+
+def _migrate_chat_id_column(cursor, table: str, column: str, is_pg: bool):
+    """Convert a TEXT chat id column to BIGINT (Postgres) / INTEGER (SQLite)."""
+    if is_pg:
+        cursor.execute(f"""
+            ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT
+            USING CASE WHEN TRIM({column}) ~ '^-?[0-9]+$' THEN TRIM({column})::BIGINT END
+        """)
+        return
+
+    # SQLite cannot change a column type: rebuild the table with the same
+    # definition (constraints included) and copy the rows over.
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    create_sql = cursor.fetchone()['sql']
+    new_sql = re.sub(rf'(\b{column}\s+)TEXT\b', r'\1INTEGER', create_sql, count=1)
+
+    columns = list(_column_types(cursor, table, is_pg).keys())
+    # Same rule as the Postgres '^-?[0-9]+$': optional leading '-', then digits
+    # only (GLOB alone would let '1-2' through and CAST would turn it into 1)
+    digits = f"LTRIM(TRIM({column}), '-')"
+    valid = (
+        f"{digits} <> '' AND {digits} NOT GLOB '*[^0-9]*' "
+        f"AND LENGTH(TRIM({column})) - LENGTH({digits}) <= 1"
+    )
+    select_cols = [
+        f"CASE WHEN {valid} THEN CAST(TRIM({c}) AS INTEGER) END" if c == column else c
+        for c in columns
+    ]
+
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {table}__old")
+    cursor.execute(new_sql)
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(select_cols)} FROM {table}__old"
+    )
+    cursor.execute(f"DROP TABLE {table}__old")
+
+
+def run_migrations(cursor, is_pg: bool):
+    """Bring tables created by older versions up to the current schema."""
+
+    # 1. Typed chat ids
+    for table, column in CHAT_ID_COLUMNS:
+        col_type = _column_types(cursor, table, is_pg).get(column)
+        if col_type == 'TEXT':
+            print(f"🔧 Migrating {table}.{column} to integer chat ids...")
+            _migrate_chat_id_column(cursor, table, column, is_pg)
+
+    # 2. Normalized group key for teacher lookups
+    if 'group_key' not in _column_types(cursor, 'teacher_groups', is_pg):
+        cursor.execute("ALTER TABLE teacher_groups ADD COLUMN group_key TEXT")
+
+    # Python lower() (not SQL LOWER) so Cyrillic group names fold the same way
+    cursor.execute("SELECT id, group_name FROM teacher_groups WHERE group_key IS NULL")
+    placeholder = '%s' if is_pg else '?'
+    for row in cursor.fetchall():
+        cursor.execute(
+            f"UPDATE teacher_groups SET group_key = {placeholder} WHERE id = {placeholder}",
+            (normalize_group_key(row['group_name']), row['id'])
+        )
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_teacher_groups_group_key ON teacher_groups (group_key)"
+    )
+
+    # 3. Normalized name key for get_user_by_name
+    if 'name_key' not in _column_types(cursor, 'users', is_pg):
+        cursor.execute("ALTER TABLE users ADD COLUMN name_key TEXT")
+
+    cursor.execute("SELECT id, name FROM users WHERE name_key IS NULL")
+    for row in cursor.fetchall():
+        cursor.execute(
+            f"UPDATE users SET name_key = {placeholder} WHERE id = {placeholder}",
+            (normalize_name(row['name']), row['id'])
+        )
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_name_key ON users (name_key)")
+
+    if is_pg:
+        # Optional: trigram index makes LIKE '%part%' on name_key index-driven.
+        # Needs the pg_trgm extension, which the DB role may not be allowed to create.
+        cursor.execute("SAVEPOINT name_trgm")
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_users_name_key_trgm "
+                "ON users USING gin (name_key gin_trgm_ops)"
+            )
+            cursor.execute("RELEASE SAVEPOINT name_trgm")
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT name_trgm")
+            logger.warning(f"⚠️ pg_trgm not available, fuzzy name search will scan: {e}")
+
+    # 4. Keyset pagination of the /users roster (ORDER BY name, id)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_active_name ON users (is_active, name, id)")
+
+    # 5. Payment dashboard (GROUP BY group_name within a month)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_payments_month_group ON student_payments (month_year, group_name)"
+    )
+
+    # 6. Billing periods 'MM-YYYY' -> 'YYYY-MM' (sortable, range scans).
+    # A row whose converted twin already exists is left for manual cleanup.
+    cursor.execute("""
+        UPDATE student_payments
+        SET month_year = SUBSTR(month_year, 4, 4) || '-' || SUBSTR(month_year, 1, 2)
+        WHERE month_year LIKE '__-____'
+        AND NOT EXISTS (
+            SELECT 1 FROM student_payments twin
+            WHERE twin.student_chat_id = student_payments.student_chat_id
+            AND twin.group_name = student_payments.group_name
+            AND twin.month_year = SUBSTR(student_payments.month_year, 4, 4) || '-' || SUBSTR(student_payments.month_year, 1, 2)
+        )
+    """)
+    if cursor.rowcount and cursor.rowcount > 0:
+        print(f"🔧 Converted {cursor.rowcount} bill(s) to YYYY-MM billing periods")
+
+
+def normalize_group_key(group_name: str) -> str:
+    """Lookup key for a group name: trimmed and lowercased."""
+    return (group_name or '').strip().lower()
+
+
+# Students keep their groups as a comma-separated list in users.group_name
+# ("Group-A, Group-B"). Normalized to ',group-a,group-b,' it can be matched
+# with LIKE '%,group-a,%' on both backends.
+
+def group_list_sql(column: str) -> str:
+    """SQL expression: the comma-separated group list in `column`, normalized for group_list_pattern."""
+    return f"(',' || REPLACE(REPLACE(LOWER(TRIM({column})), ' ,', ','), ', ', ',') || ',')"
+
+
+def group_list_pattern(group_name: str) -> str:
+    """LIKE pattern (ESCAPE '\\') matching one group in a group_list_sql() expression."""
+    key = normalize_group_key(group_name).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%,{key},%"
+
+
 def get_p():
     """Returns the correct placeholder: %s for Postgres, ? for SQLite."""
     # If DATABASE_URL exists, we are on Render (Postgres)
@@ -1,5 +1,5 @@
 # app/keep_alive.py
-from flask import Flask
+from flask import Flask, Response, abort, request
 
 app = Flask(__name__)
 
@@ -7,8 +7,26 @@ app = Flask(__name__)
 def home():
     return "Bot is alive and running!", 200
 
+@app.route('/calendar/<token>.ics')
+def calendar_feed(token):
+    """Personal lesson calendar for calendar apps (supports ETag / If-Modified-Since)."""
+    from app.services.calendar_feed import parse_feed_token, get_user_calendar
+
+    chat_id = parse_feed_token(token)
+    if not chat_id:
+        abort(404)
+
+    feed = get_user_calendar(chat_id)
+    response = Response(feed['body'], mimetype='text/calendar')
+    response.set_etag(feed['etag'])
+    response.last_modified = feed['last_modified']
+    response.cache_control.max_age = 900
+    response.headers['Content-Disposition'] = 'inline; filename="schedule.ics"'
+    # 304 Not Modified when the app already has this version
+    return response.make_conditional(request)
+
 def keep_alive():
     app.run(host='0.0.0.0', port=8080)
 
 if __name__ == '__main__':
-    keep_alive()
\ No newline at end of file
+    keep_alive()
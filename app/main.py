@@ -4,8 +4,11 @@ import threading
 from telegram.ext import Application
 from app.config import Config
 from app.bot.handlers import register_handlers
+from app.bot.update_processor import ChatOrderedUpdateProcessor
 from app.database.db import init_database
 from app.scheduler import start_scheduler
+from app.services.admin_outbox import start_admin_outbox
+from app.payments.open_bills import rebuild_open_bills
 
 # 1. Setup Logging
 logging.basicConfig(
@@ -34,6 +37,8 @@ def main():
 
     # 4. Define post_init hook to start scheduler AFTER event loop is ready
     async def post_init(application: Application) -> None:
+        start_admin_outbox(application)
+        rebuild_open_bills()
         start_scheduler(application)
 
     # 5. Build Bot Application with post_init hook
@@ -42,6 +47,11 @@ def main():
         Application.builder()
         .token(Config.TELEGRAM_BOT_TOKEN)
         .post_init(post_init)
+        # Different chats in parallel, each chat's updates in order
+        .concurrent_updates(ChatOrderedUpdateProcessor(
+            Config.MAX_CONCURRENT_UPDATES,
+            max_pending_updates=Config.MAX_PENDING_UPDATES
+        ))
         .build()
     )
     
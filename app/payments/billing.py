@@ -0,0 +1,137 @@
+import logging
+from app.config import Config
+from app.database.db import get_connection, get_p, group_list_sql, group_list_pattern
+from app.payments.periods import current_period
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# MONTHLY BILLING
+# ═══════════════════════════════════════════════════════════
+# One student_payments row per active student × group × month. Amounts come
+# from the optional "billing" section of meetings.json:
+#
+#   "billing": {
+#     "default_amount": 400000,
+#     "plans":  {"group": 400000, "mini_group": 600000, "individual": 900000},
+#     "groups": {"Group Daniil": "individual", "Group-B": 450000}
+#   }
+#
+# A group maps to a plan name or a fixed amount; groups not listed get
+# default_amount. Groups without an amount are not billed.
+#
+# Students keep their groups as a comma-separated list in users.group_name,
+# so the bills are generated by one INSERT ... SELECT that joins the users
+# with a VALUES list of billable groups.
+
+
+def get_group_amounts() -> dict:
+    """{group_name: amount} for every billable group (meetings.json + billing config)."""
+    billing = Config.load_billing()
+    plans = billing.get('plans', {})
+    overrides = billing.get('groups', {})
+    default_amount = billing.get('default_amount')
+
+    groups = {}
+    for m in Config.load_meetings():
+        name = (m.get('group_name') or '').strip()
+        if name:
+            groups.setdefault(name.lower(), name)
+    for name in overrides:
+        groups.setdefault(name.strip().lower(), name.strip())
+
+    overrides = {name.strip().lower(): value for name, value in overrides.items()}
+
+    amounts = {}
+    for key, name in groups.items():
+        value = overrides.get(key, default_amount)
+        if isinstance(value, str):
+            if value not in plans:
+                logger.warning(f"⚠️ Unknown billing plan '{value}' for {name}")
+                continue
+            value = plans[value]
+        if value:
+            amounts[name] = int(value)
+    return amounts
+
+
+def _billing_source(amounts: dict, p: str):
+    """CTE with the billable groups + matching condition against users.group_name."""
+    rows = ', '.join([f"({p}, {p}, {p})"] * len(amounts))
+    cte = f"WITH billing (group_name, pattern, amount) AS (VALUES {rows})"
+
+    params = []
+    for name, amount in amounts.items():
+        params += [name, group_list_pattern(name), amount]
+
+    match = f"{group_list_sql('u.group_name')} LIKE b.pattern ESCAPE '\\'"
+    return cte, match, params
+
+
+def generate_monthly_bills(month_year: str = None, dry_run: bool = False) -> dict:
+    """
+    Create the bills of a period (YYYY-MM, default current) in one query.
+
+    Existing bills are left alone (ON CONFLICT DO NOTHING), so running it
+    twice is harmless. With dry_run nothing is written.
+    Returns {'month': str, 'groups': {name: {'students', 'existing'}}, 'created': int, 'skipped': int}.
+    """
+    month_year = month_year or current_period()
+    amounts = get_group_amounts()
+    result = {'month': month_year, 'groups': {}, 'created': 0, 'skipped': 0}
+    if not amounts:
+        logger.warning("⚠️ No billable groups (add a \"billing\" section to meetings.json)")
+        return result
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cte, match, params = _billing_source(amounts, p)
+
+    try:
+        # Per-group counts (what the run will do)
+        cursor.execute(f"""
+            {cte}
+            SELECT b.group_name, COUNT(*) AS students, COUNT(sp.id) AS existing
+            FROM users u
+            JOIN billing b ON {match}
+            LEFT JOIN student_payments sp
+                ON sp.student_chat_id = u.chat_id AND sp.group_name = b.group_name AND sp.month_year = {p}
+            WHERE u.role = 'student' AND u.is_active = 1 AND u.chat_id IS NOT NULL
+            GROUP BY b.group_name
+            ORDER BY b.group_name
+        """, params + [month_year])
+        for row in cursor.fetchall():
+            result['groups'][row['group_name']] = {'students': row['students'], 'existing': row['existing']}
+        result['skipped'] = sum(g['existing'] for g in result['groups'].values())
+
+        if dry_run:
+            result['created'] = sum(g['students'] - g['existing'] for g in result['groups'].values())
+            return result
+
+        # The WITH goes inside the INSERT so the driver reports the inserted rowcount
+        cursor.execute(f"""
+            INSERT INTO student_payments (student_chat_id, group_name, month_year, amount_due)
+            {cte}
+            SELECT u.chat_id, b.group_name, {p}, b.amount
+            FROM users u
+            JOIN billing b ON {match}
+            WHERE u.role = 'student' AND u.is_active = 1 AND u.chat_id IS NOT NULL
+            ON CONFLICT (student_chat_id, group_name, month_year) DO NOTHING
+        """, params + [month_year])
+        result['created'] = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    logger.info(f"🧾 Billing {month_year}: {result['created']} bill(s) created, {result['skipped']} already existed")
+
+    # New bills must pass the receipt pre-filter
+    if result['created']:
+        from app.payments.open_bills import rebuild_open_bills
+        rebuild_open_bills()
+
+    return result
@@ -1,39 +1,28 @@
-from app.database.db import get_connection
-from app.utils.localization import TRANSLATIONS
-from datetime import datetime
+from app.utils.localization import render
+from app.payments.open_bills import get_unpaid_bill
 
-def get_text(key, lang, **kwargs):
-    text = TRANSLATIONS.get(key, {}).get(lang, TRANSLATIONS.get(key, {}).get('en', ''))
-    return text.format(**kwargs)
+# The cache misses bills added outside the bot until its next reload; older
+# than this (seconds) it is reloaded before links go out. One reload serves
+# every student of a lesson start.
+MAX_CACHE_AGE = 60
 
-async def check_and_send_lesson_link(bot, student_chat_id, group_name, jitsi_link, lang='en'):
-    current_month = datetime.now().strftime("%m-%Y")
-    
-    conn = get_connection()
-    cur = conn.cursor()
-    
-    cur.execute("""
-        SELECT amount_due, receipt_status FROM student_payments 
-        WHERE student_chat_id = ? AND group_name = ? AND month_year = ? AND is_paid = 0
-    """, (str(student_chat_id), group_name, current_month))
-    
-    unpaid_bill = cur.fetchone()
-    cur.close()
-    conn.close()
+async def check_and_send_lesson_link(bot, student_chat_id, group_name, jitsi_link, lang='en', period=None):
+    # In-memory: the open bills cache holds the period's unpaid bills
+    unpaid_bill = get_unpaid_bill(student_chat_id, group_name, period, max_age=MAX_CACHE_AGE)
     
     if unpaid_bill:
         amount = unpaid_bill['amount_due']
-        receipt_status = unpaid_bill['receipt_status'] if 'receipt_status' in unpaid_bill.keys() else None
+        receipt_status = unpaid_bill['receipt_status']
         
         if receipt_status == 'pending':
-            text = get_text('payment_pending', lang)
+            text = render('payment_pending', lang)
         else:
-            text = get_text('payment_restricted', lang, amount=amount)
+            text = render('payment_restricted', lang, amount=amount)
             
         await bot.send_message(chat_id=student_chat_id, text=text, parse_mode='HTML')
         return False
         
     else:
-        text = get_text('lesson_starting', lang, link=jitsi_link)
+        text = render('lesson_starting', lang, link=jitsi_link)
         await bot.send_message(chat_id=student_chat_id, text=text, parse_mode='HTML')
         return True
\ No newline at end of file
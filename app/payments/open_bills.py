@@ -0,0 +1,153 @@
+import time
+import logging
+from app.database.db import get_connection, get_p
+from app.payments.periods import current_period
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# OPEN BILLS CACHE
+# ═══════════════════════════════════════════════════════════
+# The unpaid bills of the current billing period, in memory. Two hot paths read it
+# instead of querying student_payments:
+#   handle_receipt_upload      - sees every photo/document sent to the bot;
+#                                skips everyone without a bill awaiting a receipt
+#   check_and_send_lesson_link - runs for every student at every lesson start
+#
+# A student/group without an entry has paid (or has no bill). Payment status
+# only changes on billing, receipt upload, approve/reject and period rollover,
+# so the cache is loaded in one query and updated by those paths. It is also
+# reloaded every 10 minutes to pick up bills edited outside the bot.
+#
+# A bill inserted/edited directly in the DB is therefore invisible until the
+# next reload. The gatekeeper passes max_age so the cache is reloaded (one
+# query, shared by all students of the lesson) when it is older than that:
+# a manual bill takes effect for the next lesson start, not 10 minutes later.
+
+# bill id -> {'chat_id': str, 'group_name': str, 'amount_due': int, 'receipt_status': str|None}
+_bills = {}
+
+# student chat_id (str) -> set of bill ids
+_by_chat = {}
+
+# (student chat_id (str), group_name) -> bill id
+_by_student_group = {}
+
+# billing period the cache was built for, and when (time.monotonic())
+_cache_period = None
+_built_at = 0.0
+
+
+def _add(bills: dict, by_chat: dict, by_student_group: dict, bill_id: int, row: dict):
+    bills[bill_id] = row
+    by_chat.setdefault(row['chat_id'], set()).add(bill_id)
+    by_student_group[(row['chat_id'], row['group_name'])] = bill_id
+
+
+def _row(row) -> dict:
+    return {
+        'chat_id': str(row['student_chat_id']),
+        'group_name': row['group_name'],
+        'amount_due': row['amount_due'],
+        'receipt_status': row['receipt_status'],
+    }
+
+
+def rebuild_open_bills(period: str = None) -> int:
+    """Load all unpaid bills of a period (default current). Returns the number of bills."""
+    global _bills, _by_chat, _by_student_group, _cache_period, _built_at
+
+    period = period or current_period()
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(f"""
+        SELECT id, student_chat_id, group_name, amount_due, receipt_status
+        FROM student_payments
+        WHERE month_year = {p} AND is_paid = 0
+    """, (period,))
+
+    bills, by_chat, by_student_group = {}, {}, {}
+    for row in cursor.fetchall():
+        _add(bills, by_chat, by_student_group, row['id'], _row(row))
+    conn.close()
+
+    # Swap in one go, handlers never see a half-built cache
+    _bills, _by_chat, _by_student_group = bills, by_chat, by_student_group
+    _cache_period = period
+    _built_at = time.monotonic()
+
+    logger.info(f"🧾 Open bills cache: {len(bills)} unpaid bill(s) for {period}")
+    return len(bills)
+
+
+def _ensure_period(period: str = None, max_age: float = None):
+    period = period or current_period()
+    if _cache_period != period or (max_age is not None and time.monotonic() - _built_at > max_age):
+        rebuild_open_bills(period)
+
+
+def has_open_bill(chat_id, period: str = None) -> bool:
+    """True if the student has a bill waiting for a receipt (unpaid, no receipt pending)."""
+    _ensure_period(period)
+    return any(
+        _bills[bill_id]['receipt_status'] != 'pending'
+        for bill_id in _by_chat.get(str(chat_id), ())
+    )
+
+
+def get_unpaid_bill(chat_id, group_name: str, period: str = None, max_age: float = None):
+    """
+    The period's unpaid bill of a student in a group (dict), or None if paid / not billed.
+    With max_age (seconds) the cache is reloaded first if it is older than that.
+    """
+    _ensure_period(period, max_age)
+    bill_id = _by_student_group.get((str(chat_id), group_name))
+    return _bills.get(bill_id) if bill_id is not None else None
+
+
+# ═══════════════════════════════════════════════════════════
+# UPDATES (called by the paths that change payment status)
+# ═══════════════════════════════════════════════════════════
+
+def set_bill_unpaid(bill_id: int, chat_id, group_name: str, amount_due: int, receipt_status: str = None):
+    """A bill was created, got a receipt ('pending') or its receipt was rejected."""
+    row = {
+        'chat_id': str(chat_id),
+        'group_name': group_name,
+        'amount_due': amount_due,
+        'receipt_status': receipt_status,
+    }
+    _add(_bills, _by_chat, _by_student_group, bill_id, row)
+
+
+def set_bill_paid(bill_id: int):
+    """A bill was approved (or removed)."""
+    row = _bills.pop(bill_id, None)
+    if row is None:
+        return
+    ids = _by_chat.get(row['chat_id'])
+    if ids is not None:
+        ids.discard(bill_id)
+        if not ids:
+            del _by_chat[row['chat_id']]
+    if _by_student_group.get((row['chat_id'], row['group_name'])) == bill_id:
+        del _by_student_group[(row['chat_id'], row['group_name'])]
+
+
+def refresh_student(chat_id):
+    """Reload one student's bills (the cache disagreed with the DB)."""
+    for bill_id in list(_by_chat.get(str(chat_id), ())):
+        set_bill_paid(bill_id)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(f"""
+        SELECT id, student_chat_id, group_name, amount_due, receipt_status
+        FROM student_payments
+        WHERE student_chat_id = {p} AND month_year = {p} AND is_paid = 0
+    """, (int(chat_id), _cache_period or current_period()))
+    for row in cursor.fetchall():
+        _add(_bills, _by_chat, _by_student_group, row['id'], _row(row))
+    conn.close()
@@ -0,0 +1,47 @@
+import pytz
+from datetime import datetime
+from app.config import Config
+
+# ═══════════════════════════════════════════════════════════
+# BILLING PERIODS
+# ═══════════════════════════════════════════════════════════
+# student_payments.month_year holds a billing period as 'YYYY-MM'. Unlike the
+# old 'MM-YYYY' form it sorts chronologically, so "these months" is a
+# BETWEEN range scan on idx_payments_month_group.
+#
+# The current period follows Config.TIMEZONE, not the server clock: around
+# midnight on the 1st the two disagree about the month.
+
+PERIOD_FORMAT = "%Y-%m"
+LEGACY_FORMAT = "%m-%Y"
+
+
+def current_period(now: datetime = None) -> str:
+    """Billing period of `now` (default: current time in Config.TIMEZONE)."""
+    if now is None:
+        now = datetime.now(pytz.timezone(Config.TIMEZONE))
+    return now.strftime(PERIOD_FORMAT)
+
+
+def parse_period(text: str) -> str:
+    """'2025-03' or '03-2025' -> '2025-03'. Raises ValueError on anything else."""
+    text = (text or '').strip()
+    for fmt in (PERIOD_FORMAT, LEGACY_FORMAT):
+        try:
+            return datetime.strptime(text, fmt).strftime(PERIOD_FORMAT)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid billing period: {text!r} (expected YYYY-MM)")
+
+
+def shift_period(period: str, months: int) -> str:
+    """Move a period by `months` (negative = back)."""
+    year, month = map(int, period.split('-'))
+    index = year * 12 + (month - 1) + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def recent_periods(count: int = 12, until: str = None) -> list:
+    """The last `count` periods up to `until` (default current), newest first."""
+    until = until or current_period()
+    return [shift_period(until, -i) for i in range(count)]
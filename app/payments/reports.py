@@ -0,0 +1,127 @@
+import io
+import csv
+from app.database.db import get_connection, get_p
+
+# ═══════════════════════════════════════════════════════════
+# PAYMENT REPORTS
+# ═══════════════════════════════════════════════════════════
+# Totals are computed by the DB (GROUP BY over student_payments, served by
+# idx_payments_month_group); only the summary rows come back to Python.
+
+# A bill is in exactly one of these states (student_payments aliased as sp)
+STATE_SQL = """
+    CASE
+        WHEN sp.is_paid = 1 THEN 'paid'
+        WHEN sp.receipt_status = 'pending' THEN 'pending'
+        ELSE 'unpaid'
+    END
+"""
+
+_TOTALS_SQL = """
+    COUNT(*) AS bills,
+    SUM(CASE WHEN is_paid = 1 THEN 1 ELSE 0 END) AS paid,
+    SUM(CASE WHEN is_paid = 0 AND receipt_status = 'pending' THEN 1 ELSE 0 END) AS pending,
+    SUM(CASE WHEN is_paid = 0 AND (receipt_status IS NULL OR receipt_status <> 'pending') THEN 1 ELSE 0 END) AS unpaid,
+    SUM(amount_due) AS amount_due,
+    SUM(CASE WHEN is_paid = 1 THEN amount_due ELSE 0 END) AS amount_paid
+"""
+
+
+def get_group_totals(month_year: str) -> list:
+    """Paid / pending / unpaid counts and sums per group for one month."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(f"""
+        SELECT group_name, {_TOTALS_SQL}
+        FROM student_payments
+        WHERE month_year = {p}
+        GROUP BY group_name
+        ORDER BY group_name
+    """, (month_year,))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def get_monthly_totals(first_period: str, last_period: str) -> list:
+    """Paid / pending / unpaid counts and sums per period in a range, newest first."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    # 'YYYY-MM' sorts chronologically: a range scan on idx_payments_month_group
+    cursor.execute(f"""
+        SELECT month_year, {_TOTALS_SQL}
+        FROM student_payments
+        WHERE month_year BETWEEN {p} AND {p}
+        GROUP BY month_year
+        ORDER BY month_year DESC
+    """, (first_period, last_period))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def get_debtors(month_year: str, group_name: str = None) -> list:
+    """Unpaid (and pending) bills of a month with the student's name."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    sql = f"""
+        SELECT sp.group_name, sp.student_chat_id, u.name, sp.amount_due,
+               {STATE_SQL} AS state
+        FROM student_payments sp
+        LEFT JOIN users u ON u.chat_id = sp.student_chat_id
+        WHERE sp.month_year = {p} AND sp.is_paid = 0
+    """
+    params = [month_year]
+    if group_name:
+        sql += f" AND LOWER(sp.group_name) = LOWER({p})"
+        params.append(group_name)
+    sql += " ORDER BY sp.group_name, u.name"
+
+    cursor.execute(sql, tuple(params))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+EXPORT_COLUMNS = ['month', 'group', 'student', 'chat_id', 'amount_due', 'state', 'paid_at']
+
+
+def write_payments_export(month_year: str, fileobj) -> int:
+    """All bills of a month as CSV into a binary file. Returns the row count."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(f"""
+        SELECT sp.month_year, sp.group_name, u.name, sp.student_chat_id, sp.amount_due,
+               {STATE_SQL} AS state,
+               sp.paid_at
+        FROM student_payments sp
+        LEFT JOIN users u ON u.chat_id = sp.student_chat_id
+        WHERE sp.month_year = {p}
+        ORDER BY sp.group_name, u.name
+    """, (month_year,))
+
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_COLUMNS)
+
+    count = 0
+    for row in cursor.fetchall():
+        writer.writerow([
+            row['month_year'],
+            row['group_name'],
+            row['name'] or '',
+            row['student_chat_id'],
+            row['amount_due'],
+            row['state'],
+            row['paid_at'] or '',
+        ])
+        count += 1
+    conn.close()
+
+    text.flush()
+    text.detach()
+    return count
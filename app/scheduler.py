@@ -4,32 +4,36 @@ import logging
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 from telegram.constants import ParseMode
 from telegram.ext import Application
 
 from app.config import Config
 from app.jitsi_meet import create_jitsi_meeting
-from app.services.user_service import (
-    get_teacher_for_group,
-    get_students_in_group
+from app.services.user_service import get_students_in_group
+from app.services.teacher_registry import (
+    get_meeting_teacher,
+    reconcile_teacher_assignments,
+    reconcile_if_meetings_changed
 )
 from app.database.db import get_connection
-from app.utils.localization import get_text, get_user_language
+from app.utils.localization import get_text, get_user_language, render
 
 from app.payments.gatekeeper import check_and_send_lesson_link
+from app.payments.periods import current_period
+from app.services.lesson_service import get_lesson_override, get_overrides_between, parse_lesson_date, POSTPONED
+from app.services.recurrence import parse_rule, cron_fields, localize, lesson_end
 
 logger = logging.getLogger(__name__)
 
-DAY_MAP = {
-    'monday': 'mon', 'tuesday': 'tue', 'wednesday': 'wed',
-    'thursday': 'thu', 'friday': 'fri', 'saturday': 'sat', 'sunday': 'sun'
-}
+# Set by start_scheduler; admin commands add/remove the jobs of moved lessons
+_scheduler = None
 
 def load_meetings():
     return Config.load_meetings()
 
 async def send_meeting_to_recipients(app: Application, meeting_config: dict, meeting_data: dict, prefix_key: str = None):
-    """Sends localized message to teacher and students with auto-healing DB logic."""
+    """Sends localized message to teacher and students of a lesson."""
     group_name = meeting_config.get('group_name', 'Unknown')
     title = meeting_config.get('title', 'Lesson')
     desc = meeting_config.get('description', '')
@@ -45,50 +49,15 @@ async def send_meeting_to_recipients(app: Application, meeting_config: dict, mee
     teacher_ids = set()
     db_teacher_found = False
     current_teacher_name = json_teacher_name
-    teacher = None
 
-    # --- PHASE 1: SMART TEACHER ROUTING (AUTO-HEALING) ---
-    if group_name and group_name != 'Unknown':
-        from app.services.user_service import (
-            get_teacher_for_group,
-            get_user_by_name,
-            update_teacher_group_assignment,
-            get_students_in_group
-        )
-
-        teacher = get_teacher_for_group(group_name)
-
-        # MISMATCH CHECK
-        if teacher and json_teacher_name and teacher.get('name') != json_teacher_name:
-            logger.info(f"🔄 Mismatch for {group_name}. DB: {teacher.get('name')} | JSON: {json_teacher_name}")
-            teacher = None
-
-        # AUTO-HEAL
-        if not teacher and json_teacher_name:
-            teacher = get_user_by_name(json_teacher_name)
-            if teacher:
-                logger.info(
-                    f"✅ Found {json_teacher_name} (ID: {teacher['chat_id']}). "
-                    f"Auto-healing DB..."
-                )
-                update_teacher_group_assignment(
-                    group_name,
-                    teacher['chat_id'],
-                    subject=meeting_config.get('subject')
-                )
-            else:
-                logger.warning(
-                    f"❌ Teacher '{json_teacher_name}' not found in users table. "
-                    f"Has this teacher registered with the bot?"
-                )
-
-        # ADD TEACHER TO RECIPIENTS
-        if teacher and teacher.get('chat_id'):
-            teacher_id = str(teacher['chat_id'])
-            recipients.add(teacher_id)
-            teacher_ids.add(teacher_id)
-            current_teacher_name = teacher.get('name', json_teacher_name)
-            db_teacher_found = True
+    # --- PHASE 1: TEACHER ROUTING (resolved by reconcile_teacher_assignments) ---
+    teacher = get_meeting_teacher(meeting_config)
+    if teacher:
+        teacher_id = teacher['chat_id']
+        recipients.add(teacher_id)
+        teacher_ids.add(teacher_id)
+        current_teacher_name = teacher.get('name') or json_teacher_name
+        db_teacher_found = True
 
     # --- PHASE 2: FALLBACKS ---
     if not db_teacher_found:
@@ -100,7 +69,6 @@ async def send_meeting_to_recipients(app: Application, meeting_config: dict, mee
 
     # --- PHASE 3: STUDENTS ---
     if group_name and group_name != 'Unknown':
-        from app.services.user_service import get_students_in_group
         students = get_students_in_group(group_name)
         for student in students:
             if student.get('chat_id'):
@@ -113,6 +81,9 @@ async def send_meeting_to_recipients(app: Application, meeting_config: dict, mee
 
     logger.info(f"📨 Sending to {len(recipients)} recipients for {title}")
 
+    # One billing period for the whole lesson, even if sending crosses midnight
+    period = current_period()
+
     # --- PHASE 5: SENDING ---
     for chat_id in recipients:
         try:
@@ -124,12 +95,14 @@ async def send_meeting_to_recipients(app: Application, meeting_config: dict, mee
                 if prefix_key:
                     header = get_text(prefix_key, lang) + header
 
-                details = get_text('lesson_details', lang).format(
+                details = render(
+                    'lesson_details', lang,
                     title=title, time=time_str, group=group_name,
                     desc=desc, subject=subject, teacher=current_teacher_name
                 )
 
-                join_section = get_text('lesson_join', lang).format(
+                join_section = render(
+                    'lesson_join', lang,
                     link=f'<a href="{link}">{link}</a>'
                 )
                 footer = get_text('lesson_click_hint', lang)
@@ -151,7 +124,8 @@ async def send_meeting_to_recipients(app: Application, meeting_config: dict, mee
                     student_chat_id=chat_id,
                     group_name=group_name,
                     jitsi_link=link,
-                    lang=lang
+                    lang=lang,
+                    period=period
                 )
                 logger.info(f"✅ Processed student {chat_id} via Gatekeeper")
 
@@ -161,8 +135,25 @@ async def send_meeting_to_recipients(app: Application, meeting_config: dict, mee
         except Exception as e:
             logger.error(f"❌ Failed to send to {chat_id}: {e}")
             
-async def job_send_lesson(app: Application, meeting_config: dict):
-    """Send lesson link at start time."""
+def _is_overridden(meeting_config: dict, started_minutes_ago: int = 0) -> bool:
+    """True if today's regular occurrence was cancelled or moved (see lesson_overrides)."""
+    tz = pytz.timezone(Config.TIMEZONE)
+    lesson_date = (datetime.now(tz) - timedelta(minutes=started_minutes_ago)).date()
+    try:
+        override = get_lesson_override(meeting_config['id'], lesson_date)
+    except Exception as e:
+        # Better a lesson too many than a missing one
+        logger.error(f"❌ Lesson override lookup failed: {e}")
+        return False
+    if override:
+        logger.info(f"⏭️ {meeting_config.get('title')} on {lesson_date} is {override['status']}, skipping")
+        return True
+    return False
+
+async def job_send_lesson(app: Application, meeting_config: dict, lesson_date: str = None):
+    """Send lesson link at start time (lesson_date is set for a moved occurrence)."""
+    if lesson_date is None and _is_overridden(meeting_config):
+        return
     logger.info(f"⏰ Creating meeting: {meeting_config['title']}")
     meeting_data = create_jitsi_meeting(
         title=meeting_config['title'],
@@ -170,37 +161,22 @@ async def job_send_lesson(app: Application, meeting_config: dict):
     )
     await send_meeting_to_recipients(app, meeting_config, meeting_data)
 
-async def job_ask_recording(app: Application, meeting_config: dict):
+async def job_ask_recording(app: Application, meeting_config: dict, lesson_date: str = None):
     """Remind teacher to upload recording AND mark attendance."""
+    if lesson_date is None and _is_overridden(meeting_config, meeting_config.get('duration_minutes', 60)):
+        return
+
     group_name = meeting_config.get('group_name')
 
-    # --- SMART TEACHER LOOKUP ---
+    # --- TEACHER LOOKUP (in-memory routing table) ---
     json_teacher_name = meeting_config.get('teacher_name')
-    teacher = None
     teacher_id = None
     teacher_name = json_teacher_name or 'Teacher'
 
-    if group_name:
-        from app.services.user_service import (
-            get_teacher_for_group,
-            get_user_by_name,
-            update_teacher_group_assignment
-        )
-
-        teacher = get_teacher_for_group(group_name)
-
-        if teacher and json_teacher_name and teacher.get('name') != json_teacher_name:
-            logger.info(f"🔄 Recording reminder: teacher mismatch for {group_name}")
-            teacher = None
-
-        if not teacher and json_teacher_name:
-            teacher = get_user_by_name(json_teacher_name)
-            if teacher:
-                update_teacher_group_assignment(group_name, teacher['chat_id'])
-
-        if teacher and teacher.get('chat_id'):
-            teacher_id = teacher['chat_id']
-            teacher_name = teacher.get('name', json_teacher_name)
+    teacher = get_meeting_teacher(meeting_config)
+    if teacher:
+        teacher_id = teacher['chat_id']
+        teacher_name = teacher.get('name') or teacher_name
 
     # Fallback
     if not teacher_id:
@@ -247,6 +223,87 @@ async def job_keep_db_alive():
 def create_job_args(app, meeting):
     return [app, dict(meeting)]
 
+def _moved_job_ids(meeting_id: str, lesson_date: str) -> tuple:
+    return f"{meeting_id}_{lesson_date}_moved", f"{meeting_id}_{lesson_date}_moved_rec"
+
+def schedule_moved_lesson(app: Application, meeting: dict, override: dict) -> bool:
+    """One-off link + recording jobs for a postponed occurrence. False if not scheduled (past / no scheduler)."""
+    if _scheduler is None:
+        return False
+
+    tz = pytz.timezone(Config.TIMEZONE)
+    start = localize(parse_lesson_date(override['new_date']), override['new_hour'], override['new_minute'], tz)
+    if start <= datetime.now(tz):
+        return False
+    end = lesson_end(start, meeting.get('duration_minutes', 60))
+
+    link_id, rec_id = _moved_job_ids(meeting['id'], override['lesson_date'])
+    kwargs = {'lesson_date': override['lesson_date']}
+    _scheduler.add_job(
+        job_send_lesson, DateTrigger(run_date=start),
+        args=create_job_args(app, meeting), kwargs=kwargs,
+        id=link_id, replace_existing=True, misfire_grace_time=300
+    )
+    _scheduler.add_job(
+        job_ask_recording, DateTrigger(run_date=end),
+        args=create_job_args(app, meeting), kwargs=kwargs,
+        id=rec_id, replace_existing=True, misfire_grace_time=300
+    )
+    return True
+
+def unschedule_moved_lesson(meeting_id: str, lesson_date: str):
+    """Drop the one-off jobs of a moved occurrence (restored or moved again)."""
+    if _scheduler is None:
+        return
+    for job_id in _moved_job_ids(meeting_id, lesson_date):
+        if _scheduler.get_job(job_id):
+            _scheduler.remove_job(job_id)
+
+def _schedule_pending_moves(app: Application, meetings: list) -> int:
+    """Re-create the jobs of lessons moved to a future date (after a restart)."""
+    meetings_by_id = {m['id']: m for m in meetings}
+    today = datetime.now(pytz.timezone(Config.TIMEZONE)).date()
+    count = 0
+    for o in get_overrides_between(today, today + timedelta(days=366)):
+        meeting = meetings_by_id.get(o['meeting_id'])
+        if meeting and o['status'] == POSTPONED and o['new_date']:
+            count += schedule_moved_lesson(app, meeting, o)
+    return count
+
+async def job_watch_meetings():
+    """Re-resolve teacher routing when meetings.json is edited."""
+    try:
+        reconcile_if_meetings_changed()
+    except Exception as e:
+        logger.error(f"❌ Teacher routing refresh failed: {e}")
+
+async def job_error_digest(app: Application):
+    """Send counts of repeated errors that were not reported individually."""
+    from app.bot.error_handler import send_error_digest
+    await send_error_digest(app.bot)
+
+async def job_refresh_open_bills():
+    """Pick up bills created or edited outside the bot (e.g. directly in the DB)."""
+    from app.payments.open_bills import rebuild_open_bills
+    try:
+        rebuild_open_bills()
+    except Exception as e:
+        logger.error(f"❌ Open bills refresh failed: {e}")
+
+async def job_generate_monthly_bills(app: Application):
+    """Create this month's bills (1st of the month)."""
+    from app.payments.billing import generate_monthly_bills
+    from app.services.admin_outbox import notify_admin
+    try:
+        result = generate_monthly_bills()
+        if result['created']:
+            notify_admin(
+                f"🧾 <b>Billing {result['month']}</b>: {result['created']} bill(s) created",
+                kind='billing'
+            )
+    except Exception as e:
+        logger.error(f"❌ Monthly billing failed: {e}")
+
 async def job_cleanup_expired_keys():
     """Daily cleanup of unactivated registrations."""
     from app.services.user_service import cleanup_expired_keys
@@ -256,6 +313,8 @@ async def job_cleanup_expired_keys():
 
 def start_scheduler(app: Application):
     """Initialize and start the scheduler."""
+    global _scheduler
+
     tz = pytz.timezone(Config.TIMEZONE)
     scheduler = AsyncIOScheduler(timezone=tz)
 
@@ -266,43 +325,38 @@ def start_scheduler(app: Application):
 
     print(f"📅 Loading {len(meetings)} meetings into scheduler...")
 
-    for m in meetings:
-        schedule = m.get('schedule', {})
-        days = schedule.get('days', [])
-        hour = schedule.get('hour', 9)
-        minute = schedule.get('minute', 0)
+    # Resolve teachers once here instead of on every lesson
+    try:
+        reconcile_teacher_assignments()
+    except Exception as e:
+        logger.error(f"❌ Teacher routing reconciliation failed: {e}")
 
-        cron_days = ",".join([DAY_MAP.get(d.lower(), d)[:3] for d in days])
-        if not cron_days:
+    for m in meetings:
+        rule = parse_rule(m)
+        if not rule['weekdays']:
             continue
 
         # 1. SEND LINK JOB
         scheduler.add_job(
             job_send_lesson,
-            CronTrigger(day_of_week=cron_days, hour=hour, minute=minute, timezone=tz),
+            CronTrigger(**cron_fields(m), timezone=tz),
             args=create_job_args(app, m),
             id=m['id'],
             replace_existing=True,
             misfire_grace_time=300   # ← 5 min instead of 60s
         )
 
-        # 2. ASK RECORDING JOB
-        duration = m.get('duration_minutes', 60)
-        end_minute = minute + duration
-        end_hour = hour + (end_minute // 60)
-        end_minute = end_minute % 60
-        end_hour = end_hour % 24
-
+        # 2. ASK RECORDING JOB (at the end; past midnight -> next weekday)
         scheduler.add_job(
             job_ask_recording,
-            CronTrigger(day_of_week=cron_days, hour=end_hour, minute=end_minute, timezone=tz),
+            CronTrigger(**cron_fields(m, rule['duration']), timezone=tz),
             args=create_job_args(app, m),
             id=f"{m['id']}_rec",
             replace_existing=True,
             misfire_grace_time=300   # ← 5 min instead of 60s
         )
 
-        print(f"   ✅ {m['title']}: Link @ {hour:02d}:{minute:02d}")
+        print(f"   ✅ {m['title']}: Link @ {rule['hour']:02d}:{rule['minute']:02d}")
 
     # Daily cleanup at 3:00 AM (only once, outside the loop!)
     scheduler.add_job(
@@ -312,6 +366,16 @@ def start_scheduler(app: Application):
         replace_existing=True
     )
 
+    # Monthly bills on the 1st at 00:05
+    scheduler.add_job(
+        job_generate_monthly_bills,
+        CronTrigger(day=1, hour=0, minute=5, timezone=tz),
+        args=[app],
+        id='monthly_billing',
+        replace_existing=True,
+        misfire_grace_time=3600
+    )
+
     # DB heartbeat every 10 minutes
     scheduler.add_job(
         job_keep_db_alive,
@@ -321,5 +385,42 @@ def start_scheduler(app: Application):
         replace_existing=True
     )
 
+    # Pick up meetings.json edits (teacher changes) every minute
+    scheduler.add_job(
+        job_watch_meetings,
+        'interval',
+        minutes=1,
+        id='meetings_watch',
+        replace_existing=True
+    )
+
+    # Open bills cache (receipt pre-filter, lesson gatekeeper)
+    scheduler.add_job(
+        job_refresh_open_bills,
+        'interval',
+        minutes=10,
+        id='open_bills_refresh',
+        replace_existing=True
+    )
+
+    # Digest of repeated errors
+    scheduler.add_job(
+        job_error_digest,
+        'interval',
+        minutes=Config.ERROR_REPORT_WINDOW_MINUTES,
+        args=[app],
+        id='error_digest',
+        replace_existing=True
+    )
+
     scheduler.start()
-    print(f"🚀 Scheduler started in timezone: {Config.TIMEZONE}")
\ No newline at end of file
+    _scheduler = scheduler
+    print(f"🚀 Scheduler started in timezone: {Config.TIMEZONE}")
+
+    # Lessons moved to a later date fire via one-off jobs
+    try:
+        moved = _schedule_pending_moves(app, meetings)
+        if moved:
+            print(f"   🔄 {moved} moved lesson(s) scheduled")
+    except Exception as e:
+        logger.error(f"❌ Failed to schedule moved lessons: {e}")
\ No newline at end of file
@@ -0,0 +1,364 @@
+import json
+import asyncio
+import logging
+from telegram import InlineKeyboardMarkup
+from telegram.constants import ParseMode
+from telegram.error import RetryAfter, Forbidden, BadRequest
+from app.config import Config
+from app.database.db import get_connection, get_p
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# ADMIN OUTBOX
+# ═══════════════════════════════════════════════════════════
+# Handlers used to message ADMIN_CHAT_ID inline, so a slow Telegram call
+# held up the user's own reply. Notifications are now written to the
+# admin_outbox table (so nothing is lost on restart) and sent by a
+# background worker:
+#   HIGH - sent right away (payment receipts, error reports)
+#   LOW  - collected and sent as one digest every ADMIN_DIGEST_MINUTES
+#          (new /start users, quiz leads)
+
+HIGH = 'high'
+LOW = 'low'
+
+# Give up on a notification after this many failed sends
+MAX_ATTEMPTS = 5
+
+# A failed HIGH item goes back in the queue after RETRY_DELAY * 2^attempts seconds
+RETRY_DELAY = 30
+
+# _send_with_retry results
+SENT = 'sent'
+RETRY = 'retry'
+REJECTED = 'rejected'
+
+# Digest section titles per kind (unknown kinds fall back to "Other")
+DIGEST_TITLES = {
+    'start': "🚀 New users",
+    'lead': "🧠 Quiz leads",
+    'billing': "🧾 Billing",
+}
+
+# Telegram message limit, with some room for the header
+DIGEST_CHUNK_SIZE = 3800
+
+_queue = None
+_worker = None
+
+# kind -> async handler(bot, payload), called when an item of that kind is
+# dropped for good (e.g. reopen the bill of a receipt the admin never got)
+_drop_handlers = {}
+
+
+# ═══════════════════════════════════════════════════════════
+# PUBLIC API (non-blocking)
+# ═══════════════════════════════════════════════════════════
+
+def _enqueue(priority: str, kind: str, payload: dict):
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    sql = f"INSERT INTO admin_outbox (priority, kind, payload) VALUES ({p}, {p}, {p})"
+    params = (priority, kind, json.dumps(payload, ensure_ascii=False))
+    try:
+        if Config.DATABASE_URL:
+            cursor.execute(sql + " RETURNING id", params)
+            outbox_id = cursor.fetchone()['id']
+        else:
+            # RETURNING needs SQLite 3.35+
+            cursor.execute(sql, params)
+            outbox_id = cursor.lastrowid
+        conn.commit()
+    finally:
+        conn.close()
+
+    # LOW items wait for the digest; HIGH ones wake the worker
+    if priority == HIGH and _queue is not None:
+        _queue.put_nowait(outbox_id)
+
+    return outbox_id
+
+
+def notify_admin(text: str, kind: str = 'info', priority: str = LOW):
+    """Queue an HTML text message for the admin."""
+    if not Config.ADMIN_CHAT_ID:
+        return None
+    return _enqueue(priority, kind, {'method': 'text', 'text': text})
+
+
+def forward_to_admin(from_chat_id, message_id: int, caption: str, reply_markup: InlineKeyboardMarkup = None,
+                     kind: str = 'receipt', meta: dict = None):
+    """
+    Queue a copy of a user's message (photo/document) for the admin, sent immediately.
+    meta is stored with the item for the kind's drop handler.
+    """
+    if not Config.ADMIN_CHAT_ID:
+        return None
+    payload = {
+        'method': 'copy',
+        'from_chat_id': int(from_chat_id),
+        'message_id': message_id,
+        'caption': caption,
+        'reply_markup': reply_markup.to_dict() if reply_markup else None,
+        'meta': meta or {},
+    }
+    return _enqueue(HIGH, kind, payload)
+
+
+def on_dropped(kind: str, handler):
+    """Register async handler(bot, payload) for items of `kind` that can't be delivered."""
+    _drop_handlers[kind] = handler
+
+
+async def _run_drop_handler(bot, item: dict, payload: dict):
+    handler = _drop_handlers.get(item['kind'])
+    if handler is None:
+        return
+    try:
+        await handler(bot, payload)
+    except Exception as e:
+        logger.error(f"❌ Drop handler for admin notification {item['id']} failed: {e}")
+
+
+# ═══════════════════════════════════════════════════════════
+# SENDING
+# ═══════════════════════════════════════════════════════════
+
+def _load(outbox_ids: list) -> list:
+    if not outbox_ids:
+        return []
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(
+        f"SELECT id, kind, payload, attempts FROM admin_outbox "
+        f"WHERE id IN ({', '.join([p] * len(outbox_ids))}) AND sent_at IS NULL ORDER BY id",
+        tuple(outbox_ids)
+    )
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def _pending_ids(priority: str, limit: int = 500) -> list:
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(
+        f"SELECT id FROM admin_outbox WHERE priority = {p} AND sent_at IS NULL ORDER BY id LIMIT {p}",
+        (priority, limit)
+    )
+    ids = [row['id'] for row in cursor.fetchall()]
+    conn.close()
+    return ids
+
+
+def _mark_sent(outbox_ids: list):
+    if not outbox_ids:
+        return
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(
+        f"UPDATE admin_outbox SET sent_at = CURRENT_TIMESTAMP "
+        f"WHERE id IN ({', '.join([p] * len(outbox_ids))})",
+        tuple(outbox_ids)
+    )
+    conn.commit()
+    conn.close()
+
+
+def _mark_failed(outbox_id: int, attempts: int, final: bool = False) -> bool:
+    """
+    Count a failed attempt; after MAX_ATTEMPTS (or when final) the item is
+    dropped (sent_at set). Returns True if it may be retried.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    if final:
+        cursor.execute(
+            f"UPDATE admin_outbox SET attempts = {p}, sent_at = CURRENT_TIMESTAMP WHERE id = {p}",
+            (attempts + 1, outbox_id)
+        )
+        logger.error(f"❌ Admin notification {outbox_id} rejected by Telegram, dropped")
+    elif attempts + 1 >= MAX_ATTEMPTS:
+        cursor.execute(
+            f"UPDATE admin_outbox SET attempts = {p}, sent_at = CURRENT_TIMESTAMP WHERE id = {p}",
+            (attempts + 1, outbox_id)
+        )
+        logger.error(f"❌ Admin notification {outbox_id} dropped after {MAX_ATTEMPTS} attempts")
+    else:
+        cursor.execute(f"UPDATE admin_outbox SET attempts = {p} WHERE id = {p}", (attempts + 1, outbox_id))
+    conn.commit()
+    conn.close()
+    return not final and attempts + 1 < MAX_ATTEMPTS
+
+
+async def _send_payload(bot, payload: dict):
+    if payload['method'] == 'copy':
+        reply_markup = payload.get('reply_markup')
+        await bot.copy_message(
+            chat_id=Config.ADMIN_CHAT_ID,
+            from_chat_id=payload['from_chat_id'],
+            message_id=payload['message_id'],
+            caption=payload.get('caption'),
+            parse_mode=ParseMode.HTML,
+            reply_markup=InlineKeyboardMarkup.de_json(reply_markup, bot) if reply_markup else None
+        )
+    else:
+        await bot.send_message(
+            chat_id=Config.ADMIN_CHAT_ID,
+            text=payload['text'],
+            parse_mode=ParseMode.HTML
+        )
+
+
+async def _send_with_retry(bot, payload: dict) -> str:
+    """
+    Send one payload, waiting out flood limits. Returns SENT, RETRY (try
+    again later) or REJECTED (bad markup, deleted source message, admin
+    blocked the bot: retrying won't help).
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            await _send_payload(bot, payload)
+            return SENT
+        except RetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+        except (Forbidden, BadRequest) as e:
+            logger.error(f"❌ Admin notification rejected: {e}")
+            return REJECTED
+        except Exception as e:
+            logger.error(f"❌ Failed to send admin notification: {e}")
+            await asyncio.sleep(2 ** attempt)
+    return RETRY
+
+
+def build_digest(items: list) -> list:
+    """
+    Group LOW items by kind into one or more digest messages.
+    Returns [(text, [outbox ids in that message]), ...].
+    """
+    sections = {}
+    for item in items:
+        payload = json.loads(item['payload'])
+        sections.setdefault(item['kind'], []).append((item['id'], payload.get('text', '')))
+
+    messages = []
+    current = "📬 <b>Admin Digest</b>\n━━━━━━━━━━━━━━━━━━━━━━"
+    ids = []
+    for kind, entries in sections.items():
+        title = DIGEST_TITLES.get(kind, "📌 Other")
+        block = f"\n\n<b>{title} ({len(entries)})</b>"
+        block_ids = []
+        for item_id, text in entries:
+            entry = f"\n\n{text}"
+            if len(current) + len(block) + len(entry) > DIGEST_CHUNK_SIZE and (ids or block_ids):
+                # A section title without entries stays with the next message
+                messages.append((current + block if block_ids else current, ids + block_ids))
+                current = "📬 <b>Admin Digest (cont.)</b>"
+                if block_ids:
+                    block = f"\n\n<b>{title}</b>"
+                ids, block_ids = [], []
+            block += entry
+            block_ids.append(item_id)
+        current += block
+        ids += block_ids
+    messages.append((current, ids))
+    return messages
+
+
+async def flush_digest(bot) -> int:
+    """Send all pending LOW notifications as a digest. Returns how many were sent."""
+    items = _load(_pending_ids(LOW))
+    if not items:
+        return 0
+
+    by_id = {item['id']: item for item in items}
+    sent = 0
+    for text, ids in build_digest(items):
+        result = await _send_with_retry(bot, {'method': 'text', 'text': text})
+        if result == SENT:
+            # Marked per message: a later failure must not resend this one
+            _mark_sent(ids)
+            sent += len(ids)
+            continue
+        if result == RETRY:
+            # The rest stays pending, the next digest tries again
+            return sent
+        # Rejected (bad HTML in some entry): send the entries one by one and
+        # drop only the ones Telegram refuses
+        for item_id in ids:
+            item = by_id[item_id]
+            single, _ = build_digest([item])[0]
+            result = await _send_with_retry(bot, {'method': 'text', 'text': single})
+            if result == SENT:
+                _mark_sent([item_id])
+                sent += 1
+            elif result == REJECTED:
+                _mark_failed(item_id, item['attempts'], final=True)
+            else:
+                return sent
+    return sent
+
+
+# ═══════════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════════
+
+async def _run_worker(bot):
+    loop = asyncio.get_running_loop()
+    interval = Config.ADMIN_DIGEST_MINUTES * 60
+    next_digest = loop.time() + interval
+
+    while True:
+        try:
+            timeout = max(next_digest - loop.time(), 0)
+            try:
+                outbox_id = await asyncio.wait_for(_queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                outbox_id = None
+
+            if outbox_id is not None:
+                for item in _load([outbox_id]):
+                    payload = json.loads(item['payload'])
+                    result = await _send_with_retry(bot, payload)
+                    if result == SENT:
+                        _mark_sent([item['id']])
+                    elif _mark_failed(item['id'], item['attempts'], final=result == REJECTED):
+                        # Back in the queue later, without holding up the others
+                        delay = RETRY_DELAY * 2 ** item['attempts']
+                        loop.call_later(delay, _queue.put_nowait, item['id'])
+                        logger.warning(f"⚠️ Admin notification {item['id']} will be retried in {delay}s")
+                    else:
+                        await _run_drop_handler(bot, item, payload)
+
+            if loop.time() >= next_digest:
+                next_digest = loop.time() + interval
+                sent = await flush_digest(bot)
+                if sent:
+                    logger.info(f"📬 Admin digest sent ({sent} notification(s))")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Admin outbox worker error: {e}")
+            await asyncio.sleep(5)
+
+
+def start_admin_outbox(application):
+    """Start the background sender (call from post_init) and resend what a restart left behind."""
+    global _queue, _worker
+
+    if not Config.ADMIN_CHAT_ID:
+        print("⚠️ ADMIN_CHAT_ID not set, admin outbox disabled")
+        return
+
+    _queue = asyncio.Queue()
+    for outbox_id in _pending_ids(HIGH):
+        _queue.put_nowait(outbox_id)
+
+    _worker = application.create_task(_run_worker(application.bot))
+    print(f"📬 Admin outbox started ({_queue.qsize()} pending)")
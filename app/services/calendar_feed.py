@@ -0,0 +1,218 @@
+import hmac
+import hashlib
+import logging
+import pytz
+from datetime import datetime, timedelta
+from app.config import Config
+from app.services.meeting_index import get_meetings_version
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# CALENDAR FEED (.ics)
+# ═══════════════════════════════════════════════════════════
+# A user's lessons as an iCalendar file: last week + Config.CALENDAR_WEEKS
+# ahead, expanded from the weekly rules with cancellations / moves applied.
+# Sent by /calendar and served by the keep-alive server at
+# /calendar/<token>.ics so calendar apps can subscribe.
+#
+# Calendar apps poll the URL, so the feed is built once and cached per user
+# until meetings.json changes, an override is set/removed, the user's
+# meetings change or the day rolls over. Each feed has an ETag (content hash)
+# and a Last-Modified (when the content last changed) for conditional GETs.
+
+# chat_id (str) -> {'key': tuple, 'body': bytes, 'etag': str, 'last_modified': datetime}
+_cache = {}
+
+
+def clear_calendar_cache():
+    """Drop all cached feeds (a lesson was cancelled, moved or restored)."""
+    _cache.clear()
+
+
+# ═══════════════════════════════════════════════════════════
+# FEED URL TOKENS
+# ═══════════════════════════════════════════════════════════
+
+def _secret() -> bytes:
+    return (Config.CALENDAR_SECRET or Config.TELEGRAM_BOT_TOKEN or '').encode()
+
+
+def _signature(chat_id: str) -> str:
+    return hmac.new(_secret(), f"calendar:{chat_id}".encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def feed_token(chat_id) -> str:
+    """'<chat_id>-<signature>': identifies the user without being guessable."""
+    chat_id = str(chat_id)
+    return f"{chat_id}-{_signature(chat_id)}"
+
+
+def parse_feed_token(token: str):
+    """chat_id of a valid token, or None."""
+    chat_id, _, signature = (token or '').rpartition('-')
+    if not chat_id or not _secret():
+        return None
+    if not hmac.compare_digest(signature, _signature(chat_id)):
+        return None
+    return chat_id
+
+
+def feed_url(chat_id):
+    """Public subscription URL, or None if Config.PUBLIC_URL is not set."""
+    if not Config.PUBLIC_URL:
+        return None
+    return f"{Config.PUBLIC_URL.rstrip('/')}/calendar/{feed_token(chat_id)}.ics"
+
+
+# ═══════════════════════════════════════════════════════════
+# ICS BUILDING
+# ═══════════════════════════════════════════════════════════
+
+def _escape(text: str) -> str:
+    return (
+        str(text or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line: str) -> str:
+    """Split a content line into 75-octet chunks (RFC 5545 3.1), not inside a UTF-8 character."""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode('utf-8'))
+        data = data[cut:]
+        # Continuation lines start with a space
+        limit = 74
+    return '\r\n '.join(parts)
+
+
+def _utc(dt: datetime) -> str:
+    return dt.astimezone(pytz.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _event(lesson: dict, start: datetime, uid_date, lang: str, stamp: str, cancelled: bool = False) -> list:
+    from app.services.recurrence import lesson_end
+    from app.utils.localization import get_text
+
+    meeting = lesson['meeting']
+    duration = meeting.get('duration_minutes', 60)
+
+    summary = meeting.get('title', 'Lesson')
+    if meeting.get('group_name'):
+        summary += f" ({meeting['group_name']})"
+
+    details = []
+    if meeting.get('teacher_name'):
+        details.append(f"👨‍🏫 {meeting['teacher_name']}")
+    if lesson['status'] != 'normal' and not cancelled:
+        details.append(f"{get_text('rescheduled_from', lang)} {uid_date.strftime('%d-%m-%Y')}")
+    if cancelled:
+        details.append(get_text('cancelled_lesson', lang))
+
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{meeting['id']}-{uid_date.strftime('%Y%m%d')}@meeting-bot",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{_utc(start)}",
+        f"DTEND:{_utc(lesson_end(start, duration))}",
+        f"SUMMARY:{_escape(summary)}",
+    ]
+    if details:
+        lines.append(f"DESCRIPTION:{_escape(chr(10).join(details))}")
+    lines.append(f"STATUS:{'CANCELLED' if cancelled else 'CONFIRMED'}")
+    lines.append('END:VEVENT')
+    return lines
+
+
+def build_calendar(meetings: list, start_date, end_date, lang: str = 'en', name: str = 'Lessons') -> bytes:
+    """iCalendar file with every lesson of the meetings between two dates."""
+    from app.services.lesson_service import get_lessons_between, CANCELLED, POSTPONED
+
+    stamp = _utc(datetime.now(pytz.utc))
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Meeting Bot//Schedule//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f"X-WR-CALNAME:{_escape(name)}",
+        f"X-WR-TIMEZONE:{Config.TIMEZONE}",
+    ]
+
+    # One event per occurrence, keyed by its regular date: a moved lesson is
+    # the same event at a new time, so apps update it instead of duplicating
+    for lesson in get_lessons_between(meetings, start_date, end_date):
+        status = lesson['status']
+        if status == POSTPONED and lesson.get('new_start'):
+            lines += _event(lesson, lesson['new_start'], lesson['lesson_date'], lang, stamp)
+        elif status == 'rescheduled':
+            # Covered by its 'postponed' entry unless the original date is outside the range
+            if not (start_date <= lesson['original_date'] <= end_date):
+                lines += _event(lesson, lesson['start'], lesson['original_date'], lang, stamp)
+        elif status in (CANCELLED, POSTPONED):
+            lines += _event(lesson, lesson['start'], lesson['lesson_date'], lang, stamp, cancelled=True)
+        else:
+            lines += _event(lesson, lesson['start'], lesson['lesson_date'], lang, stamp)
+
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(_fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+
+def get_user_calendar(chat_id) -> dict:
+    """
+    Cached feed of a user: {'body': bytes, 'etag': str, 'last_modified': datetime}.
+    Rebuilt only when its inputs changed.
+    """
+    from app.bot.schedule import get_user_meetings
+    from app.utils.localization import get_user_language, get_text
+
+    chat_id = str(chat_id)
+    meetings = get_user_meetings(chat_id)
+    lang = get_user_language(chat_id)
+
+    tz = pytz.timezone(Config.TIMEZONE)
+    today = datetime.now(tz).date()
+    key = (get_meetings_version(), today, lang, tuple(m.get('id') for m in meetings))
+
+    cached = _cache.get(chat_id)
+    if cached and cached['key'] == key:
+        return cached
+
+    body = build_calendar(
+        meetings,
+        today - timedelta(days=7),
+        today + timedelta(weeks=Config.CALENDAR_WEEKS),
+        lang,
+        get_text('your_schedule', lang)
+    )
+    # DTSTAMP changes on every build, so it is left out of the hash
+    etag = hashlib.sha1(
+        b'\n'.join(line for line in body.split(b'\r\n') if not line.startswith(b'DTSTAMP:'))
+    ).hexdigest()
+
+    if cached and cached['etag'] == etag:
+        # Same lessons, keep the old validators (and body) so clients get 304s
+        entry = dict(cached, key=key)
+    else:
+        entry = {
+            'key': key,
+            'body': body,
+            'etag': etag,
+            'last_modified': datetime.now(pytz.utc).replace(microsecond=0),
+        }
+    _cache[chat_id] = entry
+
+    logger.info(f"📅 Calendar feed built for {chat_id}: {len(meetings)} meeting(s), {len(body)} bytes")
+    return entry
@@ -1,48 +1,198 @@
 from datetime import datetime, timedelta
 import pytz
-from app.database.db import get_connection
+from app.database.db import get_connection, get_p
 from app.config import Config
+from app.services.recurrence import WEEKDAYS, occurrences, localize, lesson_end
+from app.services.meeting_index import get_meeting
+
+# ═══════════════════════════════════════════════════════════
+# LESSON OVERRIDES
+# ═══════════════════════════════════════════════════════════
+# meetings.json holds the weekly rule; lesson_overrides holds exceptions for
+# one occurrence, keyed by (meeting_id, lesson_date):
+#   cancelled - no lesson that day
+#   postponed - moved to new_date at new_hour:new_minute (shown there as 'rescheduled')
+# Dates are stored as YYYY-MM-DD so date ranges are index scans.
+
+CANCELLED = 'cancelled'
+POSTPONED = 'postponed'
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_lesson_date(text: str):
+    """'2025-03-14' or '14-03-2025' -> date. Raises ValueError."""
+    for fmt in (DATE_FORMAT, "%d-%m-%Y"):
+        try:
+            return datetime.strptime((text or '').strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {text!r} (expected YYYY-MM-DD)")
+
+
+def set_lesson_override(meeting_id: str, lesson_date, status: str,
+                        new_date=None, new_hour: int = None, new_minute: int = None):
+    """Cancel or move one occurrence (replaces an earlier override of the same lesson)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(f"""
+        INSERT INTO lesson_overrides (meeting_id, lesson_date, status, new_date, new_hour, new_minute)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+        ON CONFLICT (meeting_id, lesson_date) DO UPDATE SET
+            status = EXCLUDED.status,
+            new_date = EXCLUDED.new_date,
+            new_hour = EXCLUDED.new_hour,
+            new_minute = EXCLUDED.new_minute,
+            created_at = CURRENT_TIMESTAMP
+    """, (
+        meeting_id,
+        lesson_date.strftime(DATE_FORMAT),
+        status,
+        new_date.strftime(DATE_FORMAT) if new_date else None,
+        new_hour,
+        new_minute
+    ))
+    conn.commit()
+    conn.close()
+
+    from app.services.calendar_feed import clear_calendar_cache
+    clear_calendar_cache()
+
+
+def delete_lesson_override(meeting_id: str, lesson_date) -> dict:
+    """Restore an occurrence to the regular schedule. Returns the removed override (or None)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    params = (meeting_id, lesson_date.strftime(DATE_FORMAT))
+    cursor.execute(f"SELECT * FROM lesson_overrides WHERE meeting_id = {p} AND lesson_date = {p}", params)
+    row = cursor.fetchone()
+    if row:
+        cursor.execute(f"DELETE FROM lesson_overrides WHERE meeting_id = {p} AND lesson_date = {p}", params)
+        conn.commit()
+    conn.close()
+
+    if row:
+        from app.services.calendar_feed import clear_calendar_cache
+        clear_calendar_cache()
+    return dict(row) if row else None
+
+
+def get_lesson_override(meeting_id: str, lesson_date) -> dict:
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    cursor.execute(
+        f"SELECT * FROM lesson_overrides WHERE meeting_id = {p} AND lesson_date = {p}",
+        (meeting_id, lesson_date.strftime(DATE_FORMAT))
+    )
+    row = cursor.fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def get_overrides_between(start_date, end_date) -> list:
+    """
+    Overrides touching a date range (inclusive): lessons originally in the
+    range and lessons moved into it.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    start_str = start_date.strftime(DATE_FORMAT)
+    end_str = end_date.strftime(DATE_FORMAT)
+    cursor.execute(f"""
+        SELECT * FROM lesson_overrides
+        WHERE lesson_date BETWEEN {p} AND {p}
+        OR new_date BETWEEN {p} AND {p}
+    """, (start_str, end_str, start_str, end_str))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+# ═══════════════════════════════════════════════════════════
+# OCCURRENCES (weekly rule + overrides)
+# ═══════════════════════════════════════════════════════════
+
+def get_lessons_between(meetings: list, start_date, end_date) -> list:
+    """
+    Every lesson of the given meetings between two dates (inclusive), sorted
+    by start time, with overrides applied:
+
+    {'meeting': dict, 'lesson_date': date, 'start': datetime, 'status': str,
+     'new_start': datetime (postponed), 'original_date': date (rescheduled)}
+
+    A moved lesson appears twice: 'postponed' on its original date and
+    'rescheduled' on the new one.
+    """
+    tz = pytz.timezone(Config.TIMEZONE)
+    meetings_by_id = {m['id']: m for m in meetings if m.get('id')}
+
+    overrides = {}
+    for o in get_overrides_between(start_date, end_date):
+        if o['meeting_id'] in meetings_by_id:
+            overrides[(o['meeting_id'], o['lesson_date'])] = o
+
+    lessons = []
+    for meeting in meetings_by_id.values():
+        for day, start in occurrences(meeting, start_date, end_date, tz):
+            lesson = {'meeting': meeting, 'lesson_date': day, 'start': start, 'status': 'normal'}
+            override = overrides.get((meeting['id'], day.strftime(DATE_FORMAT)))
+            if override:
+                lesson['status'] = override['status']
+                if override['status'] == POSTPONED and override['new_date']:
+                    lesson['new_start'] = localize(
+                        parse_lesson_date(override['new_date']), override['new_hour'], override['new_minute'], tz
+                    )
+            lessons.append(lesson)
+
+    # Lessons moved into the range
+    for o in overrides.values():
+        if o['status'] != POSTPONED or not o['new_date']:
+            continue
+        new_date = parse_lesson_date(o['new_date'])
+        if start_date <= new_date <= end_date:
+            lessons.append({
+                'meeting': meetings_by_id[o['meeting_id']],
+                'lesson_date': new_date,
+                'start': localize(new_date, o['new_hour'], o['new_minute'], tz),
+                'status': 'rescheduled',
+                'original_date': parse_lesson_date(o['lesson_date']),
+            })
+
+    lessons.sort(key=lambda lesson: lesson['start'])
+    return lessons
+
 
 def get_upcoming_lessons(meeting_id: str, days_ahead: int = 14, lang: str = 'en') -> list:
     """Get upcoming lesson dates, INCLUDING modified ones (so we can restore them)."""
     from app.utils.localization import get_text
-    
-    meetings = Config.load_meetings()
-    meeting = next((m for m in meetings if m['id'] == meeting_id), None)
-    
+
+    meeting = get_meeting(meeting_id)
     if not meeting:
         return []
-    
+
     tz = pytz.timezone(Config.TIMEZONE)
     now = datetime.now(tz)
-    
-    day_map = {
-        'monday': 0, 'tuesday': 1, 'wednesday': 2,
-        'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6
-    }
-    
-    num_to_day_key = {
-        0: 'monday', 1: 'tuesday', 2: 'wednesday',
-        3: 'thursday', 4: 'friday', 5: 'saturday', 6: 'sunday'
-    }
-    
-    schedule_days = [day_map[d.lower()] for d in meeting['schedule']['days']]
-    
+    # Lessons that finished more than 2 hours ago are left out
+    cutoff = now - timedelta(hours=2)
+
     upcoming = []
-    for i in range(days_ahead):
-        check_date = now + timedelta(days=i)
-        
-        # Simple check: ignore lessons that finished more than 2 hours ago
-        lesson_time = check_date.replace(
-            hour=meeting['schedule']['hour'], 
-            minute=meeting['schedule']['minute']
-        )
-        if lesson_time < now - timedelta(hours=2):
+    for lesson in get_lessons_between([meeting], now.date() - timedelta(days=1), now.date() + timedelta(days=days_ahead)):
+        if lesson['status'] == 'rescheduled':
             continue
-            
-        if check_date.weekday() in schedule_days:
-            date_str = check_date.strftime("%d-%m-%Y")
-            day_key = num_to_day_key[check_date.weekday()]
-            day_name = get_text(day_key, lang)
-    
-    return upcoming
\ No newline at end of file
+        if lesson_end(lesson['start'], meeting.get('duration_minutes', 60)) < cutoff:
+            continue
+        start = lesson['start']
+        upcoming.append({
+            'date': start.strftime("%d-%m-%Y"),
+            'lesson_date': lesson['lesson_date'].strftime(DATE_FORMAT),
+            'day_name': get_text(WEEKDAYS[start.weekday()], lang),
+            'time': start.strftime("%H:%M"),
+            'status': lesson['status'],
+            'new_start': lesson.get('new_start'),
+        })
+
+    return upcoming
@@ -0,0 +1,73 @@
+import os
+from app.config import Config
+from app.database.db import normalize_group_key
+from app.utils.names import normalize_name
+
+# ═══════════════════════════════════════════════════════════
+# MEETINGS INDEX
+# ═══════════════════════════════════════════════════════════
+# meetings.json parsed once and indexed by id, group and teacher; rebuilt
+# only when the file's mtime changes. Lookups are dict hits instead of a
+# re-read + linear scan per call.
+#
+# The meeting dicts are shared, callers must not modify them.
+
+_index = None
+_mtime = None
+
+
+def _get_mtime():
+    try:
+        return os.path.getmtime(Config.MEETINGS_FILE)
+    except OSError:
+        return None
+
+
+def _build(meetings: list) -> dict:
+    by_id = {}
+    by_group = {}
+    by_teacher = {}
+    for m in meetings:
+        if m.get('id'):
+            by_id[m['id']] = m
+        group_key = normalize_group_key(m.get('group_name'))
+        if group_key:
+            by_group.setdefault(group_key, []).append(m)
+        teacher_key = normalize_name(m.get('teacher_name'))
+        if teacher_key:
+            by_teacher.setdefault(teacher_key, []).append(m)
+    return {'all': meetings, 'by_id': by_id, 'by_group': by_group, 'by_teacher': by_teacher}
+
+
+def _get_index() -> dict:
+    global _index, _mtime
+    mtime = _get_mtime()
+    if _index is None or mtime != _mtime:
+        _index = _build(Config.load_meetings())
+        _mtime = mtime
+    return _index
+
+
+def get_all_meetings() -> list:
+    return _get_index()['all']
+
+
+def get_meeting(meeting_id: str):
+    """Meeting by id, or None."""
+    return _get_index()['by_id'].get(meeting_id)
+
+
+def get_group_meetings(group_name: str) -> list:
+    """Meetings of a group (case/whitespace-insensitive)."""
+    return _get_index()['by_group'].get(normalize_group_key(group_name), [])
+
+
+def get_teacher_meetings(teacher_name: str) -> list:
+    """Meetings of a teacher (name compared with normalize_name)."""
+    return _get_index()['by_teacher'].get(normalize_name(teacher_name), [])
+
+
+def get_meetings_version():
+    """mtime of the indexed meetings.json; changes whenever the file does (for caches built on it)."""
+    _get_index()
+    return _mtime
@@ -0,0 +1,144 @@
+import logging
+from app.config import Config
+from app.database.db import get_connection, get_p
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# QUIZ ATTEMPTS
+# ═══════════════════════════════════════════════════════════
+
+def save_quiz_attempt(chat_id, full_name: str, username: str, language: str,
+                      score: int, total: int, level: str, weak_topics: list, answers: list):
+    """
+    Store a finished quiz and all of its answers in one transaction.
+
+    answers: [(question_index, answer, is_correct, topic), ...]
+    Returns the attempt id (None on failure).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    try:
+        sql = f'''
+            INSERT INTO quiz_attempts (chat_id, full_name, username, language, score, total, level, weak_topics)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+        '''
+        params = (int(chat_id), full_name, username, language, score, total, level, ', '.join(weak_topics))
+        if Config.DATABASE_URL:
+            cursor.execute(sql + " RETURNING id", params)
+            attempt_id = cursor.fetchone()['id']
+        else:
+            # RETURNING needs SQLite 3.35+
+            cursor.execute(sql, params)
+            attempt_id = cursor.lastrowid
+
+        cursor.executemany(f'''
+            INSERT INTO quiz_answers (attempt_id, question_index, answer, is_correct, topic)
+            VALUES ({p}, {p}, {p}, {p}, {p})
+        ''', [(attempt_id, index, answer, 1 if correct else 0, topic) for index, answer, correct, topic in answers])
+
+        conn.commit()
+        return attempt_id
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"❌ Failed to save quiz attempt for {chat_id}: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def save_quiz_lead(attempt_id: int, selected_plan: str, phone: str = None) -> bool:
+    """Attach the chosen plan and contact to an attempt (the user became a lead)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    try:
+        cursor.execute(f'''
+            UPDATE quiz_attempts
+            SET selected_plan = {p}, phone = {p}, lead_at = CURRENT_TIMESTAMP
+            WHERE id = {p}
+        ''', (selected_plan, phone, attempt_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to save quiz lead {attempt_id}: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+# ═══════════════════════════════════════════════════════════
+# ANALYTICS
+# ═══════════════════════════════════════════════════════════
+
+def get_quiz_stats(days: int = 30) -> dict:
+    """
+    Aggregates over the last `days` days, computed in SQL:
+    totals, plan split, per-question error rates and most-missed topics.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+
+    # finished_at is stored by CURRENT_TIMESTAMP into a TIMESTAMP column: UTC
+    # on SQLite, the session time zone on Postgres. The cutoff is computed by
+    # the database on the same clock so the window is exactly `days` days.
+    if Config.DATABASE_URL:
+        since = f"LOCALTIMESTAMP - {p} * INTERVAL '1 day'"
+        since_params = (days,)
+    else:
+        since = f"datetime('now', {p})"
+        since_params = (f"-{days} days",)
+
+    cursor.execute(f'''
+        SELECT COUNT(*) AS attempts,
+               COALESCE(AVG(score * 1.0 / NULLIF(total, 0)), 0) AS avg_ratio,
+               COUNT(lead_at) AS leads,
+               COUNT(phone) AS phones
+        FROM quiz_attempts
+        WHERE finished_at >= {since}
+    ''', since_params)
+    summary = dict(cursor.fetchone())
+
+    cursor.execute(f'''
+        SELECT selected_plan, COUNT(*) AS cnt
+        FROM quiz_attempts
+        WHERE finished_at >= {since} AND selected_plan IS NOT NULL
+        GROUP BY selected_plan
+        ORDER BY cnt DESC
+    ''', since_params)
+    plans = [dict(row) for row in cursor.fetchall()]
+
+    cursor.execute(f'''
+        SELECT a.question_index,
+               COUNT(*) AS answered,
+               SUM(1 - a.is_correct) AS wrong
+        FROM quiz_answers a
+        JOIN quiz_attempts t ON t.id = a.attempt_id
+        WHERE t.finished_at >= {since}
+        GROUP BY a.question_index
+        ORDER BY a.question_index
+    ''', since_params)
+    questions = [dict(row) for row in cursor.fetchall()]
+
+    cursor.execute(f'''
+        SELECT a.topic, COUNT(*) AS wrong
+        FROM quiz_answers a
+        JOIN quiz_attempts t ON t.id = a.attempt_id
+        WHERE t.finished_at >= {since} AND a.is_correct = 0
+        GROUP BY a.topic
+        ORDER BY wrong DESC
+        LIMIT 10
+    ''', since_params)
+    topics = [dict(row) for row in cursor.fetchall()]
+
+    conn.close()
+
+    return {
+        'days': days,
+        'summary': summary,
+        'plans': plans,
+        'questions': questions,
+        'topics': topics,
+    }
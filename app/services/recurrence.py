@@ -0,0 +1,85 @@
+import pytz
+from datetime import datetime, timedelta
+from app.config import Config
+
+# ═══════════════════════════════════════════════════════════
+# WEEKLY RECURRENCE
+# ═══════════════════════════════════════════════════════════
+# A meeting's "schedule" is a weekly rule: weekdays + wall-clock start time
+# in Config.TIMEZONE. Occurrences are computed arithmetically (first matching
+# date per weekday, then 7-day steps), so a horizon of a year costs the same
+# as a week. Times are localized per date, so a lesson stays at 14:00 local
+# across a DST change.
+#
+# Used by the schedule views, get_upcoming_lessons and the scheduler.
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# Cron abbreviations (APScheduler day_of_week)
+CRON_DAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+def parse_rule(meeting: dict) -> dict:
+    """{'weekdays': [0..6], 'hour', 'minute', 'duration'} from a meeting's schedule."""
+    schedule = meeting.get('schedule', {})
+    weekdays = set()
+    for day in schedule.get('days', []):
+        # 'monday' or 'mon'
+        key = day.strip().lower()[:3]
+        if key in CRON_DAYS:
+            weekdays.add(CRON_DAYS.index(key))
+    return {
+        'weekdays': sorted(weekdays),
+        'hour': schedule.get('hour', 9),
+        'minute': schedule.get('minute', 0),
+        'duration': meeting.get('duration_minutes', 60),
+    }
+
+
+def expand_dates(weekdays: list, start_date, end_date) -> list:
+    """All dates in [start_date, end_date] falling on the given weekdays, sorted."""
+    if end_date < start_date:
+        return []
+    span = (end_date - start_date).days
+    dates = []
+    for weekday in weekdays:
+        offset = (weekday - start_date.weekday()) % 7
+        dates.extend(start_date + timedelta(days=d) for d in range(offset, span + 1, 7))
+    dates.sort()
+    return dates
+
+
+def localize(day, hour: int, minute: int, tz=None) -> datetime:
+    """Wall-clock time on a date -> aware datetime (DST-correct)."""
+    tz = tz or pytz.timezone(Config.TIMEZONE)
+    return tz.localize(datetime(day.year, day.month, day.day, hour, minute))
+
+
+def lesson_end(start: datetime, duration_minutes: int) -> datetime:
+    """End of a lesson (elapsed time, normalized across a DST change)."""
+    return start.tzinfo.normalize(start + timedelta(minutes=duration_minutes))
+
+
+def occurrences(meeting: dict, start_date, end_date, tz=None) -> list:
+    """[(date, aware start datetime), ...] of a meeting between two dates (inclusive)."""
+    rule = parse_rule(meeting)
+    tz = tz or pytz.timezone(Config.TIMEZONE)
+    return [
+        (day, localize(day, rule['hour'], rule['minute'], tz))
+        for day in expand_dates(rule['weekdays'], start_date, end_date)
+    ]
+
+
+def cron_fields(meeting: dict, minutes_after_start: int = 0) -> dict:
+    """
+    CronTrigger fields for a point relative to the lesson start (0 = start,
+    duration = end). A time past midnight moves to the next weekday.
+    """
+    rule = parse_rule(meeting)
+    total = rule['hour'] * 60 + rule['minute'] + minutes_after_start
+    day_shift, minute_of_day = divmod(total, 24 * 60)
+    return {
+        'day_of_week': ",".join(CRON_DAYS[(d + day_shift) % 7] for d in rule['weekdays']),
+        'hour': minute_of_day // 60,
+        'minute': minute_of_day % 60,
+    }
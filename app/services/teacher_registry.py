@@ -0,0 +1,166 @@
+import os
+import logging
+from app.config import Config
+from app.utils.names import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# TEACHER ROUTING TABLE
+# ═══════════════════════════════════════════════════════════
+# Lesson jobs used to resolve (and auto-heal) the teacher of a group every
+# time a lesson fired. The resolution now happens here, off the hot path:
+# on startup, when meetings.json changes and when a teacher activates.
+
+# meeting_id -> {'chat_id': str, 'name': str}
+_teacher_by_meeting = {}
+
+# lowercased group_name -> {'chat_id': str, 'name': str}
+_teacher_by_group = {}
+
+# mtime of meetings.json at the last reconciliation
+_meetings_mtime = None
+
+
+def _get_meetings_mtime():
+    try:
+        return os.path.getmtime(Config.MEETINGS_FILE)
+    except OSError:
+        return None
+
+
+def reconcile_teacher_assignments() -> dict:
+    """
+    Resolve the teacher of every meeting once and heal teacher_groups.
+
+    Returns a summary: {'resolved': int, 'healed': int, 'missing': [names]}.
+    """
+    global _teacher_by_meeting, _teacher_by_group, _meetings_mtime
+
+    from app.services.user_service import (
+        get_teacher_for_group,
+        get_user_by_name,
+        update_teacher_group_assignment,
+        add_teacher_group,
+        get_teacher_groups
+    )
+
+    mtime = _get_meetings_mtime()
+    meetings = Config.load_meetings()
+
+    # A group may be taught by several teachers (different days). Healing such
+    # a group must not delete the other teachers' links.
+    names_per_group = {}
+    for m in meetings:
+        group_name = m.get('group_name')
+        if group_name:
+            key = group_name.strip().lower()
+            names_per_group.setdefault(key, set()).add((m.get('teacher_name') or '').strip())
+
+    db_teacher_cache = {}
+    name_cache = {}
+    healed_links = set()
+    missing = set()
+
+    by_meeting = {}
+    by_group = {}
+
+    for m in meetings:
+        group_name = m.get('group_name')
+        if not group_name or not m.get('id'):
+            continue
+
+        group_key = group_name.strip().lower()
+        json_teacher_name = m.get('teacher_name')
+
+        if group_key not in db_teacher_cache:
+            db_teacher_cache[group_key] = get_teacher_for_group(group_name)
+        teacher = db_teacher_cache[group_key]
+
+        # MISMATCH CHECK (JSON is the source of truth)
+        if teacher and json_teacher_name and normalize_name(teacher.get('name')) != normalize_name(json_teacher_name):
+            teacher = None
+
+        # AUTO-HEAL
+        if not teacher and json_teacher_name:
+            if json_teacher_name not in name_cache:
+                name_cache[json_teacher_name] = get_user_by_name(json_teacher_name)
+            teacher = name_cache[json_teacher_name]
+
+            if teacher:
+                link = (group_key, str(teacher['chat_id']))
+                shared_group = len(names_per_group.get(group_key, ())) > 1
+                already_linked = shared_group and any(
+                    (g.get('group_name') or '').strip().lower() == group_key
+                    for g in get_teacher_groups(teacher['chat_id'])
+                )
+                if link not in healed_links and not already_linked:
+                    healed_links.add(link)
+                    db_teacher = db_teacher_cache[group_key]
+                    logger.info(
+                        f"🔄 Mismatch for {group_name}. "
+                        f"DB: {db_teacher.get('name') if db_teacher else None} | JSON: {json_teacher_name}. "
+                        f"Auto-healing with {teacher['chat_id']}..."
+                    )
+                    if shared_group:
+                        add_teacher_group(teacher['chat_id'], group_name, m.get('subject'))
+                    else:
+                        update_teacher_group_assignment(
+                            group_name,
+                            teacher['chat_id'],
+                            subject=m.get('subject')
+                        )
+            else:
+                missing.add(json_teacher_name)
+
+        if teacher and teacher.get('chat_id'):
+            route = {
+                'chat_id': str(teacher['chat_id']),
+                'name': teacher.get('name') or json_teacher_name
+            }
+            by_meeting[m['id']] = route
+            by_group.setdefault(group_key, route)
+
+    for name in sorted(missing):
+        logger.warning(
+            f"❌ Teacher '{name}' not found in users table. "
+            f"Has this teacher registered with the bot?"
+        )
+
+    # Swap the tables in one go so running jobs never see a half-built state
+    _teacher_by_meeting = by_meeting
+    _teacher_by_group = by_group
+    _meetings_mtime = mtime
+
+    logger.info(
+        f"👨‍🏫 Teacher routing: {len(by_meeting)}/{len(meetings)} meetings resolved, "
+        f"{len(healed_links)} link(s) healed"
+    )
+
+    return {
+        'resolved': len(by_meeting),
+        'healed': len(healed_links),
+        'missing': sorted(missing)
+    }
+
+
+def reconcile_if_meetings_changed() -> bool:
+    """Re-run the reconciliation when meetings.json was modified."""
+    if _get_meetings_mtime() == _meetings_mtime:
+        return False
+
+    logger.info("📝 meetings.json changed, reconciling teacher routing...")
+    reconcile_teacher_assignments()
+    return True
+
+
+def get_meeting_teacher(meeting_config: dict):
+    """In-memory lookup of the resolved teacher for a meeting (no DB I/O)."""
+    route = _teacher_by_meeting.get(meeting_config.get('id'))
+    if route:
+        return route
+
+    group_name = meeting_config.get('group_name')
+    if group_name:
+        return _teacher_by_group.get(group_name.strip().lower())
+    return None
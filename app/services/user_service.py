@@ -2,42 +2,88 @@ import random
 import string
 from typing import Optional
 from datetime import datetime
-from app.database.db import get_connection, get_p
+from app.database.db import (
+    get_connection, get_p, normalize_group_key, group_list_sql, group_list_pattern, ConnectionWrapper
+)
+from app.utils.names import normalize_name
 import logging
 from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Keys are random; uniqueness is enforced by the UNIQUE constraint on
+# users.registration_key (insert, and retry with a new key on conflict).
+KEY_ALPHABET = string.ascii_uppercase + string.digits
+MAX_KEY_ATTEMPTS = 10
+
+# Collision metrics since startup (see get_key_generation_stats)
+_key_stats = {'generated': 0, 'collisions': 0}
+
+
 def generate_registration_key(role: str) -> str:
-    """Generate unique registration key."""
+    """Generate a random registration key (uniqueness is checked on insert)."""
     if role == "teacher":
         prefix = "TCH"
     else:
         prefix = "STU"
-    chars = string.ascii_uppercase + string.digits
-    random_part = ''.join(random.choices(chars, k=6))
+    random_part = ''.join(random.choices(KEY_ALPHABET, k=Config.REGISTRATION_KEY_LENGTH))
+    _key_stats['generated'] += 1
     return f"{prefix}-{random_part}"
 
 
+def _record_key_collisions(count: int):
+    if not count:
+        return
+    _key_stats['collisions'] += count
+    logger.warning(
+        f"⚠️ Registration key collision ({_key_stats['collisions']}/{_key_stats['generated']} so far). "
+        f"Consider raising REGISTRATION_KEY_LENGTH (now {Config.REGISTRATION_KEY_LENGTH})."
+    )
+
+
+def get_key_generation_stats() -> dict:
+    """Keys generated / collisions since startup, plus the collision rate."""
+    generated = _key_stats['generated']
+    return {
+        'generated': generated,
+        'collisions': _key_stats['collisions'],
+        'collision_rate': _key_stats['collisions'] / generated if generated else 0.0,
+        'key_length': Config.REGISTRATION_KEY_LENGTH,
+    }
+
+
+def _reconcile_teachers():
+    """Re-route lessons after a teacher change. Runs after the commit, so a failure must not undo the result."""
+    from app.services.teacher_registry import reconcile_teacher_assignments
+    try:
+        reconcile_teacher_assignments()
+    except Exception as e:
+        logger.error(f"❌ Teacher reconciliation failed: {e}")
+
+
 def create_pending_user(name: str, role: str, group_name: str = None) -> str:
     """Create a pending user (not yet activated)."""
     conn = get_connection()
     cursor = conn.cursor()
     p = get_p()
 
-    while True:
-        key = generate_registration_key(role)
-        cursor.execute(f'SELECT 1 FROM users WHERE registration_key = {p}', (key,))
-        if not cursor.fetchone():
-            break
-
     try:
-        cursor.execute(f'''
-            INSERT INTO users (name, role, group_name, registration_key, is_active)
-            VALUES ({p}, {p}, {p}, {p}, 0)
-        ''', (name, role, group_name, key))
-        conn.commit()
-        return key
+        # One round-trip in the common case: the UNIQUE constraint is the check
+        for attempt in range(MAX_KEY_ATTEMPTS):
+            key = generate_registration_key(role)
+            cursor.execute(f'''
+                INSERT INTO users (name, name_key, role, group_name, registration_key, is_active)
+                VALUES ({p}, {p}, {p}, {p}, {p}, 0)
+                ON CONFLICT (registration_key) DO NOTHING
+            ''', (name, normalize_name(name), role, group_name, key))
+            if cursor.rowcount == 1:
+                conn.commit()
+                _record_key_collisions(attempt)
+                return key
+
+        _record_key_collisions(MAX_KEY_ATTEMPTS)
+        print(f"❌ Error creating user: no free registration key after {MAX_KEY_ATTEMPTS} attempts")
+        return None
     except Exception as e:
         print(f"❌ Error creating user: {e}")
         return None
@@ -45,6 +91,136 @@ def create_pending_user(name: str, role: str, group_name: str = None) -> str:
         conn.close()
 
 
+def generate_unique_keys(cursor, roles: list) -> list:
+    """
+    One registration key per role, unique among themselves and in the DB.
+
+    Collisions are checked with one IN query per round (in practice one round).
+    """
+    p = get_p()
+    keys = [None] * len(roles)
+    todo = list(range(len(roles)))
+
+    while todo:
+        taken = set(k for k in keys if k)
+        for i in todo:
+            key = generate_registration_key(roles[i])
+            while key in taken:
+                key = generate_registration_key(roles[i])
+            keys[i] = key
+            taken.add(key)
+
+        candidates = [keys[i] for i in todo]
+        existing = set()
+        # Chunked to stay below SQLite's bound-parameter limit
+        for start in range(0, len(candidates), 500):
+            chunk = candidates[start:start + 500]
+            cursor.execute(
+                f"SELECT registration_key FROM users WHERE registration_key IN ({', '.join([p] * len(chunk))})",
+                tuple(chunk)
+            )
+            existing.update(row['registration_key'] for row in cursor.fetchall())
+
+        todo = [i for i in todo if keys[i] in existing]
+        _record_key_collisions(len(todo))
+
+    return keys
+
+
+def bulk_create_pending_users(entries: list) -> list:
+    """
+    Create many pending users in one transaction.
+
+    entries: [{'name', 'role', 'group_name'}, ...] for students and
+             [{'name', 'role', 'groups': [(group_name, subject), ...]}, ...] for teachers
+    Returns the entries with 'registration_key' filled in ([] on failure).
+    """
+    if not entries:
+        return []
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+
+    try:
+        # A key can still be taken between the check and the insert (another
+        # admin creating a user); the UNIQUE constraint catches it and the
+        # whole batch is retried with fresh keys, as in create_pending_user
+        for attempt in range(MAX_KEY_ATTEMPTS):
+            keys = generate_unique_keys(cursor, [e['role'] for e in entries])
+            created = [{**e, 'registration_key': key} for e, key in zip(entries, keys)]
+
+            try:
+                cursor.executemany(f'''
+                    INSERT INTO users (name, name_key, role, group_name, registration_key, is_active)
+                    VALUES ({p}, {p}, {p}, {p}, {p}, 0)
+                ''', [
+                    (
+                        e['name'], normalize_name(e['name']), e['role'],
+                        e.get('group_name') if e['role'] == 'student' else None,
+                        e['registration_key']
+                    )
+                    for e in created
+                ])
+            except Exception as e:
+                if not _is_key_conflict(e):
+                    raise
+                conn.rollback()
+                _record_key_collisions(1)
+                continue
+
+            teacher_groups = [
+                (e['registration_key'], group_name, subject)
+                for e in created if e['role'] == 'teacher'
+                for group_name, subject in e.get('groups', [])
+            ]
+            if teacher_groups:
+                cursor.executemany(f'''
+                    INSERT INTO pending_teacher_groups (registration_key, group_name, subject)
+                    VALUES ({p}, {p}, {p})
+                ''', teacher_groups)
+
+            conn.commit()
+            return created
+
+        logger.error(f"❌ Bulk user import failed: no free registration keys after {MAX_KEY_ATTEMPTS} attempts")
+        return []
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"❌ Bulk user import failed: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def _is_key_conflict(error: Exception) -> bool:
+    """UNIQUE violation on users.registration_key (SQLite or Postgres message)."""
+    message = str(error)
+    return 'users.registration_key' in message or 'users_registration_key' in message
+
+
+def iter_users_for_export(batch_size: int = 500):
+    """Yield every user (active and pending) without loading the table at once."""
+    conn = get_connection()
+    # Server-side (named) cursor on Postgres; SQLite cursors already stream
+    cursor = conn.cursor(name='users_export') if isinstance(conn, ConnectionWrapper) else conn.cursor()
+
+    try:
+        cursor.execute('''
+            SELECT name, role, group_name, chat_id, registration_key, is_active, language, created_at
+            FROM users
+            ORDER BY role, name, id
+        ''')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        conn.close()
+
+
 def add_pending_teacher_group(registration_key: str, group_name: str, subject: str = None):
     """Add a group for a pending teacher (Postgres Safe)."""
     conn = get_connection()
@@ -80,21 +256,16 @@ def add_pending_teacher_group(registration_key: str, group_name: str, subject: s
 
 def sync_teacher_groups_from_json(teacher_chat_id, teacher_name):
     """Reads meetings.json and links groups to teacher."""
-    from app.config import Config
+    from app.services.meeting_index import get_teacher_meetings
 
     try:
-        meetings = Config.load_meetings()
-
         found_entries = set()
-        target_name = teacher_name.strip().lower()
 
-        for m in meetings:
-            t_name = m.get('teacher_name', '')
-            if t_name and t_name.strip().lower() == target_name:
-                g_name = m.get('group_name')
-                subj = m.get('subject', 'General')
-                if g_name:
-                    found_entries.add((g_name, subj))
+        for m in get_teacher_meetings(teacher_name):
+            g_name = m.get('group_name')
+            subj = m.get('subject', 'General')
+            if g_name:
+                found_entries.add((g_name, subj))
 
         if not found_entries:
             print(f"⚠️ No groups found in JSON for teacher: {teacher_name}")
@@ -117,9 +288,9 @@ def sync_teacher_groups_from_json(teacher_chat_id, teacher_name):
                 """, (subject, str(teacher_chat_id), group))
             else:
                 cursor.execute(f"""
-                    INSERT INTO teacher_groups (teacher_chat_id, group_name, subject)
-                    VALUES ({p}, {p}, {p})
-                """, (str(teacher_chat_id), group, subject))
+                    INSERT INTO teacher_groups (teacher_chat_id, group_name, group_key, subject)
+                    VALUES ({p}, {p}, {p}, {p})
+                """, (str(teacher_chat_id), group, normalize_group_key(group), subject))
 
             print(f"✅ Auto-linked group '{group}' ({subject}) to {teacher_name}")
 
@@ -181,15 +352,18 @@ def activate_user(chat_id: str, registration_key: str) -> dict:
                 if cursor.fetchone():
                     cursor.execute(f"UPDATE teacher_groups SET subject={p} WHERE teacher_chat_id={p} AND group_name={p}", (subj, str(chat_id), g_name))
                 else:
-                    cursor.execute(f"INSERT INTO teacher_groups (teacher_chat_id, group_name, subject) VALUES ({p}, {p}, {p})", (str(chat_id), g_name, subj))
+                    cursor.execute(f"INSERT INTO teacher_groups (teacher_chat_id, group_name, group_key, subject) VALUES ({p}, {p}, {p}, {p})", (str(chat_id), g_name, normalize_group_key(g_name), subj))
 
             cursor.execute(f'DELETE FROM pending_teacher_groups WHERE registration_key = {p}', (registration_key,))
 
         conn.commit()
         conn.close()
+        _invalidate_name_index()
 
         if user_role == 'teacher':
             sync_teacher_groups_from_json(str(chat_id), user_name)
+            # New teacher may unblock routing for lessons that had no recipient
+            _reconcile_teachers()
 
         return {
             "success": True,
@@ -203,6 +377,38 @@ def activate_user(chat_id: str, registration_key: str) -> dict:
         return {"error": str(e)}
 
 
+# chat_ids already recorded in bot_starts (skips the DB on repeat /start)
+_seen_starts = set()
+
+
+def record_bot_start(chat_id) -> bool:
+    """
+    Remember that chat_id started the bot.
+
+    Returns True only for the very first /start (one idempotent INSERT,
+    no SELECT; repeat calls are answered from memory).
+    """
+    chat_id = int(chat_id)
+    if chat_id in _seen_starts:
+        return False
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+    try:
+        cursor.execute(
+            f"INSERT INTO bot_starts (chat_id) VALUES ({p}) ON CONFLICT (chat_id) DO NOTHING",
+            (chat_id,)
+        )
+        first_start = cursor.rowcount == 1
+        conn.commit()
+    finally:
+        conn.close()
+
+    _seen_starts.add(chat_id)
+    return first_start
+
+
 def get_user(chat_id: str) -> dict:
     conn = get_connection()
     cursor = conn.cursor()
@@ -245,16 +451,17 @@ def register_user(chat_id: str, name: str, role: str, group_name: str = None) ->
         cursor.execute(f"SELECT 1 FROM users WHERE chat_id = {p}", (str(chat_id),))
         if cursor.fetchone():
             cursor.execute(f"""
-                UPDATE users SET name={p}, role={p}, group_name={p}, registration_key={p}, is_active=1, activated_at={p}
+                UPDATE users SET name={p}, name_key={p}, role={p}, group_name={p}, registration_key={p}, is_active=1, activated_at={p}
                 WHERE chat_id={p}
-            """, (name, role, group_name, key, datetime.now().isoformat(), str(chat_id)))
+            """, (name, normalize_name(name), role, group_name, key, datetime.now().isoformat(), str(chat_id)))
         else:
             cursor.execute(f"""
-                INSERT INTO users (chat_id, name, role, group_name, registration_key, is_active, activated_at)
-                VALUES ({p}, {p}, {p}, {p}, {p}, 1, {p})
-            """, (str(chat_id), name, role, group_name, key, datetime.now().isoformat()))
+                INSERT INTO users (chat_id, name, name_key, role, group_name, registration_key, is_active, activated_at)
+                VALUES ({p}, {p}, {p}, {p}, {p}, {p}, 1, {p})
+            """, (str(chat_id), name, normalize_name(name), role, group_name, key, datetime.now().isoformat()))
 
         conn.commit()
+        _invalidate_name_index()
         return True
     except Exception as e:
         print(f"❌ Registration error: {e}")
@@ -274,7 +481,7 @@ def add_teacher_group(teacher_chat_id: str, group_name: str, subject: str = None
         if cursor.fetchone():
             cursor.execute(f"UPDATE teacher_groups SET subject={p} WHERE teacher_chat_id={p} AND group_name={p}", (subject, str(teacher_chat_id), group_name))
         else:
-            cursor.execute(f"INSERT INTO teacher_groups (teacher_chat_id, group_name, subject) VALUES ({p}, {p}, {p})", (str(teacher_chat_id), group_name, subject))
+            cursor.execute(f"INSERT INTO teacher_groups (teacher_chat_id, group_name, group_key, subject) VALUES ({p}, {p}, {p}, {p})", (str(teacher_chat_id), group_name, normalize_group_key(group_name), subject))
 
         conn.commit()
         return True
@@ -325,14 +532,15 @@ def get_teacher_for_group(group_name: str) -> dict:
     cursor = conn.cursor()
     p = get_p()
 
+    # Both sides are typed and indexed: group_key -> teacher_chat_id -> users.chat_id
     query = f'''
-        SELECT u.* FROM users u
-        JOIN teacher_groups tg ON CAST(u.chat_id AS TEXT) = CAST(tg.teacher_chat_id AS TEXT)
-        WHERE LOWER(tg.group_name) = LOWER({p}) AND u.is_active = 1
+        SELECT u.* FROM teacher_groups tg
+        JOIN users u ON u.chat_id = tg.teacher_chat_id
+        WHERE tg.group_key = {p} AND u.is_active = 1
     '''
 
     try:
-        cursor.execute(query, (group_name,))
+        cursor.execute(query, (normalize_group_key(group_name),))
         row = cursor.fetchone()
         if row:
             return dict(row)
@@ -362,6 +570,59 @@ def get_all_active_users() -> list:
     return [dict(row) for row in rows]
 
 
+def get_active_users_page(role: str = None, group_name: str = None,
+                          after: tuple = None, before: tuple = None, limit: int = 20) -> tuple:
+    """
+    One page of active users ordered by (name, id), keyset-paginated.
+
+    after / before are the (name, id) of the last / first row of the current
+    page. Returns (rows, has_more) where has_more tells whether another page
+    exists in the direction that was requested.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    p = get_p()
+
+    conditions = ["is_active = 1"]
+    params = []
+
+    if role:
+        conditions.append(f"role = {p}")
+        params.append(role)
+
+    if group_name:
+        # Students carry a comma-separated group list; teachers are linked through teacher_groups
+        conditions.append(
+            f"({group_list_sql('group_name')} LIKE {p} ESCAPE '\\' OR chat_id IN "
+            f"(SELECT teacher_chat_id FROM teacher_groups WHERE group_key = {p}))"
+        )
+        params += [group_list_pattern(group_name), normalize_group_key(group_name)]
+
+    order = "name, id"
+    if after:
+        conditions.append(f"(name > {p} OR (name = {p} AND id > {p}))")
+        params += [after[0], after[0], after[1]]
+    elif before:
+        conditions.append(f"(name < {p} OR (name = {p} AND id < {p}))")
+        params += [before[0], before[0], before[1]]
+        order = "name DESC, id DESC"
+
+    cursor.execute(
+        f"SELECT id, name, role, chat_id, group_name FROM users "
+        f"WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT {p}",
+        (*params, limit + 1)
+    )
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if before:
+        rows.reverse()
+
+    return rows, has_more
+
+
 def delete_user(registration_key: str) -> bool:
     conn = get_connection()
     cursor = conn.cursor()
@@ -370,6 +631,7 @@ def delete_user(registration_key: str) -> bool:
         cursor.execute(f'DELETE FROM users WHERE registration_key = {p}', (registration_key,))
         cursor.execute(f'DELETE FROM pending_teacher_groups WHERE registration_key = {p}', (registration_key,))
         conn.commit()
+        _invalidate_name_index()
         return True
     except Exception:
         return False
@@ -393,6 +655,10 @@ def delete_user_by_chat_id(chat_id: str) -> bool:
             cursor.execute(f"DELETE FROM teacher_groups WHERE teacher_chat_id = {p}", (str(chat_id),))
         cursor.execute(f"DELETE FROM pending_teacher_groups WHERE registration_key = {p}", (reg_key,))
         conn.commit()
+        _invalidate_name_index()
+
+        if role == 'teacher':
+            _reconcile_teachers()
         return True
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -406,8 +672,10 @@ def update_user_name(chat_id: str, new_name: str) -> bool:
     cursor = conn.cursor()
     p = get_p()
     try:
-        cursor.execute(f"UPDATE users SET name = {p} WHERE chat_id = {p}", (new_name, str(chat_id)))
+        cursor.execute(f"UPDATE users SET name = {p}, name_key = {p} WHERE chat_id = {p}",
+                       (new_name, normalize_name(new_name), str(chat_id)))
         conn.commit()
+        _invalidate_name_index()
         return True
     except Exception:
         return False
@@ -440,20 +708,19 @@ def get_teacher_groups_effective(chat_id: str) -> list:
     if not user:
         return []
 
-    teacher_name = (user.get('name') or '').strip().lower()
-    if not teacher_name:
+    if not normalize_name(user.get('name')):
         return []
 
-    meetings = Config.load_meetings()
+    from app.services.meeting_index import get_teacher_meetings
+
     seen = set()
     fallback_groups = []
-    for m in meetings:
-        if (m.get('teacher_name') or '').strip().lower() == teacher_name:
-            g = m.get('group_name')
-            subj = m.get('subject')
-            if g and g not in seen:
-                seen.add(g)
-                fallback_groups.append({'group_name': g, 'subject': subj})
+    for m in get_teacher_meetings(user.get('name')):
+        g = m.get('group_name')
+        subj = m.get('subject')
+        if g and g not in seen:
+            seen.add(g)
+            fallback_groups.append({'group_name': g, 'subject': subj})
 
     if fallback_groups:
         logger.info(f"Teacher {user['name']} ({chat_id}): no DB groups found, healing from meetings.json")
@@ -485,8 +752,8 @@ def update_teacher_groups(chat_id: str, new_group: Optional[str] = None, new_sub
                 cursor.execute(f"UPDATE teacher_groups SET subject = {p} WHERE teacher_chat_id = {p} AND group_name = {p}",
                                (new_subject, str(chat_id), new_group))
         else:
-            cursor.execute(f"INSERT INTO teacher_groups (teacher_chat_id, group_name, subject) VALUES ({p}, {p}, {p})",
-                           (str(chat_id), new_group, new_subject or "General"))
+            cursor.execute(f"INSERT INTO teacher_groups (teacher_chat_id, group_name, group_key, subject) VALUES ({p}, {p}, {p}, {p})",
+                           (str(chat_id), new_group, normalize_group_key(new_group), new_subject or "General"))
 
         conn.commit()
         return True
@@ -497,67 +764,76 @@ def update_teacher_groups(chat_id: str, new_group: Optional[str] = None, new_sub
         conn.close()
 
 
+# In-memory fuzzy index for SQLite (no trigram support): list of
+# (name_key, chat_id, name) for active users, shortest keys first.
+# Rebuilt lazily after any write that changes names or activation.
+_name_index = None
+
+
+def _invalidate_name_index():
+    global _name_index
+    _name_index = None
+
+
+def _get_name_index() -> list:
+    global _name_index
+    if _name_index is None:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT name_key, chat_id, name FROM users WHERE is_active = 1 AND chat_id IS NOT NULL")
+        rows = cur.fetchall()
+        conn.close()
+        _name_index = sorted(
+            ((row['name_key'] or '', row['chat_id'], row['name']) for row in rows),
+            key=lambda entry: len(entry[0])
+        )
+    return _name_index
+
+
 def get_user_by_name(name: str):
-    """Look up a user by name. Tries exact match first, then fuzzy."""
+    """Look up a user by name. Tries exact (normalized) match first, then fuzzy."""
+    key = normalize_name(name)
+    if not key:
+        return None
+
     conn = get_connection()
     cur = conn.cursor()
     try:
-        clean_name = name.strip()
-        if not clean_name:
-            return None
+        # Exact: "Зарина", "zarina " and "Zarina" share one indexed key
+        cur.execute(
+            """SELECT chat_id, name FROM users
+               WHERE name_key = ?
+               AND chat_id IS NOT NULL
+               AND is_active = 1
+               LIMIT 1""",
+            (key,)
+        )
+        row = cur.fetchone()
 
-        if Config.DATABASE_URL:
-            cur.execute(
-                """SELECT chat_id, name FROM users
-                   WHERE name ILIKE %s
-                   AND chat_id IS NOT NULL
-                   AND chat_id != ''
-                   AND is_active = 1
-                   LIMIT 1""",
-                (clean_name,)
-            )
-            row = cur.fetchone()
+        if row:
+            return {'chat_id': row['chat_id'], 'name': row['name']}
 
-            if not row:
-                cur.execute(
-                    """SELECT chat_id, name FROM users
-                       WHERE name ILIKE %s
-                       AND chat_id IS NOT NULL
-                       AND chat_id != ''
-                       AND is_active = 1
-                       LIMIT 1""",
-                    (f"%{clean_name}%",)
-                )
-                row = cur.fetchone()
-        else:
+        # Fuzzy: substring of the normalized name
+        if Config.DATABASE_URL:
+            # Served by the pg_trgm GIN index when the extension is available
+            pattern = key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
             cur.execute(
                 """SELECT chat_id, name FROM users
-                   WHERE name = ? COLLATE NOCASE
+                   WHERE name_key LIKE ?
                    AND chat_id IS NOT NULL
-                   AND chat_id != ''
                    AND is_active = 1
+                   ORDER BY LENGTH(name_key)
                    LIMIT 1""",
-                (clean_name,)
+                (f"%{pattern}%",)
             )
             row = cur.fetchone()
-
-            if not row:
-                cur.execute(
-                    """SELECT chat_id, name FROM users
-                       WHERE name LIKE ?
-                       AND chat_id IS NOT NULL
-                       AND chat_id != ''
-                       AND is_active = 1
-                       LIMIT 1""",
-                    (f"%{clean_name}%",)
-                )
-                row = cur.fetchone()
-
-        if row:
-            if isinstance(row, dict):
+            if row:
                 return {'chat_id': row['chat_id'], 'name': row['name']}
-            else:
-                return {'chat_id': row[0], 'name': row[1]}
+            return None
+
+        for name_key, chat_id, full_name in _get_name_index():
+            if key in name_key:
+                return {'chat_id': chat_id, 'name': full_name}
         return None
     except Exception as e:
         logger.error(f"❌ get_user_by_name failed for '{name}': {e}", exc_info=True)
@@ -573,26 +849,17 @@ def update_teacher_group_assignment(group_name: str, new_chat_id: str, subject:
     try:
         new_chat_id = str(new_chat_id)
 
-        if Config.DATABASE_URL:
-            cur.execute(
-                "DELETE FROM teacher_groups WHERE group_name ILIKE %s",
-                (group_name,)
-            )
-            cur.execute(
-                """INSERT INTO teacher_groups (teacher_chat_id, group_name, subject)
-                   VALUES (%s, %s, %s)""",
-                (new_chat_id, group_name, subject)
-            )
-        else:
-            cur.execute(
-                "DELETE FROM teacher_groups WHERE group_name = ?",
-                (group_name,)
-            )
-            cur.execute(
-                """INSERT INTO teacher_groups (teacher_chat_id, group_name, subject)
-                   VALUES (?, ?, ?)""",
-                (new_chat_id, group_name, subject)
-            )
+        group_key = normalize_group_key(group_name)
+
+        cur.execute(
+            "DELETE FROM teacher_groups WHERE group_key = ?",
+            (group_key,)
+        )
+        cur.execute(
+            """INSERT INTO teacher_groups (teacher_chat_id, group_name, group_key, subject)
+               VALUES (?, ?, ?, ?)""",
+            (new_chat_id, group_name, group_key, subject)
+        )
 
         conn.commit()
         logger.info(f"✅ Group '{group_name}' now assigned to teacher {new_chat_id}")
@@ -611,14 +878,14 @@ def cleanup_expired_keys(hours: int = 24):
             cur.execute("""
                 DELETE FROM users
                 WHERE is_active = 0
-                AND (chat_id IS NULL OR chat_id = '')
+                AND chat_id IS NULL
                 AND created_at < NOW() - INTERVAL '%s hours'
             """, (hours,))
         else:
             cur.execute("""
                 DELETE FROM users
                 WHERE is_active = 0
-                AND (chat_id IS NULL OR chat_id = '')
+                AND chat_id IS NULL
                 AND created_at < datetime('now', ? || ' hours')
             """, (f'-{hours}',))
 
@@ -0,0 +1,158 @@
+import io
+import csv
+import logging
+from app.utils.names import normalize_name
+
+# Optional: XLSX support (CSV always works)
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════
+# BULK IMPORT / EXPORT FILES
+# ═══════════════════════════════════════════════════════════
+# Import file columns (header row required, case-insensitive):
+#   name, role, group, subject
+# role is "student" or "teacher". A teacher listed on several rows gets one
+# key and all of the listed groups.
+
+MAX_IMPORT_ROWS = 2000
+
+ROLE_ALIASES = {
+    'student': 'student', 'students': 'student', 'студент': 'student', "o'quvchi": 'student',
+    'teacher': 'teacher', 'teachers': 'teacher', 'учитель': 'teacher', "o'qituvchi": 'teacher',
+}
+
+COLUMN_ALIASES = {
+    'name': 'name', 'full name': 'name', 'имя': 'name', 'ism': 'name',
+    'role': 'role', 'роль': 'role', 'rol': 'role',
+    'group': 'group', 'group_name': 'group', 'группа': 'group', 'guruh': 'group',
+    'subject': 'subject', 'предмет': 'subject', 'fan': 'subject',
+}
+
+EXPORT_COLUMNS = ['name', 'role', 'group', 'chat_id', 'registration_key', 'status', 'language', 'created_at']
+
+
+class ImportFileError(Exception):
+    """The uploaded file can't be read as a user list."""
+
+
+def _read_rows(filename: str, data: bytes) -> list:
+    if filename.lower().endswith('.xlsx'):
+        if not HAS_OPENPYXL:
+            raise ImportFileError("XLSX import needs the openpyxl package. Please send a CSV file.")
+        workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+        sheet = workbook.active
+        return [
+            ['' if cell is None else str(cell) for cell in row]
+            for row in sheet.iter_rows(values_only=True)
+        ]
+
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = data.decode('cp1251')
+
+    # Excel exports use ';' in many locales
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    return list(csv.reader(io.StringIO(text), dialect))
+
+
+def parse_users_file(filename: str, data: bytes) -> tuple:
+    """
+    Parse an uploaded CSV/XLSX user list.
+
+    Returns (entries, errors): entries for bulk_create_pending_users and a
+    list of human-readable problems ("Row 5: unknown role 'x'").
+    """
+    rows = [r for r in _read_rows(filename, data) if any((c or '').strip() for c in r)]
+    if not rows:
+        raise ImportFileError("The file is empty.")
+
+    header = [COLUMN_ALIASES.get((c or '').strip().lower()) for c in rows[0]]
+    if 'name' not in header or 'role' not in header:
+        raise ImportFileError("Header row must contain at least 'name' and 'role' columns.")
+    if len(rows) - 1 > MAX_IMPORT_ROWS:
+        raise ImportFileError(f"Too many rows (max {MAX_IMPORT_ROWS}).")
+
+    entries = []
+    teachers = {}
+    errors = []
+
+    for line_no, row in enumerate(rows[1:], start=2):
+        values = {col: (row[i] or '').strip() for i, col in enumerate(header) if col and i < len(row)}
+        name = values.get('name', '')
+        role = ROLE_ALIASES.get(values.get('role', '').lower())
+        group = values.get('group') or None
+
+        if not name:
+            errors.append(f"Row {line_no}: missing name")
+            continue
+        if not role:
+            errors.append(f"Row {line_no}: unknown role '{values.get('role', '')}'")
+            continue
+
+        if role == 'student':
+            if not group:
+                errors.append(f"Row {line_no}: student '{name}' has no group")
+                continue
+            entries.append({'name': name, 'role': 'student', 'group_name': group})
+            continue
+
+        # Teachers: one entry per person, groups collected across rows
+        teacher = teachers.get(normalize_name(name))
+        if teacher is None:
+            teacher = {'name': name, 'role': 'teacher', 'groups': []}
+            teachers[normalize_name(name)] = teacher
+            entries.append(teacher)
+        if group and group not in [g for g, _ in teacher['groups']]:
+            teacher['groups'].append((group, values.get('subject') or None))
+
+    return entries, errors
+
+
+def build_keys_file(created: list) -> bytes:
+    """CSV of the created users and their registration keys."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['name', 'role', 'group', 'registration_key'])
+    for e in created:
+        if e['role'] == 'teacher':
+            group = ', '.join(g for g, _ in e.get('groups', []))
+        else:
+            group = e.get('group_name') or ''
+        writer.writerow([e['name'], e['role'], group, e['registration_key']])
+    # BOM so Excel opens Cyrillic names correctly
+    return out.getvalue().encode('utf-8-sig')
+
+
+def write_users_export(rows, fileobj) -> int:
+    """Stream users (see iter_users_for_export) into a binary file as CSV."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_COLUMNS)
+
+    count = 0
+    for row in rows:
+        writer.writerow([
+            row['name'],
+            row['role'],
+            row['group_name'] or '',
+            row['chat_id'] or '',
+            row['registration_key'],
+            'active' if row['is_active'] else 'pending',
+            row['language'] or '',
+            row['created_at'] or '',
+        ])
+        count += 1
+
+    text.flush()
+    text.detach()
+    return count
@@ -0,0 +1,99 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # BUTTONS / NAVIGATION
+    # ═══════════════════════════════════════════════════════════
+    'prev_week': {'en': '⬅️ Previous Week', 'ru': '⬅️ Прошлая неделя', 'uz': '⬅️ Oldingi hafta'},
+    'next_week': {'en': 'Next Week ➡️', 'ru': 'Следующая неделя ➡️', 'uz': 'Keyingi hafta ➡️'},
+    'this_week': {'en': '📍 This Week', 'ru': '📍 Эта неделя', 'uz': '📍 Shu hafta'},
+    'today_only': {'en': '📅 Today Only', 'ru': '📅 Только сегодня', 'uz': '📅 Faqat bugun'},
+    'btn_back': {'en': '◀️ Back', 'ru': '◀️ Назад', 'uz': '◀️ Orqaga'},
+    'btn_cancel': {'en': '🔙 Cancel', 'ru': '🔙 Отмена', 'uz': '🔙 Bekor qilish'},
+    'btn_confirm': {'en': '✅ Confirm', 'ru': '✅ Подтвердить', 'uz': '✅ Tasdiqlash'},
+    'btn_close': {'en': '❌ Close', 'ru': '❌ Закрыть', 'uz': '❌ Yopish'},
+    'btn_yes': {'en': '✅ Yes', 'ru': '✅ Да', 'uz': '✅ Ha'},
+    'btn_no': {'en': '❌ No', 'ru': '❌ Нет', 'uz': '❌ Yo\'q'},
+
+    # ═══════════════════════════════════════════════════════════
+    # MENU BUTTONS
+    # ═══════════════════════════════════════════════════════════
+    'btn_schedule': {
+        'en': '📅 Schedule',
+        'ru': '📅 Расписание',
+        'uz': '📅 Jadval'
+    },
+    'btn_today': {
+        'en': '📅 Today',
+        'ru': '📅 Сегодня',
+        'uz': '📅 Bugun'
+    },
+    'btn_pay': {
+        'en': '💰 Pay',
+        'ru': '💰 Оплата',
+        'uz': '💰 To\'lov'
+    },
+    'btn_status': {
+        'en': '📋 Status',
+        'ru': '📋 Статус',
+        'uz': '📋 Holat'
+    },
+    'btn_help': {
+        'en': '❓ Help',
+        'ru': '❓ Помощь',
+        'uz': '❓ Yordam'
+    },
+    'btn_new_student': {
+        'en': '👤 New Student',
+        'ru': '👤 Новый ученик',
+        'uz': '👤 Yangi o\'quvchi'
+    },
+    'btn_new_teacher': {
+        'en': '👤 New Teacher',
+        'ru': '👤 Новый учитель',
+        'uz': '👤 Yangi o\'qituvchi'
+    },
+    'btn_users': {
+        'en': '👥 Users',
+        'ru': '👥 Пользователи',
+        'uz': '👥 Foydalanuvchilar'
+    },
+    'btn_language': {
+        'en': '🌐 Language',
+        'ru': '🌐 Язык',
+        'uz': '🌐 Til'
+    },
+    'btn_approve': {
+        'en': '✅ Approve',
+        'ru': '✅ Одобрить',
+        'uz': '✅ Tasdiqlash'
+    },
+    'btn_reject': {
+        'en': '❌ Reject',
+        'ru': '❌ Отклонить',
+        'uz': '❌ Rad etish'
+    },
+    'btn_submit': {
+        'en': '✅ Submit',
+        'ru': '✅ Отправить',
+        'uz': '✅ Yuborish'
+    },
+    'remove': {
+        'en': 'Remove',
+        'ru': 'Удалить',
+        'uz': 'O\'chirish'
+    },
+    'menu_open': {
+        'en': "⬇️ Menu",
+        'ru': "⬇️ Меню",
+        'uz': "⬇️ Menyu"
+    },
+    'btn_quiz': {
+        'en': '🧠 Test My English',
+        'ru': '🧠 Тест на уровень',
+        'uz': "🧠 Darajani aniqlash"
+    },
+    'btn_start_register': {
+        'en': '🚀 Start / Register',
+        'ru': '🚀 Старт / Регистрация',
+        'uz': "🚀 Boshlash / Ro'yxatdan o'tish"
+    },
+}
@@ -0,0 +1,50 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # COMMON
+    # ═══════════════════════════════════════════════════════════
+    'welcome': {
+        'en': 'Welcome to the Meeting Bot!',
+        'ru': 'Добро пожаловать в бот!',
+        'uz': 'Botga xush kelibsiz!'
+    },
+    'language_changed': {
+        'en': '✅ Language changed to English',
+        'ru': '✅ Язык изменен на Русский',
+        'uz': '✅ Til O\'zbekchaga o\'zgartirildi'
+    },
+    'choose_language': {
+        'en': '🌐 Choose your language:',
+        'ru': '🌐 Выберите язык:',
+        'uz': '🌐 Tilni tanlang:'
+    },
+    'cancelled': {
+        'en': '❌ Action cancelled.',
+        'ru': '❌ Действие отменено.',
+        'uz': '❌ Amal bekor qilindi.'
+    },
+    'error_occurred': {
+        'en': '😕 Oops! Something went wrong.',
+        'ru': '😕 Упс! Что-то пошло не так.',
+        'uz': '😕 Xatolik yuz berdi.'
+    },
+    'not_registered': {
+        'en': "❌ You're not registered!\nUse /start to register first.",
+        'ru': '❌ Вы не зарегистрированы!\nИспользуйте /start для регистрации.',
+        'uz': '❌ Siz ro\'yxatdan o\'tmagansiz!\nRo\'yxatdan o\'tish uchun /start buyrug\'ini yuboring.'
+    },
+    'teachers_only': {
+        'en': '⛔ This command is for teachers only.',
+        'ru': '⛔ Эта команда только для учителей.',
+        'uz': '⛔ Bu buyruq faqat o\'qituvchilar uchun.'
+    },
+    'students_only': {
+        'en': '⛔ This command is for students only.',
+        'ru': '⛔ Эта команда только для студентов.',
+        'uz': '⛔ Bu buyruq faqat o\'quvchilar uchun.'
+    },
+    'admin_only': {
+        'en': '⛔ This command is for admin only.',
+        'ru': '⛔ Эта команда только для админа.',
+        'uz': '⛔ Bu buyruq faqat admin uchun.'
+    },
+}
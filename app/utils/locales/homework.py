@@ -0,0 +1,80 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # HOMEWORK
+    # ═══════════════════════════════════════════════════════════
+    'btn_homework': {
+        'en': '📚 Homework',
+        'ru': '📚 Домашнее задание',
+        'uz': '📚 Uy vazifasi'
+    },
+    'homework_start': {
+        'en': '📚 <b>Homework Distribution</b>\n\nSend me the homework files (documents, photos, videos, etc.).\n\nYou can send multiple files.\n\nWhen done, tap the button below:',
+        'ru': '📚 <b>Отправка домашнего задания</b>\n\nОтправьте мне файлы домашнего задания (документы, фото, видео и т.д.).\n\nМожно отправить несколько файлов.\n\nКогда закончите, нажмите кнопку ниже:',
+        'uz': '📚 <b>Uy vazifasini yuborish</b>\n\nMenga uy vazifasi fayllarini yuboring (hujjatlar, rasmlar, videolar va h.k.).\n\nBir nechta fayl yuborishingiz mumkin.\n\nTugagach, quyidagi tugmani bosing:'
+    },
+    'done_uploading': {
+        'en': '✅ Done uploading',
+        'ru': '✅ Загрузка завершена',
+        'uz': '✅ Yuklash tugadi'
+    },
+    'file_received': {
+        'en': '✅ File received! ({count} total)\n\nSend more or tap "Done uploading".',
+        'ru': '✅ Файл получен! (всего {count})\n\nОтправьте ещё или нажмите "Загрузка завершена".',
+        'uz': '✅ Fayl qabul qilindi! (jami {count})\n\nYana yuboring yoki "Yuklash tugadi" tugmasini bosing.'
+    },
+    'no_files_uploaded': {
+        'en': '⚠️ No files received. Please send at least one file.',
+        'ru': '⚠️ Файлы не получены. Отправьте хотя бы один файл.',
+        'uz': '⚠️ Fayllar olinmadi. Kamida bitta fayl yuboring.'
+    },
+    'session_expired': {
+        'en': '⏰ Session expired. Please start again with /homework',
+        'ru': '⏰ Сессия истекла. Начните заново с /homework',
+        'uz': '⏰ Sessiya tugadi. /homework bilan qaytadan boshlang'
+    },
+    'no_groups_assigned': {
+        'en': '⚠️ You have no groups assigned. Please contact admin.',
+        'ru': '⚠️ У вас нет назначенных групп. Свяжитесь с админом.',
+        'uz': '⚠️ Sizga guruhlar biriktirilmagan. Admin bilan bog\'laning.'
+    },
+    'select_group_for_homework': {
+        'en': '📁 <b>{count} file(s) ready</b>\n\nSelect which group should receive this homework:',
+        'ru': '📁 <b>{count} файл(ов) готово</b>\n\nВыберите группу для отправки:',
+        'uz': '📁 <b>{count} ta fayl tayyor</b>\n\nQaysi guruhga yuborishni tanlang:'
+    },
+    'no_students_in_group': {
+        'en': '⚠️ No students found in group "{group}".',
+        'ru': '⚠️ В группе "{group}" нет студентов.',
+        'uz': '⚠️ "{group}" guruhida o\'quvchilar topilmadi.'
+    },
+    'confirm_homework_send': {
+        'en': '📤 <b>Ready to send homework</b>\n\n📁 Files: {file_count}\n👥 Recipients: {student_count} students\n📚 Group: {group}\n\nProceed?',
+        'ru': '📤 <b>Готово к отправке</b>\n\n📁 Файлов: {file_count}\n👥 Получателей: {student_count} студентов\n📚 Группа: {group}\n\nПродолжить?',
+        'uz': '📤 <b>Yuborishga tayyor</b>\n\n📁 Fayllar: {file_count}\n👥 Qabul qiluvchilar: {student_count} o\'quvchi\n📚 Guruh: {group}\n\nDavom etasizmi?'
+    },
+    'btn_send_now': {
+        'en': '📤 Send Now',
+        'ru': '📤 Отправить',
+        'uz': '📤 Yuborish'
+    },
+    'sending': {
+        'en': 'Sending...',
+        'ru': 'Отправляется...',
+        'uz': 'Yuborilmoqda...'
+    },
+    'homework_received': {
+        'en': '📚 <b>New Homework</b>\n\nYou have received new homework materials:',
+        'ru': '📚 <b>Новое домашнее задание</b>\n\nВы получили новые материалы:',
+        'uz': '📚 <b>Yangi uy vazifasi</b>\n\nSiz yangi uy vazifasi materiallarini oldingiz:'
+    },
+    'homework_sent_success': {
+        'en': '✅ <b>Homework Sent!</b>\n\n📤 Successfully sent to {sent} students.',
+        'ru': '✅ <b>Домашнее задание отправлено!</b>\n\n📤 Успешно отправлено {sent} студентам.',
+        'uz': '✅ <b>Uy vazifasi yuborildi!</b>\n\n📤 {sent} ta o\'quvchiga muvaffaqiyatli yuborildi.'
+    },
+    'homework_sent_partial': {
+        'en': '✅ <b>Homework Sent!</b>\n\n📤 Sent to: {sent} students\n⚠️ Failed: {failed} students',
+        'ru': '✅ <b>Домашнее задание отправлено!</b>\n\n📤 Отправлено: {sent} студентам\n⚠️ Ошибка: {failed} студентов',
+        'uz': '✅ <b>Uy vazifasi yuborildi!</b>\n\n📤 Yuborildi: {sent} o\'quvchiga\n⚠️ Xato: {failed} o\'quvchi'
+    },
+}
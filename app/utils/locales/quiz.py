@@ -0,0 +1,85 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # QUIZ
+    # ═══════════════════════════════════════════════════════════
+    'quiz_intro_video': {
+        'en': "🎥 <b>Video Quiz Time!</b>\n\nWatch the video, then answer the question. If you get it wrong, we'll show you a video with the correct answer. Let's go!",
+        'ru': "🎥 <b>Время видео-теста!</b>\n\nПосмотрите видео и ответьте на вопрос. Если ошибетесь, мы покажем видео с правильным ответом. Поехали!",
+        'uz': "🎥 <b>Video test vaqti!</b>\n\nVideoni tomosha qiling va savolga javob bering. Xato qilsangiz, to'g'ri javobli videoni ko'rsatamiz. Boshladik!"
+    },
+    'quiz_correct': {
+        'en': "✅ Correct! Get ready for the next one...",
+        'ru': "✅ Правильно! Готовьтесь к следующему...",
+        'uz': "✅ To'g'ri! Keyingisiga tayyorgarlik ko'ring..."
+    },
+    'quiz_wrong': {
+        'en': "❌ Wrong. The correct answer was: <b>{ans}</b>",
+        'ru': "❌ Неверно. Правильный ответ: <b>{ans}</b>",
+        'uz': "❌ Noto'g'ri. To'g'ri javob: <b>{ans}</b>"
+    },
+    'quiz_result': {
+        'en': "🎉 <b>Quiz Complete!</b>\n\nYour score: <b>{score}/{total}</b>\nYour estimated level: <b>{level}</b>\n\n<b>Areas to improve:</b>\n{weak_topics}\n\nOur manager will contact you shortly to discuss the best group for you!",
+        'ru': "🎉 <b>Тест завершен!</b>\n\nВаш результат: <b>{score}/{total}</b>\nВаш примерный уровень: <b>{level}</b>\n\n<b>Зоны для улучшения:</b>\n{weak_topics}\n\nНаш менеджер скоро свяжется с вами, чтобы обсудить подходящую группу!",
+        'uz': "🎉 <b>Test yakunlandi!</b>\n\nSizning balingiz: <b>{score}/{total}</b>\nTaxminiy darajangiz: <b>{level}</b>\n\n<b>Yaxshilash kerak bo'lgan yo'nalishlar:</b>\n{weak_topics}\n\nMenejerimiz sizga mos guruhni muhokama qilish uchun tez orada bog'lanadi!"
+    },
+    'quiz_cancelled': {
+        'en': "Quiz cancelled. You can start it again anytime with /quiz",
+        'ru': "Тест отменен. Вы можете начать его снова в любое время с помощью /quiz",
+        'uz': "Test bekor qilindi. Uni istalgan vaqtda /quiz bilan qayta boshlashingiz mumkin."
+    },
+    'quiz_admin_cant': {
+        'en': "Admins can't take the quiz 😊",
+        'ru': "Админы не могут проходить тест 😊",
+        'uz': "Adminlar testni topshira olmaydi 😊"
+    },
+    'quiz_no_weak_topics': {
+        'en': "None - Perfect score! 🎯",
+        'ru': "Нет - Идеальный результат! 🎯",
+        'uz': "Yo'q - Mukammal natija! 🎯"
+    },
+    'quiz_phone_request': {
+        'en': "📱 We noticed you don't have a Telegram @username. To help our manager contact you quickly, please share your phone number.",
+        'ru': "📱 Мы заметили, что у вас нет @username в Telegram. Чтобы наш менеджер мог быстро с вами связаться, пожалуйста, поделитесь своим номером телефона.",
+        'uz': "📱 Sizda Telegram @username yo'qligini payqadik. Menejerimiz siz bilan tez bog'lanishi uchun iltimos, telefon raqamingizni ulashing."
+    },
+    'quiz_share_phone_btn': {
+        'en': "📱 Share Phone Number",
+        'ru': "📱 Отправить номер телефона",
+        'uz': "📱 Telefon raqamni ulashish"
+    },
+    'quiz_phone_received': {
+        'en': "✅ Thank you! Our manager will contact you soon.",
+        'ru': "✅ Спасибо! Наш менеджер скоро свяжется с вами.",
+        'uz': "✅ Rahmat! Menejerimiz tez orada siz bilan bog'lanadi."
+    },
+    'quiz_price_list': {
+        'en': "📋 <b>Price List & Plans</b>\n\nChoose the best option for you:\n\n📚 <b>Standard</b> (groups of 8-10 students)\n💵 750,000 UZS / month\n\n⭐️ <b>Comfort</b> (mini-groups up to 4 students)\n💵 1,200,000 UZS / month\n\n💎 <b>Ultima</b> (1-on-1)\n💵 2,500,000 UZS / month\n\n👇 Please select a plan below:",
+        'ru': "📋 <b>Прайс-лист и тарифы</b>\n\nВыберите лучший вариант для себя:\n\n📚 <b>Стандарт</b> (группы 8-10 человек)\n💵 750 000 сум / мес\n\n⭐️ <b>Комфорт</b> (мини-группы до 4 человек)\n💵 1 200 000 сум / мес\n\n💎 <b>Ultima</b> (индивидуально)\n💵 2 500 000 сум / мес\n\n👇 Пожалуйста, выберите тариф ниже:",
+        'uz': "📋 <b>Narxlar va tariflar</b>\n\nO'zingizga mos eng yaxshi variantni tanlang:\n\n📚 <b>Standard</b> (8-10 kishilik guruhlar)\n💵 750,000 UZS / oy\n\n⭐️ <b>Comfort</b> (4 kishigacha mini-guruhlar)\n💵 1,200,000 UZS / oy\n\n💎 <b>Ultima</b> (1-dan 1-ga)\n💵 2,500,000 UZS / oy\n\n👇 Iltimos, quyidan tarifni tanlang:"
+    },
+    'quiz_plan_group': {
+        'en': '📚 Standard',
+        'ru': '📚 Стандарт',
+        'uz': '📚 Standard'
+    },
+    'quiz_plan_mini_group': {
+        'en': '⭐️ Comfort',
+        'ru': '⭐️ Комфорт',
+        'uz': '⭐️ Comfort'
+    },
+    'quiz_plan_individual': {
+        'en': '💎 Ultima',
+        'ru': '💎 Ultima',
+        'uz': '💎 Ultima'
+    },
+    'quiz_already_taking': {
+        'en': "You are already taking the quiz! Please answer the current question.",
+        'ru': "Вы уже проходите тест! Пожалуйста, ответьте на текущий вопрос.",
+        'uz': "Siz allaqachon testni topshiryapsiz! Iltimos, joriy savolga javob bering."
+    },
+    'quiz_use_buttons': {
+        'en': "Please select an answer using the buttons below 👇",
+        'ru': "Пожалуйста, выберите ответ, используя кнопки ниже 👇",
+        'uz': "Iltimos, quyidagi tugmalardan foydalanib javobni tanlang 👇"
+    },
+}
@@ -0,0 +1,86 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # START / REGISTRATION
+    # ═══════════════════════════════════════════════════════════
+    'already_registered': {
+        'en': '✅ You are already registered!',
+        'ru': '✅ Вы уже зарегистрированы!',
+        'uz': '✅ Siz allaqachon ro\'yxatdan o\'tgansiz!'
+    },
+    'invalid_key': {
+        'en': '❌ Invalid registration key. Please try again.',
+        'ru': '❌ Неверный ключ регистрации. Попробуйте снова.',
+        'uz': '❌ Noto\'g\'ri kalit. Qaytadan urinib ko\'ring.'
+    },
+    'key_already_used': {
+        'en': '❌ This key has already been used.',
+        'ru': '❌ Этот ключ уже использован.',
+        'uz': '❌ Bu kalit allaqachon ishlatilgan.'
+    },
+    'role_teacher': {
+        'en': 'Teacher',
+        'ru': 'Учитель',
+        'uz': 'O\'qituvchi'
+    },
+    'role_student': {
+        'en': 'Student',
+        'ru': 'Студент',
+        'uz': 'O\'quvchi'
+    },
+
+    # ═══════════════════════════════════════════════════════════
+    # REGISTRATION (additional)
+    # ═══════════════════════════════════════════════════════════
+    'admin_welcome': {
+        'en': '👋 <b>Welcome, Admin!</b>\n\nUse the menu below to navigate.',
+        'ru': '👋 <b>Добро пожаловать, Админ!</b>\n\nИспользуйте меню ниже.',
+        'uz': '👋 <b>Xush kelibsiz, Admin!</b>\n\nQuyidagi menyudan foydalaning.'
+    },
+    'start_welcome': {
+        'en': '👋 <b>Welcome to Meeting Bot!</b>\n\nPlease enter your <b>registration key</b>:\n\n<i>Format: STU-XXXXXX or TCH-XXXXXX</i>\n\nDon\'t have a key? Contact your administrator.',
+        'ru': '👋 <b>Добро пожаловать в Meeting Bot!</b>\n\nВведите ваш <b>регистрационный ключ</b>:\n\n<i>Формат: STU-XXXXXX или TCH-XXXXXX</i>\n\nНет ключа? Свяжитесь с администратором.',
+        'uz': '👋 <b>Meeting Bot ga xush kelibsiz!</b>\n\n<b>Ro\'yxatdan o\'tish kalitini</b> kiriting:\n\n<i>Format: STU-XXXXXX yoki TCH-XXXXXX</i>\n\nKalit yo\'qmi? Administrator bilan bog\'laning.'
+    },
+    'registration_cancelled': {
+        'en': '❌ Registration cancelled.\n\nUse /start to try again.',
+        'ru': '❌ Регистрация отменена.\n\nИспользуйте /start для повтора.',
+        'uz': '❌ Ro\'yxatdan o\'tish bekor qilindi.\n\nQayta urinish uchun /start yuboring.'
+    },
+    'invalid_key_format': {
+        'en': '❌ Invalid key format.\n\nKeys look like: <code>STU-ABC123</code> or <code>TCH-XYZ789</code>\n\nPlease try again or /cancel:',
+        'ru': '❌ Неверный формат ключа.\n\nКлючи выглядят так: <code>STU-ABC123</code> или <code>TCH-XYZ789</code>\n\nПопробуйте снова или /cancel:',
+        'uz': '❌ Kalit formati noto\'g\'ri.\n\nKalitlar shunday ko\'rinadi: <code>STU-ABC123</code> yoki <code>TCH-XYZ789</code>\n\nQayta urinib ko\'ring yoki /cancel:'
+    },
+    'registration_success': {
+        'en': '✅ <b>Registration Successful!</b>\n\n{icon} Welcome, <b>{name}</b>!\nRole: {role}{group}\n\nUse the menu below to navigate.',
+        'ru': '✅ <b>Регистрация успешна!</b>\n\n{icon} Добро пожаловать, <b>{name}</b>!\nРоль: {role}{group}\n\nИспользуйте меню ниже.',
+        'uz': '✅ <b>Ro\'yxatdan o\'tish muvaffaqiyatli!</b>\n\n{icon} Xush kelibsiz, <b>{name}</b>!\nRol: {role}{group}\n\nQuyidagi menyudan foydalaning.'
+    },
+
+    # ═══════════════════════════════════════════════════════════
+    # START / REGISTRATION
+    # ═══════════════════════════════════════════════════════════
+    'welcome_message':{
+        'en': "👋 Welcome to Demy Academy bot!\n\n"
+              "Who are you?\n"
+              "• 👨‍🎓 Student\n"
+              "• 👨‍🏫 Teacher\n\n"
+              "To start using the bot, please enter your registration key.\n"
+              "Format: STU-XXXXXX or TCH-XXXXXX\n\n"
+              "If you don't have a key yet, ask your teacher or administrator.",
+        'ru': "👋 Добро пожаловать в бот Demy Academy!\n\n"
+              "Кто вы?\n"
+              "• 👨‍🎓 Студент\n"
+              "• 👨‍🏫 Учитель\n\n"
+              "Чтобы начать, введите ваш ключ регистрации.\n"
+              "Формат: STU-XXXXXX или TCH-XXXXXX\n\n"
+              "Если у вас нет ключа, обратитесь к администратору.",
+        'uz': "👋 Demy Academy botiga xush kelibsiz!\n\n"
+              "Siz kimsiz?\n"
+              "• 👨‍🎓 Talaba\n"
+              "• 👨‍🏫 O'qituvchi\n\n"
+              "Boshlash uchun ro'yxatdan o'tish kalitini kiriting.\n"
+              "Format: STU-XXXXXX yoki TCH-XXXXXX\n\n"
+              "Agar kalitingiz bo'lmasa, administratorga murojaat qiling."
+    },
+}
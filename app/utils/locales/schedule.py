@@ -0,0 +1,87 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # SCHEDULE
+    # ═══════════════════════════════════════════════════════════
+    'your_schedule': {
+        'en': 'Your Schedule',
+        'ru': 'Ваше расписание',
+        'uz': 'Sizning jadvalingiz'
+    },
+    'today_schedule': {
+        'en': "Today's Schedule",
+        'ru': 'Расписание на сегодня',
+        'uz': 'Bugungi jadval'
+    },
+    'no_lessons': {
+        'en': 'No lessons',
+        'ru': 'Нет уроков',
+        'uz': 'Darslar yo\'q'
+    },
+    'no_lessons_today': {
+        'en': 'No lessons today!',
+        'ru': 'Сегодня нет уроков!',
+        'uz': 'Bugun darslar yo\'q!'
+    },
+    'cancelled_lesson': {
+        'en': 'Lesson cancelled',
+        'ru': 'Урок отменён',
+        'uz': 'Dars bekor qilindi'
+    },
+    'moved_to': {
+        'en': 'Moved to',
+        'ru': 'Перенесён на',
+        'uz': 'Ko\'chirildi:'
+    },
+    'rescheduled_from': {
+        'en': 'Moved from',
+        'ru': 'Перенесён с',
+        'uz': 'Ko\'chirilgan sana:'
+    },
+    'calendar_caption': {
+        'en': '📅 Your lessons for the next {weeks} weeks. Open the file to add them to your calendar.',
+        'ru': '📅 Ваши уроки на ближайшие {weeks} нед. Откройте файл, чтобы добавить их в календарь.',
+        'uz': '📅 Keyingi {weeks} haftadagi darslaringiz. Taqvimga qo\'shish uchun faylni oching.'
+    },
+    'calendar_subscribe': {
+        'en': '🔗 Or subscribe to stay up to date (keep this link private):\n{url}',
+        'ru': '🔗 Или подпишитесь, чтобы расписание обновлялось само (не делитесь ссылкой):\n{url}',
+        'uz': '🔗 Yoki jadval o\'zi yangilanishi uchun obuna bo\'ling (havolani boshqalarga bermang):\n{url}'
+    },
+    'week_of': {
+        'en': 'Week of',
+        'ru': 'Неделя',
+        'uz': 'Hafta'
+    },
+    'today': {
+        'en': 'TODAY',
+        'ru': 'СЕГОДНЯ',
+        'uz': 'BUGUN'
+    },
+
+    # ═══════════════════════════════════════════════════════════
+    # DAY NAMES
+    # ═══════════════════════════════════════════════════════════
+    'monday': {'en': 'Monday', 'ru': 'Понедельник', 'uz': 'Dushanba'},
+    'tuesday': {'en': 'Tuesday', 'ru': 'Вторник', 'uz': 'Seshanba'},
+    'wednesday': {'en': 'Wednesday', 'ru': 'Среда', 'uz': 'Chorshanba'},
+    'thursday': {'en': 'Thursday', 'ru': 'Четверг', 'uz': 'Payshanba'},
+    'friday': {'en': 'Friday', 'ru': 'Пятница', 'uz': 'Juma'},
+    'saturday': {'en': 'Saturday', 'ru': 'Суббота', 'uz': 'Shanba'},
+    'sunday': {'en': 'Sunday', 'ru': 'Воскресенье', 'uz': 'Yakshanba'},
+
+    # ═══════════════════════════════════════════════════════════
+    # MONTH NAMES
+    # ═══════════════════════════════════════════════════════════
+    'january': {'en': 'January', 'ru': 'Январь', 'uz': 'Yanvar'},
+    'february': {'en': 'February', 'ru': 'Февраль', 'uz': 'Fevral'},
+    'march': {'en': 'March', 'ru': 'Март', 'uz': 'Mart'},
+    'april': {'en': 'April', 'ru': 'Апрель', 'uz': 'Aprel'},
+    'may': {'en': 'May', 'ru': 'Май', 'uz': 'May'},
+    'june': {'en': 'June', 'ru': 'Июнь', 'uz': 'Iyun'},
+    'july': {'en': 'July', 'ru': 'Июль', 'uz': 'Iyul'},
+    'august': {'en': 'August', 'ru': 'Август', 'uz': 'Avgust'},
+    'september': {'en': 'September', 'ru': 'Сентябрь', 'uz': 'Sentyabr'},
+    'october': {'en': 'October', 'ru': 'Октябрь', 'uz': 'Oktyabr'},
+    'november': {'en': 'November', 'ru': 'Ноябрь', 'uz': 'Noyabr'},
+    'december': {'en': 'December', 'ru': 'Декабрь', 'uz': 'Dekabr'},
+}
@@ -0,0 +1,73 @@
+TEXTS = {
+    # ═══════════════════════════════════════════════════════════
+    # STATUS
+    # ═══════════════════════════════════════════════════════════
+    'your_status': {
+        'en': '📋 Your Status',
+        'ru': '📋 Ваш статус',
+        'uz': '📋 Sizning holatngiz'
+    },
+    'status_name': {
+        'en': 'Name',
+        'ru': 'Имя',
+        'uz': 'Ism'
+    },
+    'status_role': {
+        'en': 'Role',
+        'ru': 'Роль',
+        'uz': 'Rol'
+    },
+    'status_group': {
+        'en': 'Group',
+        'ru': 'Группа',
+        'uz': 'Guruh'
+    },
+    'status_registered': {
+        'en': 'Registered',
+        'ru': 'Зарегистрирован',
+        'uz': 'Ro\'yxatdan o\'tgan'
+    },
+
+    # ═══════════════════════════════════════════════════════════
+    # HELP
+    # ═══════════════════════════════════════════════════════════
+    'help_title': {
+        'en': '❓ Help - Available Commands',
+        'ru': '❓ Помощь - Доступные команды',
+        'uz': '❓ Yordam - Mavjud buyruqlar'
+    },
+    'help_schedule': {
+        'en': '/schedule - View weekly schedule',
+        'ru': '/schedule - Расписание на неделю',
+        'uz': '/schedule - Haftalik jadval'
+    },
+    'help_today': {
+        'en': '/today - View today\'s lessons',
+        'ru': '/today - Сегодняшние уроки',
+        'uz': '/today - Bugungi darslar'
+    },
+    'help_calendar': {
+        'en': '/calendar - Lessons as a calendar file',
+        'ru': '/calendar - Уроки в виде файла календаря',
+        'uz': '/calendar - Darslar taqvim fayli sifatida'
+    },
+    'help_status': {
+        'en': '/status - View your profile',
+        'ru': '/status - Ваш профиль',
+        'uz': '/status - Sizning profilingiz'
+    },
+    'help_language': {
+        'en': '/language - Change language',
+        'ru': '/language - Сменить язык',
+        'uz': '/language - Tilni o\'zgartirish'
+    },
+
+    # ═══════════════════════════════════════════════════════════
+    # STATUS
+    # ═══════════════════════════════════════════════════════════
+    'status_teaching_groups':{
+        'en': "Teaching Groups",
+        'ru': "Преподаваемые группы",
+        'uz': "O'qitiladigan guruhlar"
+    },
+}
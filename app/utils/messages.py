@@ -0,0 +1,26 @@
+# ═══════════════════════════════════════════════════════════
+# MESSAGE LIMITS
+# ═══════════════════════════════════════════════════════════
+# HTML replies must be cut between whole lines/entries: slicing the string
+# can split a <b> tag or an &amp; entity and Telegram rejects the message.
+
+# Telegram limits (message text / media caption), with a little headroom
+MESSAGE_LIMIT = 4000
+CAPTION_LIMIT = 1024
+
+
+def fit_lines(header: str, lines: list, limit: int = MESSAGE_LIMIT, sep: str = "\n",
+              more: str = "…and {count} more") -> str:
+    """
+    header + as many whole lines (or multi-line entries) as fit in `limit`
+    characters; the rest is summarized by `more` (formatted with count=).
+    """
+    text = header
+    for i, line in enumerate(lines):
+        rest = len(lines) - i - 1
+        # Keep room for the "…and N more" line unless this is the last one
+        tail = len(sep) + len(more.format(count=rest)) if rest else 0
+        if len(text) + len(sep) + len(line) + tail > limit:
+            return text + sep + more.format(count=len(lines) - i)
+        text += sep + line
+    return text
@@ -0,0 +1,44 @@
+import re
+import unicodedata
+
+# Uzbek Cyrillic -> Uzbek Latin (also covers the Russian alphabet), so that
+# "Зарина" and "Zarina" or "Ғайрат" and "G'ayrat" produce the same key.
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+
+# o' / g' are written with many different apostrophes
+APOSTROPHES = "'`ʻʼ‘’´"
+
+# Common Russian-style spellings of Uzbek sounds -> Uzbek Latin
+SPELLING_FOLDS = [
+    ('kh', 'x'),   # Khurshid -> Xurshid
+    ('dj', 'j'),   # Djamshid -> Jamshid
+]
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Search key for a person's name.
+
+    Casefolded, transliterated to Latin, accents and apostrophes removed,
+    whitespace collapsed: "  Зарина  Ўринова" -> "zarina orinova".
+    """
+    text = (name or '').casefold()
+    text = ''.join(CYRILLIC_TO_LATIN.get(ch, ch) for ch in text)
+
+    # Strip accents (é -> e) and apostrophes (o' -> o)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch) and ch not in APOSTROPHES)
+
+    for src, dst in SPELLING_FOLDS:
+        text = text.replace(src, dst)
+
+    return _WHITESPACE.sub(' ', text).strip()
@@ -0,0 +1,133 @@
+"""
+Benchmark: teacher lookup by group, legacy CAST/LOWER JOIN vs typed + group_key.
+
+Builds a legacy (TEXT chat ids, no group_key) SQLite database, times the old
+query, runs init_database() on it (which migrates the schema) and times the
+new get_teacher_for_group() query. Prints both query plans.
+
+    python -m benchmarks.bench_teacher_lookup [teachers] [groups_per_teacher]
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+OLD_QUERY = '''
+    SELECT u.* FROM users u
+    JOIN teacher_groups tg ON CAST(u.chat_id AS TEXT) = CAST(tg.teacher_chat_id AS TEXT)
+    WHERE LOWER(tg.group_name) = LOWER(?) AND u.is_active = 1
+'''
+
+NEW_QUERY = '''
+    SELECT u.* FROM teacher_groups tg
+    JOIN users u ON u.chat_id = tg.teacher_chat_id
+    WHERE tg.group_key = ? AND u.is_active = 1
+'''
+
+LOOKUPS = 2000
+
+
+def build_legacy_db(path: str, teachers: int, groups_per_teacher: int, students: int):
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id TEXT UNIQUE,
+            name TEXT NOT NULL,
+            role TEXT NOT NULL,
+            group_name TEXT,
+            registration_key TEXT UNIQUE NOT NULL,
+            is_active INTEGER DEFAULT 0,
+            language TEXT DEFAULT 'en',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            activated_at TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE teacher_groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            teacher_chat_id TEXT NOT NULL,
+            group_name TEXT NOT NULL,
+            subject TEXT,
+            UNIQUE(teacher_chat_id, group_name)
+        )
+    """)
+
+    users = []
+    links = []
+    for t in range(teachers):
+        chat_id = str(100000000 + t)
+        users.append((chat_id, f"Teacher {t}", 'teacher', None, f"TCH-{t:06d}", 1))
+        for g in range(groups_per_teacher):
+            links.append((chat_id, f"Group {t}-{g}", 'English'))
+    for s in range(students):
+        users.append((str(500000000 + s), f"Student {s}", 'student', f"Group {s % teachers}-0", f"STU-{s:06d}", 1))
+
+    cur.executemany(
+        "INSERT INTO users (chat_id, name, role, group_name, registration_key, is_active) VALUES (?, ?, ?, ?, ?, ?)",
+        users
+    )
+    cur.executemany("INSERT INTO teacher_groups (teacher_chat_id, group_name, subject) VALUES (?, ?, ?)", links)
+    conn.commit()
+    conn.close()
+    return [g for _, g, _ in links]
+
+
+def run(path: str, query: str, params_list: list) -> tuple:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+
+    cur.execute(f"EXPLAIN QUERY PLAN {query}", params_list[0])
+    plan = [row['detail'] for row in cur.fetchall()]
+
+    start = time.perf_counter()
+    for params in params_list:
+        cur.execute(query, params)
+        assert cur.fetchone() is not None
+    elapsed = time.perf_counter() - start
+
+    conn.close()
+    return plan, elapsed
+
+
+def main():
+    teachers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    groups_per_teacher = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "bench.db")
+    groups = build_legacy_db(db_path, teachers, groups_per_teacher, students=teachers * 10)
+    sample = [random.choice(groups) for _ in range(LOOKUPS)]
+
+    print(f"📊 {teachers} teachers, {len(groups)} teacher_groups rows, {LOOKUPS} lookups\n")
+
+    old_plan, old_time = run(db_path, OLD_QUERY, [(g,) for g in sample])
+
+    # Migrate the legacy file in place with the real init code
+    os.environ["DB_PATH"] = db_path
+    from app.database.db import init_database, normalize_group_key
+    init_database()
+
+    new_plan, new_time = run(db_path, NEW_QUERY, [(normalize_group_key(g),) for g in sample])
+
+    print("BEFORE (CAST + LOWER join):")
+    for line in old_plan:
+        print(f"   {line}")
+    print(f"   {old_time * 1000:.1f} ms total, {old_time / LOOKUPS * 1e6:.1f} µs/lookup\n")
+
+    print("AFTER (typed chat ids + group_key index):")
+    for line in new_plan:
+        print(f"   {line}")
+    print(f"   {new_time * 1000:.1f} ms total, {new_time / LOOKUPS * 1e6:.1f} µs/lookup\n")
+
+    print(f"⚡ Speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime, timezone
+
+from telegram import Chat, Message, Update
+
+from app.bot.update_processor import ChatOrderedUpdateProcessor
+
+
+def _update(update_id: int, chat_id: int) -> Update:
+    chat = Chat(id=chat_id, type=Chat.PRIVATE)
+    message = Message(message_id=update_id, date=datetime.now(timezone.utc), chat=chat, text="hi")
+    return Update(update_id=update_id, message=message)
+
+
+def test_pending_limit_is_not_the_worker_limit():
+    processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4, max_pending_updates=1024)
+    assert processor.max_concurrent_updates == 1024
+    assert processor.get_metrics()['max_concurrent'] == 4
+
+
+def test_busy_chat_does_not_block_other_chats():
+    async def scenario():
+        processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4, max_pending_updates=1024)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        finished = {}
+        order = []
+
+        async def handler(name: str, chat_id: int):
+            await asyncio.sleep(0.1)
+            order.append((chat_id, name))
+            finished[name] = loop.time() - start
+
+        tasks = [
+            asyncio.create_task(processor.process_update(_update(i, 1), handler(f"a{i}", 1)))
+            for i in range(6)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(processor.process_update(_update(99, 2), handler("b", 2))))
+        await asyncio.gather(*tasks)
+        return finished, order
+
+    finished, order = asyncio.run(scenario())
+
+    # Chat 2 runs alongside the first update of chat 1, not after the burst
+    assert finished["b"] < 0.25
+    assert finished["a5"] >= 0.6
+    # Chat 1 stays in arrival order
+    assert [name for chat_id, name in order if chat_id == 1] == [f"a{i}" for i in range(6)]